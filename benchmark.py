@@ -0,0 +1,47 @@
+import argparse
+import json
+import os
+
+from product.general.framework.benchmark import (DEFAULT_REPEAT,
+                                                 DEFAULT_RSS_THRESHOLD,
+                                                 DEFAULT_TIME_THRESHOLD,
+                                                 SCENARIOS, BenchmarkSuite,
+                                                 compare_result,
+                                                 print_comparison)
+
+parser = argparse.ArgumentParser(description='Benchmark the simulator itself (wall time, events/s, commands/s, peak RSS)')
+subparsers = parser.add_subparsers(dest='command', required=True)
+
+run_parser = subparsers.add_parser('run', help='run the benchmark scenarios')
+run_parser.add_argument("--scenario", type=str, action='append', choices=list(SCENARIOS), help='may be repeated, default all')
+run_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help='runs per scenario, the fastest one is reported')
+run_parser.add_argument("--output", type=str, default='benchmark_result.json', help='result json file')
+
+compare_parser = subparsers.add_parser('compare', help='compare two result json files')
+compare_parser.add_argument("baseline", type=str)
+compare_parser.add_argument("current", type=str)
+compare_parser.add_argument("--time-threshold", type=float, default=DEFAULT_TIME_THRESHOLD,
+                            help='allowed wall time growth / rate drop ratio')
+compare_parser.add_argument("--rss-threshold", type=float, default=DEFAULT_RSS_THRESHOLD,
+                            help='allowed peak RSS growth ratio')
+
+subparsers.add_parser('list', help='list the scenarios')
+
+
+if __name__ == "__main__":
+    os.system("")
+    args = parser.parse_args()
+    if args.command == 'list':
+        for name in SCENARIOS:
+            print(name)
+    elif args.command == 'run':
+        BenchmarkSuite(args.scenario, args.repeat).run(args.output)
+        print(f'[INFO] result saved to {args.output}')
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        rows, regression_list = compare_result(baseline, current, args.time_threshold, args.rss_threshold)
+        print_comparison(rows, regression_list)
+        exit(1 if regression_list else 0)
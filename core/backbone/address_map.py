@@ -1,19 +1,22 @@
 from enum import Enum
 
 from core.framework.common import MemAccessInfo, ProductArgs, eResourceType
+from core.framework.simulation_context import SimulationContext
 
 
 class AddressMap(object):
     def __new__(cls, product_args: ProductArgs = None):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super(AddressMap, cls).__new__(cls)
-            cls.instance.init_address_map()
+        context = SimulationContext.get_current()
+        instance = context.get_instance(cls)
+        if instance is None:
+            instance = context.set_instance(cls, super(AddressMap, cls).__new__(cls))
+            instance.init_address_map()
 
         if product_args is not None:
-            product_args.set_args_to_class_instance(cls.instance)
-            cls.instance.init_memory_map(product_args)
+            product_args.set_args_to_class_instance(instance)
+            instance.init_memory_map(product_args)
 
-        return cls.instance
+        return instance
 
     def init_memory_map(self, product_args):
         self.param = product_args.param
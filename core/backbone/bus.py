@@ -5,7 +5,9 @@ from collections import deque
 from core.backbone.address_map import AddressMap
 from core.framework.analyzer import Analyzer
 from core.framework.common import ProductArgs
+from core.framework.simulation_context import SimulationContext
 from core.framework.submodule_event import SubmoduleEvent
+from core.framework.submodule_profiler import SubmoduleProfiler
 
 
 class BusWaitingQ:
@@ -15,6 +17,8 @@ class BusWaitingQ:
         self.dst_event = SubmoduleEvent(env)
         self.src_queue = deque()
         self.dst_queue = deque()
+        self.batch_queue = deque()
+        self.batch_start_time = -1
 
     def append(self, packet):
         self.src_queue.append(packet)
@@ -28,17 +32,41 @@ class BusWaitingQ:
     def start_transfer_directly(self):
         self.dst_event.trigger()
 
+    def append_batch(self, packet):
+        if self.batch_start_time != -1 and self.batch_start_time != self.env.now:
+            self.batch_queue = deque()
+            self.batch_start_time = -1
+        self.batch_queue.append(packet)
+
+    def start_transfer_batch(self, latency):
+        if self.batch_start_time == -1 and self.batch_queue:
+            self.batch_start_time = self.env.now
+            self.env.timeout(latency, self.batch_queue).callbacks.append(
+                self.transfer_batch_done)
+
+    def transfer_batch_done(self, event):
+        batch_queue: deque = event.value
+        if batch_queue is self.batch_queue:
+            self.batch_queue = deque()
+            self.batch_start_time = -1
+
+        if self.dst_queue:
+            self.dst_queue.extend(batch_queue)
+        else:
+            self.dst_queue = batch_queue
+        self.dst_event.trigger()
 
-class Bus:
-    instance = None
 
+class Bus:
     def __new__(cls, product_args: ProductArgs = None):
-        if cls.instance is None:
-            cls.instance = super(Bus, cls).__new__(cls)
+        context = SimulationContext.get_current()
+        instance = context.get_instance(cls)
+        if instance is None:
+            instance = context.set_instance(cls, super(Bus, cls).__new__(cls))
         if product_args is not None:
-            product_args.set_args_to_class_instance(cls.instance)
-            cls.instance.init_src_waiting_queue()
-        return cls.instance
+            product_args.set_args_to_class_instance(instance)
+            instance.init_src_waiting_queue()
+        return instance
 
     def init_src_waiting_queue(self):
         self.analyzer = Analyzer()
@@ -54,6 +82,9 @@ class Bus:
         if self.SKIP_BUS_PROCESS:
             self.push_sq = self.push_sq_directly
             self.start_packet_transfer = self.start_packet_transfer_directly
+        elif self.param.ENABLE_BUS_BATCH_TRANSFER:
+            self.push_sq = self.push_sq_batch
+            self.start_packet_transfer = self.start_packet_transfer_batch
 
     def bus_process(self, dst, fifo_id, domain_id):
         waiting_queue: BusWaitingQ = self.waiting_queue[dst][domain_id][fifo_id]
@@ -76,16 +107,18 @@ class Bus:
         assert self.waiting_queue[dst] is None, f'address {dst} already exist! check module address is correct'
         self.waiting_queue[dst] = [[BusWaitingQ(self.env) for _ in range(
             dst_fifo_num)] for _ in range(dst_domain_num)]
-        if self.SKIP_BUS_PROCESS:
+        if self.SKIP_BUS_PROCESS or self.param.ENABLE_BUS_BATCH_TRANSFER:
             return
 
         for dst_fifo_id in range(dst_fifo_num):
             for dst_domain_id in range(dst_domain_num):
-                self.env.process(
-                    self.bus_process(
-                        dst,
-                        dst_fifo_id,
-                        dst_domain_id))
+                bus_process = self.bus_process(dst, dst_fifo_id, dst_domain_id)
+                if self.param.ENABLE_SUBMODULE_PROFILER:
+                    submodule_profiler = SubmoduleProfiler()
+                    name = AddressMap().get_name(dst)
+                    record = submodule_profiler.add_record('Bus', f'Bus.{name}_{dst_domain_id}_{dst_fifo_id}')
+                    bus_process = submodule_profiler.profile_process(record, bus_process)
+                self.env.process(bus_process)
 
     def push_sq(self, packet, dst, dst_fifo_id=0, dst_domain_id=0):
         self.waiting_queue[dst][dst_domain_id][dst_fifo_id].append(packet)
@@ -94,6 +127,9 @@ class Bus:
         self.waiting_queue[dst][dst_domain_id][dst_fifo_id].append_directly(
             packet)
 
+    def push_sq_batch(self, packet, dst, dst_fifo_id=0, dst_domain_id=0):
+        self.waiting_queue[dst][dst_domain_id][dst_fifo_id].append_batch(packet)
+
     def start_packet_transfer(self, dst, dst_fifo_id, dst_domain_id):
         self.waiting_queue[dst][dst_domain_id][dst_fifo_id].start_transfer()
 
@@ -101,6 +137,10 @@ class Bus:
         self.waiting_queue[dst][dst_domain_id][dst_fifo_id].start_transfer_directly(
         )
 
+    def start_packet_transfer_batch(self, dst, dst_fifo_id, dst_domain_id):
+        self.waiting_queue[dst][dst_domain_id][dst_fifo_id].start_transfer_batch(
+            self.param.IP_TRANSACTION_LATENCY_NS)
+
     def packet_processing(self, src, packet, dst_fifo_id, dst_domain_id):
         packet['src'] = src
         return packet
@@ -5,6 +5,7 @@ import simpy
 from core.framework.analyzer import Analyzer
 from core.framework.common import ProductArgs
 from core.framework.file_path_generator import FilePathGenerator, LogOutputType
+from core.framework.simulation_context import SimulationContext
 from core.framework.timer import FrameworkTimer
 
 
@@ -867,12 +868,14 @@ def PowerManagerClassDecorator(cls):
 @PowerManagerClassDecorator
 class PowerManager:
     def __new__(cls, product_args: ProductArgs = None):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super(PowerManager, cls).__new__(cls)
+        context = SimulationContext.get_current()
+        instance = context.get_instance(cls)
+        if instance is None:
+            instance = context.set_instance(cls, super(PowerManager, cls).__new__(cls))
         if product_args is not None:
-            product_args.set_args_to_class_instance(cls.instance)
-            cls.instance.init_power_manager()
-        return cls.instance
+            product_args.set_args_to_class_instance(instance)
+            instance.init_power_manager()
+        return instance
 
     def init_power_manager(self):
         self.implementation_module = dict()
@@ -968,6 +971,11 @@ class PowerManager:
             self.make_log_title_header()
         self.framework_timer.generate_infinity_timer(self.power_snap_shot_interval, self.power_snapShot, 0)
 
+    def close_log_files(self):
+        self.total_power_filename.close()
+        if hasattr(self, 'power_trace_log_filename'):
+            self.power_trace_log_filename.close()
+
     def make_log_title_header(self):
         if self.param.ENABLE_LOGGING_TOTAL_POWER and self.power_snap_shot_interval != 0:
             if self.product_type == 'client_value' or self.product_type == 'mobile':
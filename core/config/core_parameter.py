@@ -19,6 +19,7 @@ class CoreParameter(metaclass=Singleton):
         self.VCD_FILE_NAME = 'simpy.vcd'
         self.PRINT_PROGRESS = 0
         self.ENABLE_COMMAND_RECORD = 0
+        self.EXPORT_COMMAND_RECORD_CSV = 0
         self.ENABLE_WAF_RECORD = False  # WAF
         self.ENABLE_POWER = 0
         self.ENABLE_OPTION_PRINT = False
@@ -34,8 +35,18 @@ class CoreParameter(metaclass=Singleton):
         self.DEBUG_MODE = 0
         self.SKIP_BUFFER_CHECK = 0
         self.ENABLE_tHost = 0
+        # trace lines parsed per chunk while the simulation runs, 0 loads the whole trace up front
+        self.WORKLOAD_CHUNK_LINES = 0
 
         self.IP_TRANSACTION_LATENCY_NS = 1
+        # packets sent to a destination at the same time share one bus latency
+        self.ENABLE_BUS_BATCH_TRANSFER = 0
+        # one bandwidth reservation per memory access instead of one round robin job per payload
+        self.ENABLE_ANALYTIC_MEMORY_MODEL = 0
+        # multi-plane NAND operation runs on one lead plane process instead of one process per plane
+        self.ENABLE_COLLAPSED_PLANE_OPERATION = 0
+        # host time, scheduled events, jobs and queue high-water of each submodule, printed after each workload
+        self.ENABLE_SUBMODULE_PROFILER = 0
 
         self.ENABLE_CLOCK_GATING = False
         self.ENABLE_DYNAMIC_POWERSTATE = False
@@ -6,39 +6,52 @@ from core.backbone.bus import Bus
 from core.framework.analyzer import Analyzer
 from core.framework.common import (ProductArgs, RequestResourceInfo,
                                    eRequestType, eResourceType)
+from core.framework.simulation_context import SimulationContext
 
 
 class Allocator(type):
-    instances = {}
-
     def __call__(cls, *args, **kwargs):
+        instances = SimulationContext.get_current().get_keyed_instances(Allocator)
         key = (args, tuple(kwargs.items()))
-        if key not in cls.instances:
-            cls.instances[key] = super().__call__(*args, **kwargs)
-        return cls.instances[key]
+        if key not in instances:
+            instances[key] = super().__call__(*args, **kwargs)
+        return instances[key]
 
     @classmethod
     def reset(cls):
-        cls.instances = {}
+        SimulationContext.get_current().get_keyed_instances(Allocator).clear()
 
 
 class SimpyResourceAllocator(metaclass=Allocator):
-    class SimpyResource:
-        '''Ask Resource Available to simpy.Resource API'''
+    class CountedResource:
+        '''
+        Grants all units of a request at once with one event. Requests are served in FIFO order,
+        a request that does not fit yet also holds back the later ones.
+        '''
 
         def __init__(self, env, id_count):
-            self.available_queue = simpy.Resource(env, id_count)
-            self.deque = deque()
+            self.env = env
+            self.capacity = id_count
+            self.available_count = id_count
+            self.waiter_queue = deque()
 
         def request(self, count):
-            for _ in range(count):
-                available = self.available_queue.request()
-                yield available
-                self.deque.append(available)
+            assert count <= self.capacity, f'request {count} over capacity {self.capacity}'
+            event = self.env.event()
+            if not self.waiter_queue and count <= self.available_count:
+                self.available_count -= count
+                event.succeed()
+            else:
+                self.waiter_queue.append((count, event))
+            return event
 
         def release(self, count):
-            for _ in range(count):
-                self.available_queue.release(self.deque.popleft())
+            self.available_count += count
+            waiter_queue = self.waiter_queue
+            while waiter_queue and waiter_queue[0][0] <= self.available_count:
+                count, event = waiter_queue.popleft()
+                self.available_count -= count
+                event.succeed()
 
     class ResourceIDList:
         def __init__(self, id_count, start_addr):
@@ -89,32 +102,43 @@ class SimpyResourceAllocator(metaclass=Allocator):
                     return
 
     class ResourceAnalyzer:
+        '''
+        Resource lifetime is the running sum of allocated_count over time (unit * ns held).
+        '''
+
         def __init__(self, env, vcd_manager, resource_type):
             self.env = env
             self.vcd_manager = vcd_manager
             self.resource_type = resource_type
             self.allocated_count = 0
             self.total_allocated_count = 0
-            self.resource_enqueue_times = deque()
             self.total_resource_lifetime = 0
+            self.last_update_time = self.env.now
+
+        def update_lifetime(self):
+            now = self.env.now
+            self.total_resource_lifetime += self.allocated_count * (now - self.last_update_time)
+            self.last_update_time = now
+
+        def get_total_resource_lifetime(self):
+            self.update_lifetime()
+            return self.total_resource_lifetime
 
         def allocate(self, count):
+            self.update_lifetime()
             self.allocated_count += count
             self.total_allocated_count += count
-            self.resource_enqueue_times.extend([int(self.env.now)] * count)
             self.vcd_manager.update_resource_allocate(
                 self.resource_type, self.allocated_count)
 
         def release(self, count):
+            self.update_lifetime()
             self.allocated_count -= count
-            for _ in range(count):
-                self.total_resource_lifetime += (
-                    self.env.now - self.resource_enqueue_times.popleft())
-
             self.vcd_manager.update_resource_allocate(
                 self.resource_type, self.allocated_count)
 
         def reset_utilization(self):
+            self.update_lifetime()
             self.total_resource_lifetime = 0
 
     def __init__(
@@ -126,7 +150,7 @@ class SimpyResourceAllocator(metaclass=Allocator):
         product_args.set_args_to_class_instance(self)
         self.resource_count = id_count
         self.resource_type = resource_type
-        self.simpy_resource = self.SimpyResource(self.env, id_count)
+        self.counted_resource = self.CountedResource(self.env, id_count)
         self.free_id_queue = self.ResourceIDList(id_count, start_addr)
         self.resource_buffer = self.ResourceBuffer(id_count)
         self.resource_analyzer = self.ResourceAnalyzer(
@@ -139,7 +163,8 @@ class SimpyResourceAllocator(metaclass=Allocator):
         self.resource_buffer.write([resource_id], [data])
 
     def allocate(self, packet_list=None, request_size=1):
-        yield from self.simpy_resource.request(request_size)
+        if request_size:
+            yield self.counted_resource.request(request_size)
         resource_id_list = self.free_id_queue.get_id(request_size)
         self.resource_buffer.write(resource_id_list, packet_list)
         self.resource_analyzer.allocate(request_size)
@@ -155,7 +180,7 @@ class SimpyResourceAllocator(metaclass=Allocator):
             count = 1
 
         self.resource_analyzer.release(count)
-        self.simpy_resource.release(count)
+        self.counted_resource.release(count)
 
 
 class SimpyContainerAllocator(metaclass=Allocator):
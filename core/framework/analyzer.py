@@ -10,16 +10,19 @@ from core.framework.data_printer import DataPrinter
 from core.framework.diagram_generator import DiagramGenerator
 from core.framework.file_path_generator import FilePathGenerator, LogOutputType
 from core.framework.progress_printer import ProgressPrinter
+from core.framework.simulation_context import SimulationContext
 
 
 class Analyzer:
     def __new__(cls, product_args: ProductArgs = None):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super().__new__(cls)
+        context = SimulationContext.get_current()
+        instance = context.get_instance(cls)
+        if instance is None:
+            instance = context.set_instance(cls, super().__new__(cls))
         if product_args is not None:
-            product_args.set_args_to_class_instance(cls.instance)
-            cls.instance.init_analyzer()
-        return cls.instance
+            product_args.set_args_to_class_instance(instance)
+            instance.init_analyzer()
+        return instance
 
     def init_analyzer(self, tc_count=1, tc_size=1):
         self.address_map = AddressMap()
@@ -65,11 +68,12 @@ class Analyzer:
         self.command_record = CommandRecorder(tc_count)
         self.command_record_file_generator = None
         if self.param.ENABLE_QOS:
-            self.qos_record = QoSRecorder()
+            self.qos_record = QoSRecorder(self.param.QOS_SIGNIFICANT_DIGITS)
             self.qos_record.set_qos_candidates(self.param.QOS_CANDIDATES)
         if self.param.ENABLE_COMMAND_RECORD:
             self.command_record_file_generator = CommandRecordFileGenerator(
-                self.file_path_generator.get_file_prefix(LogOutputType.Command_Record.value))
+                self.file_path_generator.get_file_prefix(LogOutputType.Command_Record.value),
+                export_csv=self.param.EXPORT_COMMAND_RECORD_CSV)
 
         if tc_count != 0:
             self.set_expected_cmd_count(tc_count)
@@ -328,7 +332,7 @@ class Analyzer:
             return
 
         allocator_analyzer = allocator.resource_analyzer
-        lifetime_sum = allocator_analyzer.total_resource_lifetime
+        lifetime_sum = allocator_analyzer.get_total_resource_lifetime()
         utilization = (lifetime_sum *
                        100 /
                        (((self.sim_end_time -
@@ -370,7 +374,7 @@ class Analyzer:
 
     def check_all_cmd_done(self):
         if self.command_record_file_generator is not None:
-            self.command_record_file_generator.file_close()
+            self.command_record_file_generator.close_file()
         print('* Check all commands done :', end='')
         if self.expected_total_command_issue_count == self.total_command_done_count:
             print(' Success')
@@ -0,0 +1,69 @@
+import math
+from collections import deque
+
+
+class BandwidthTimeline:
+    '''
+    Analytic bandwidth model of one memory. Accesses wait in one FIFO per requester queue and the head access
+    of every non-empty queue gets an equal share of the bandwidth, which is what the payload round robin gives
+    on average. Only the next completion is scheduled (earlier timers are left to expire as stale),
+    so an access costs a constant number of simpy events whatever its size.
+    '''
+    REMAIN_BYTE_EPSILON = 1e-6
+
+    def __init__(self, env, bandwidth_b_per_ns, queue_count):
+        self.env = env
+        self.bandwidth = bandwidth_b_per_ns
+        self.access_queue = [deque() for _ in range(queue_count)]
+        self.remain_byte = [0] * queue_count
+        self.active_queue_id_list = []
+        self.last_update_time = 0
+        self.timer_version = 0
+
+    def reserve(self, queue_id, request_size, done_callback):
+        self.update()
+        queue = self.access_queue[queue_id]
+        queue.append((request_size, done_callback))
+        if len(queue) == 1:
+            self.remain_byte[queue_id] = request_size
+            self.active_queue_id_list.append(queue_id)
+            self.schedule_next_done()
+
+    def update(self):
+        now = self.env.now
+        if self.active_queue_id_list:
+            served_byte = (now - self.last_update_time) * self.bandwidth / len(self.active_queue_id_list)
+            for queue_id in self.active_queue_id_list:
+                self.remain_byte[queue_id] -= served_byte
+        self.last_update_time = now
+
+    def schedule_next_done(self):
+        self.timer_version += 1
+        if not self.active_queue_id_list:
+            return
+        share = self.bandwidth / len(self.active_queue_id_list)
+        delay = max(min(self.remain_byte[queue_id] for queue_id in self.active_queue_id_list) / share, 0)
+        timer_version = self.timer_version
+        self.env.timeout(delay).callbacks.append(lambda _: self.handle_timer(timer_version))
+
+    def handle_timer(self, timer_version):
+        if timer_version != self.timer_version:
+            return
+        self.update()
+        # a leftover served in less than one ulp of now could never be timed, so it counts as done
+        share = self.bandwidth / len(self.active_queue_id_list)
+        done_threshold = max(self.REMAIN_BYTE_EPSILON, share * math.ulp(self.env.now))
+        done_callback_list = []
+        for queue_id in list(self.active_queue_id_list):
+            if self.remain_byte[queue_id] > done_threshold:
+                continue
+            queue = self.access_queue[queue_id]
+            done_callback_list.append(queue.popleft()[1])
+            if queue:
+                self.remain_byte[queue_id] = queue[0][0]
+            else:
+                self.remain_byte[queue_id] = 0
+                self.active_queue_id_list.remove(queue_id)
+        self.schedule_next_done()
+        for done_callback in done_callback_list:
+            done_callback()
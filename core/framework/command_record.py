@@ -1,8 +1,12 @@
+import json
 import os
 from dataclasses import dataclass
 from typing import Optional
 
+import numpy as np
+import pandas as pd
 from core.framework.common import eCMDType
+from core.framework.latency_histogram import LatencyHistogram
 
 
 @dataclass
@@ -83,9 +87,14 @@ class CommandRecorder:
 
 
 class QoSRecorder:
-    def __init__(self):
+    '''
+    Keeps per command type latencies in a LatencyHistogram, so memory does not grow with the command count.
+    Reported percentiles are within a relative error of 10 ** -significant_digits of the exact ones.
+    '''
+
+    def __init__(self, significant_digits=3):
         qos_cmd = ['Write', 'Read']
-        self.qos_log = {key: [] for key in qos_cmd}
+        self.qos_log = {key: LatencyHistogram(significant_digits) for key in qos_cmd}
         self.qos_candidates = None
 
     def set_qos_candidates(self, qos_list):
@@ -95,32 +104,38 @@ class QoSRecorder:
         return self.qos_candidates is not None
 
     def record_qos(self, cmd_type, latency_ns):
-        latency = latency_ns / 1e3
         if cmd_type == eCMDType.Write:
-            self.qos_log['Write'].append(latency)
+            self.qos_log['Write'].record(latency_ns)
         elif cmd_type == eCMDType.Read:
-            self.qos_log['Read'].append(latency)
+            self.qos_log['Read'].record(latency_ns)
+
+    def merge(self, other):
+        for cmd_type, histogram in other.qos_log.items():
+            self.qos_log[cmd_type].merge(histogram)
 
     def get_qos(self, cmd_type):
         qos_list = list()
-        self.qos_log[cmd_type] = sorted(self.qos_log[cmd_type])
+        histogram = self.qos_log[cmd_type]
         for qos_idx in self.qos_candidates:
             if isinstance(qos_idx, float):
                 qos_idx = int(str(qos_idx).replace('.', ''))
                 qos_digit = 10**len(str(qos_idx))
             else:
                 qos_digit = 10**2
-            if qos_idx <= len(self.qos_log[cmd_type]):
-                qos_idx = int((qos_idx / qos_digit) *
-                              len(self.qos_log[cmd_type]))
-                qos_list.append(self.qos_log[cmd_type][qos_idx - 1])
+            if qos_idx <= len(histogram):
+                qos_idx = int((qos_idx / qos_digit) * len(histogram))
+                if qos_idx == 0:
+                    qos_list.append(histogram.max_value / 1e3)
+                else:
+                    qos_list.append(histogram.get_value_at_rank(qos_idx) / 1e3)
             else:
                 qos_list.append('-')
         return qos_list
 
     def get_latency_report(self, cmd_type):
-        if self.qos_log[cmd_type]:
-            return f'{min(self.qos_log[cmd_type]):.2f}/{sum(self.qos_log[cmd_type])/len(self.qos_log[cmd_type]):.2f}/{max(self.qos_log[cmd_type]):.2f}'
+        histogram = self.qos_log[cmd_type]
+        if len(histogram):
+            return f'{histogram.min_value / 1e3:.2f}/{histogram.get_mean() / 1e3:.2f}/{histogram.max_value / 1e3:.2f}'
         else:
             return '-'
 
@@ -136,47 +151,106 @@ class QoSRecorder:
 
 
 class CommandRecordFileGenerator:
-    def __init__(self, output_prefix):
+    '''
+    Appends command records as fixed width binary rows in blocks of record_block_size.
+    String columns are stored as codes of a per file string table, which is written with the column layout
+    to the json header when the file is closed. CommandRecordReader loads the record back.
+    '''
+    string_columns = ('process_name', 'command_type', 'cache_hit_result')
+
+    def __init__(self, output_prefix, record_block_size=1 << 16, export_csv=False):
         self.cmd_record_file_name = self.generate_file_name(output_prefix)
+        self.cmd_record_header_file_name = CommandRecordReader.get_header_file_name(self.cmd_record_file_name)
+        self.cmd_record_csv_file_name = os.path.join('.', f'{output_prefix}_command_record.csv')
+        self.record_block_size = record_block_size
+        self.export_csv = export_csv
+        self.columns = list(CommandItem().__dict__.keys())
+        self.dtype = np.dtype([(column, np.int16 if column in self.string_columns else np.int64)
+                               for column in self.columns])
+        self.string_table = {column: {} for column in self.string_columns}
         self.file = None
 
     def generate_file_name(self, prefix):
-        return os.path.join('.', f'{prefix}_command_record.csv')
+        return os.path.join('.', f'{prefix}_command_record.bin')
 
     def open_file(self):
-        self.file = open(self.cmd_record_file_name, 'w')
-        self.write_count = 0
-        self.file_flush_line_threshold = 1000  # to reduce file open/close overhead
-        self.generate_file_header()
-
-    def generate_file_header(self):
-        line = ''
-        for header_name in CommandItem().__dict__.keys():
-            line += f'{header_name},'
-
-        self.write(line[:-1])
-
-    def write(self, line):
-        if self.file is None:
-            self.open_file()
-
-        self.file.write(line + '\n')
-        self.write_count += 1
-        if self.write_count == self.file_flush_line_threshold:
-            self.file.close()
-            self.file = open(self.cmd_record_file_name, 'a')
-            self.write_count = 0
+        self.file = open(self.cmd_record_file_name, 'wb')
+        self.record_count = 0
+        self.record_block = np.empty(self.record_block_size, dtype=self.dtype)
+        self.record_block_count = 0
+
+    def get_string_code(self, column, value):
+        try:
+            value = value.name
+        except AttributeError:
+            value = f'{value}'
+        string_table = self.string_table[column]
+        if value not in string_table:
+            string_table[value] = len(string_table)
+        return string_table[value]
+
+    def flush(self):
+        if self.record_block_count:
+            self.record_block[:self.record_block_count].tofile(self.file)
+            self.record_count += self.record_block_count
+            self.record_block_count = 0
+
+    def write_header(self):
+        header = {
+            'version': 1,
+            'record_count': self.record_count,
+            'columns': [[name, self.dtype[name].str] for name in self.dtype.names],
+            'string_table': {column: list(string_table) for column, string_table in self.string_table.items()},
+        }
+        with open(self.cmd_record_header_file_name, 'w') as f:
+            json.dump(header, f)
 
     def close_file(self):
         if self.file is not None:
+            self.flush()
             self.file.close()
+            self.file = None
+            self.write_header()
+            if self.export_csv:
+                CommandRecordReader(self.cmd_record_file_name).export_csv(self.cmd_record_csv_file_name)
 
     def record(self, cmd_item: CommandItem):
-        line = ''
-        for value in cmd_item.__dict__.values():
-            try:
-                line += f'{value.name},'
-            except AttributeError:
-                line += f'{value},'
-
-        self.write(line[:-1])
+        if self.file is None:
+            self.open_file()
+
+        self.record_block[self.record_block_count] = tuple(
+            self.get_string_code(column, value) if column in self.string_columns else (-1 if value is None else value)
+            for column, value in cmd_item.__dict__.items())
+        self.record_block_count += 1
+        if self.record_block_count == self.record_block_size:
+            self.flush()
+
+
+class CommandRecordReader:
+    def __init__(self, cmd_record_file_name):
+        self.cmd_record_file_name = cmd_record_file_name
+        with open(self.get_header_file_name(cmd_record_file_name)) as f:
+            self.header = json.load(f)
+        self.dtype = np.dtype([(name, dtype) for name, dtype in self.header['columns']])
+
+    @staticmethod
+    def get_header_file_name(cmd_record_file_name):
+        return f'{os.path.splitext(cmd_record_file_name)[0]}.json'
+
+    def load(self):
+        return np.memmap(self.cmd_record_file_name, dtype=self.dtype, mode='r', shape=(self.header['record_count'],)) \
+            if self.header['record_count'] else np.empty(0, dtype=self.dtype)
+
+    def to_dataframe(self):
+        records = self.load()
+        df = pd.DataFrame({name: np.asarray(records[name]) for name in self.dtype.names})
+        for column, string_table in self.header['string_table'].items():
+            df[column] = np.asarray(string_table, dtype=object)[df[column].values] if string_table else None
+        return df
+
+    def export_csv(self, csv_file_name):
+        df = self.to_dataframe()
+        for column in self.dtype.names:
+            if column not in self.header['string_table']:
+                df[column] = df[column].astype(object).where(df[column] != -1, 'None')
+        df.to_csv(csv_file_name, index=False, lineterminator='\n')
@@ -3,18 +3,21 @@ from collections import defaultdict
 from core.backbone.address_map import AddressMap
 from core.framework.common import ProductArgs, eResourceType
 from core.framework.media_common import *
+from core.framework.simulation_context import SimulationContext
 from core.framework.vcd_manager import VCDManager
 
 
 class CoreVCDVariables:
     def __new__(cls, product_args: ProductArgs = None):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super().__new__(cls)
+        context = SimulationContext.get_current()
+        instance = context.get_instance(cls)
+        if instance is None:
+            instance = context.set_instance(cls, super().__new__(cls))
         if product_args:
-            product_args.set_args_to_class_instance(cls.instance)
-            cls.instance.init_vcd_variables()
+            product_args.set_args_to_class_instance(instance)
+            instance.init_vcd_variables()
 
-        return cls.instance
+        return instance
 
     def init_vcd_variables(self):
         # LR
@@ -46,3 +46,8 @@ class MissingPacketInfo(Exception):
 class MismatchPacketInfo(Exception):
     def __init__(self):
         super().__init__()
+
+
+class PreconditionImageMismatch(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
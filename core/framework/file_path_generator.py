@@ -2,6 +2,8 @@ import os
 from enum import Enum
 from pathlib import Path
 
+from core.framework.simulation_context import SimulationContext
+
 
 class LogOutputType(Enum):
     Performance = 0
@@ -14,13 +16,15 @@ class LogOutputType(Enum):
 
 class FilePathGenerator:
     def __new__(cls, param=None):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super().__new__(cls)
+        context = SimulationContext.get_current()
+        instance = context.get_instance(cls)
+        if instance is None:
+            instance = context.set_instance(cls, super().__new__(cls))
         if param is not None:
-            cls.instance.param = param
-            cls.instance.init_generator()
+            instance.param = param
+            instance.init_generator()
 
-        return cls.instance
+        return instance
 
     def init_generator(self):
         self.output_dir_name = 'output'
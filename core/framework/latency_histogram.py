@@ -0,0 +1,96 @@
+import numpy as np
+
+
+class LatencyHistogram:
+    '''
+    Fixed size log-linear histogram of integer latencies (HdrHistogram layout).
+    Values below 2 * 10 ** significant_digits are counted exactly, larger values share a bucket with
+    neighbours within a relative distance of 10 ** -significant_digits.
+    Values above highest_trackable_value are counted in the last bucket, min / max / sum stay exact.
+    '''
+
+    def __init__(self, significant_digits=3, highest_trackable_value=3600 * 10 ** 9):
+        assert 1 <= significant_digits <= 5, 'significant digits must be between 1 and 5'
+        self.significant_digits = significant_digits
+        self.highest_trackable_value = highest_trackable_value
+        self.sub_bucket_bits = (2 * 10 ** significant_digits - 1).bit_length()
+        self.sub_bucket_half_count = 1 << (self.sub_bucket_bits - 1)
+        self.bucket_count = max(1, highest_trackable_value.bit_length() - self.sub_bucket_bits + 1)
+        self.counts = [0] * ((self.bucket_count + 1) * self.sub_bucket_half_count)
+        self.total_count = 0
+        self.total_sum = 0
+        self.min_value = None
+        self.max_value = None
+
+    def __len__(self):
+        return self.total_count
+
+    def get_index(self, value):
+        bucket_index = max(0, value.bit_length() - self.sub_bucket_bits)
+        return min(bucket_index * self.sub_bucket_half_count + (value >> bucket_index), len(self.counts) - 1)
+
+    def get_highest_equivalent_value(self, index):
+        if index < 2 * self.sub_bucket_half_count:
+            return index
+        bucket_index = index // self.sub_bucket_half_count - 1
+        sub_bucket_index = index - bucket_index * self.sub_bucket_half_count
+        return ((sub_bucket_index + 1) << bucket_index) - 1
+
+    def record(self, value):
+        value = int(value)
+        assert value >= 0, f'negative latency {value}'
+        self.counts[self.get_index(value)] += 1
+        self.total_count += 1
+        self.total_sum += value
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+
+    def get_value_at_rank(self, rank):
+        '''
+        Value of the rank-th smallest record (1-based), clamped to the exact min / max.
+        '''
+        assert 1 <= rank <= self.total_count
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        value = self.get_highest_equivalent_value(index)
+        return min(max(value, self.min_value), self.max_value)
+
+    def get_mean(self):
+        return self.total_sum / self.total_count
+
+    def is_compatible(self, other):
+        return (self.significant_digits == other.significant_digits and
+                self.highest_trackable_value == other.highest_trackable_value)
+
+    def merge(self, other):
+        assert self.is_compatible(other), 'histograms with different layouts can not be merged'
+        self.counts = [count + other_count for count, other_count in zip(self.counts, other.counts)]
+        self.total_count += other.total_count
+        self.total_sum += other.total_sum
+        for value in (other.min_value, other.max_value):
+            if value is not None:
+                self.min_value = value if self.min_value is None else min(self.min_value, value)
+                self.max_value = value if self.max_value is None else max(self.max_value, value)
+
+    def to_dict(self):
+        nonzero_index = [index for index, count in enumerate(self.counts) if count]
+        return {
+            'significant_digits': self.significant_digits,
+            'highest_trackable_value': self.highest_trackable_value,
+            'counts': {index: self.counts[index] for index in nonzero_index},
+            'total_sum': self.total_sum,
+            'min_value': self.min_value,
+            'max_value': self.max_value,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        histogram = cls(state['significant_digits'], state['highest_trackable_value'])
+        for index, count in state['counts'].items():
+            histogram.counts[int(index)] = count
+        histogram.total_count = sum(histogram.counts)
+        histogram.total_sum = state['total_sum']
+        histogram.min_value = state['min_value']
+        histogram.max_value = state['max_value']
+        return histogram
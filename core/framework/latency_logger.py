@@ -2,6 +2,7 @@
 from enum import Enum
 
 from core.framework.common import ProductArgs
+from core.framework.simulation_context import SimulationContext
 
 
 class LoggingSection(Enum):
@@ -22,12 +23,14 @@ def LatencyLogNode(id):
 
 class LatencyLogger:
     def __new__(cls, product_args: ProductArgs = None):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super().__new__(cls)
+        context = SimulationContext.get_current()
+        instance = context.get_instance(cls)
+        if instance is None:
+            instance = context.set_instance(cls, super().__new__(cls))
         if product_args is not None:
-            product_args.set_args_to_class_instance(cls.instance)
-            cls.instance.init_latency_logger()
-        return cls.instance
+            product_args.set_args_to_class_instance(instance)
+            instance.init_latency_logger()
+        return instance
 
     def init_latency_logger(self):
         self.logNodeID = 0
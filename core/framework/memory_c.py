@@ -1,5 +1,6 @@
 from enum import Enum
 
+from core.framework.bandwidth_timeline import BandwidthTimeline
 from core.framework.common import (MemAccessInfo, RoundRobinQueues,
                                    eMemoryType, eResourceType)
 from core.framework.data_printer import DataPrinter
@@ -51,6 +52,9 @@ class MemoryC(ParallelUnit):
                 self.memory_submodule, [self.feature.SRAM, self.feature.DRAM], mem_type.value)
             self.memory_rr_queues[mem_type.value] = RoundRobinQueues(
                 len(MemoryC.MemAccessType))
+        if self.param.ENABLE_ANALYTIC_MEMORY_MODEL:
+            self.memory_timeline = [BandwidthTimeline(self.env, self.memory_bandwidth[mem_type.value], len(MemoryC.MemAccessType))
+                                    for mem_type in eMemoryType]
 
         self.generate_submodule(
             self.handle_hmb_access_done,
@@ -89,9 +93,45 @@ class MemoryC(ParallelUnit):
             self.address_map.NVMe,
             description="access HMB")
 
-    def read_memory(self, mem_access_info: MemAccessInfo):
+    def access_memory(self, mem_access_info: MemAccessInfo, access_type):
         mem_type = MemAccessInfo.get_memory_type(mem_access_info.resource_id)
 
+        pay_load_count = self.pay_load_rounding(mem_access_info)
+        if pay_load_count:
+            mem_access_info.event = self.env.event()
+            if self.param.ENABLE_ANALYTIC_MEMORY_MODEL:
+                self.reserve_memory_bandwidth(mem_access_info, mem_type.value, access_type, pay_load_count)
+            else:
+                for pay_load_idx in range(pay_load_count):
+                    self.memory_rr_queues[mem_type.value].push(
+                        mem_access_info, access_type.value)
+
+                if self.memory_rr_queues[mem_type.value].any_remaining_jobs():
+                    packet = self.memory_rr_queues[mem_type.value].pop_round_robin(
+                    )
+                    self.wakeup(
+                        self.address,
+                        self.mem_access_submodule,
+                        packet,
+                        src_id=0,
+                        dst_id=mem_type.value)
+
+            yield mem_access_info.event
+
+    def reserve_memory_bandwidth(self, mem_access_info: MemAccessInfo, mem_type_value, access_type, pay_load_count):
+        latency = pay_load_count * self.memory_payload_latency[mem_type_value]
+
+        def memory_access_done():
+            self.record_memory_access_time(mem_access_info, latency)
+            mem_access_info.request_size = 0
+            mem_access_info.event.succeed()
+            mem_access_info.event = self.env.event()
+
+        self.wakeup(self.address, self.memory_submodule, {
+                    'latency': latency}, src_id=0, dst_id=mem_type_value)
+        self.memory_timeline[mem_type_value].reserve(access_type.value, mem_access_info.request_size, memory_access_done)
+
+    def read_memory(self, mem_access_info: MemAccessInfo):
         resource_id = mem_access_info.resource_id
         if resource_id not in self.readable_memory_set:
             if resource_id in self.write_processing_memory_set:
@@ -99,28 +139,10 @@ class MemoryC(ParallelUnit):
             else:
                 assert 0, f'{resource_id} access(read) empty memory, write first'
 
-        pay_load_count = self.pay_load_rounding(mem_access_info)
-        if pay_load_count:
-            mem_access_info.event = self.env.event()
-            for pay_load_idx in range(pay_load_count):
-                self.memory_rr_queues[mem_type.value].push(
-                    mem_access_info, MemoryC.MemAccessType.Read.value)
-
-            if self.memory_rr_queues[mem_type.value].any_remaining_jobs():
-                packet = self.memory_rr_queues[mem_type.value].pop_round_robin(
-                )
-                self.wakeup(
-                    self.address,
-                    self.mem_access_submodule,
-                    packet,
-                    src_id=0,
-                    dst_id=mem_type.value)
-
-            yield mem_access_info.event
+        yield from self.access_memory(mem_access_info, MemoryC.MemAccessType.Read)
 
     def write_memory(self, mem_access_info: MemAccessInfo):
         mem_access_info.set_type_write()
-        mem_type = MemAccessInfo.get_memory_type(mem_access_info.resource_id)
         resource_id = mem_access_info.resource_id
 
         if resource_id in self.readable_memory_set:
@@ -130,23 +152,7 @@ class MemoryC(ParallelUnit):
             yield from self.wait_memory_write_done(resource_id)
         self.write_processing_memory_set.add(resource_id)
 
-        pay_load_count = self.pay_load_rounding(mem_access_info)
-        if pay_load_count:
-            mem_access_info.event = self.env.event()
-            for pay_load_idx in range(pay_load_count):
-                self.memory_rr_queues[mem_type.value].push(
-                    mem_access_info, MemoryC.MemAccessType.Write.value)
-
-            if self.memory_rr_queues[mem_type.value].any_remaining_jobs():
-                packet = self.memory_rr_queues[mem_type.value].pop_round_robin(
-                )
-                self.wakeup(
-                    self.address,
-                    self.mem_access_submodule,
-                    packet,
-                    src_id=0,
-                    dst_id=mem_type.value)
-            yield mem_access_info.event
+        yield from self.access_memory(mem_access_info, MemoryC.MemAccessType.Write)
 
         self.readable_memory_set.add(resource_id)
         self.write_processing_memory_set.remove(resource_id)
@@ -166,14 +172,7 @@ class MemoryC(ParallelUnit):
                     'latency': latency}, src_id=mem_type_value, dst_id=mem_type_value)
         yield from self.mem_access_submodule_list[mem_type_value].activate_feature(feature_id=self.memory_access_feature_id[mem_type_value], runtime_latency=latency)
 
-        if not mem_access_info.is_read():
-            self.total_memory_write_time += latency
-            self.each_resource_type_access_time[mem_access_info.resource_type.value][
-                MemoryC.MemAccessType.Write.value] += latency
-        else:
-            self.total_memory_read_time += latency
-            self.each_resource_type_access_time[mem_access_info.resource_type.value][
-                MemoryC.MemAccessType.Read.value] += latency
+        self.record_memory_access_time(mem_access_info, latency)
 
         if mem_access_info.request_size == 0:
             mem_access_info.event.succeed()
@@ -188,6 +187,16 @@ class MemoryC(ParallelUnit):
                 src_id=mem_type_value,
                 dst_id=mem_type_value)
 
+    def record_memory_access_time(self, mem_access_info, latency):
+        if not mem_access_info.is_read():
+            self.total_memory_write_time += latency
+            self.each_resource_type_access_time[mem_access_info.resource_type.value][
+                MemoryC.MemAccessType.Write.value] += latency
+        else:
+            self.total_memory_read_time += latency
+            self.each_resource_type_access_time[mem_access_info.resource_type.value][
+                MemoryC.MemAccessType.Read.value] += latency
+
     def memory_submodule(self, mem_access_info, mem_type_value):
         yield from self.memory_submodule_list[mem_type_value].activate_feature(feature_id=self.memory_feature_id[mem_type_value], runtime_latency=mem_access_info['latency'])
 
@@ -1,21 +1,25 @@
 from core.framework.analyzer import Analyzer
 from core.framework.common import ProductArgs, eCMDType
 from core.framework.file_path_generator import FilePathGenerator, LogOutputType
+from core.framework.simulation_context import SimulationContext
 
 
 class PerformanceMeasure:
     def __new__(cls, product_args: ProductArgs = None):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super().__new__(cls)
+        context = SimulationContext.get_current()
+        instance = context.get_instance(cls)
+        if instance is None:
+            instance = context.set_instance(cls, super().__new__(cls))
         if product_args is not None:
-            product_args.set_args_to_class_instance(cls.instance)
-            cls.instance.init_performance_measure()
-        return cls.instance
+            product_args.set_args_to_class_instance(instance)
+            instance.init_performance_measure()
+        return instance
 
     def init_performance_measure(self):
         self.analyzer = Analyzer()
         self.file_path_generator = FilePathGenerator()
         self.output_dir_name = self.file_path_generator.output_dir_name
+        self.log_file = None
 
     def init_record(self):
         self.prev_data_transfer_mapunit_count = dict()
@@ -51,11 +55,11 @@ class PerformanceMeasure:
         interval = self.param.PERF_MEASURE_INTERVAL_MS * 1e6
 
         if self.param.ENABLE_PERFORMANCE_RECORD:
-            log_file = open(
+            self.log_file = open(
                 f'{self.file_prefix}_{self.param.PERF_MEASURE_INTERVAL_MS}ms.log', 'w')
             print(
                 'Time(ns),Read(MB/s),Read(KIOPs),Write(MB/s),Write(KIOPs)',
-                file=log_file)
+                file=self.log_file)
         break_count = 0
         while True:
 
@@ -89,7 +93,11 @@ class PerformanceMeasure:
             if self.param.ENABLE_PERFORMANCE_RECORD:
                 print(
                     f'{int(self.env.now - self.base_time)},{read_perf_MB_s:.2f},{read_perf_KIOPs:d},{write_perf_MB_s:.2f},{write_perf_KIOPs:d}',
-                    file=log_file)
+                    file=self.log_file)
 
-        if self.param.ENABLE_PERFORMANCE_RECORD:
-            log_file.close()
+        self.close_log_file()
+
+    def close_log_file(self):
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
@@ -0,0 +1,12 @@
+'''
+Sector validity of a map unit kept as a plain int, bit i is set when sector i is valid.
+Merging and masking partial writes are plain int operations (|, & ~).
+'''
+
+
+def make_sector_bitmap(sector_offset, sector_count):
+    return ((1 << sector_count) - 1) << sector_offset
+
+
+def sector_bitmap_to_tuple(bitmap, sector_count):
+    return tuple((bitmap >> sector) & 1 for sector in range(sector_count))
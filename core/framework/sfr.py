@@ -1,12 +1,16 @@
 from collections import defaultdict
 
+from core.framework.simulation_context import SimulationContext
+
 
 class SFR:
     def __new__(cls):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super(SFR, cls).__new__(cls)
-            cls.instance.init_sfr()
-        return cls.instance
+        context = SimulationContext.get_current()
+        instance = context.get_instance(cls)
+        if instance is None:
+            instance = context.set_instance(cls, super(SFR, cls).__new__(cls))
+            instance.init_sfr()
+        return instance
 
     def init_sfr(self):
         self.sfr_dict = dict()
@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+from functools import wraps
+
+
+class SimulationContext:
+    '''
+    Owns one instance of every framework service of a simulation (parameters, analyzer, bus, address map,
+    power manager, allocators, ...). Service classes look their instance up in the active context, so
+    simulations built under different contexts share no mutable state.
+    initialize_environment creates a new context for every environment and makes it current while the
+    environment is built; code driving several environments in one process activates the matching context
+    around each step.
+    '''
+    current = None
+
+    def __init__(self):
+        self.instances = dict()
+        self.keyed_instances = dict()
+
+    @classmethod
+    def get_current(cls):
+        if cls.current is None:
+            cls.current = cls()
+        return cls.current
+
+    def set_current(self):
+        SimulationContext.current = self
+        return self
+
+    @contextmanager
+    def activate(self):
+        previous = SimulationContext.current
+        SimulationContext.current = self
+        try:
+            yield self
+        finally:
+            SimulationContext.current = previous
+
+    def get_instance(self, cls):
+        return self.instances.get(cls)
+
+    def set_instance(self, cls, instance):
+        self.instances[cls] = instance
+        return instance
+
+    def get_keyed_instances(self, namespace):
+        return self.keyed_instances.setdefault(namespace, dict())
+
+    def clear(self):
+        self.instances.clear()
+        self.keyed_instances.clear()
+
+
+def in_simulation_context(function):
+    '''
+    Run a method of an object holding a context (e.g. StorageSimulationEnv) with that context active.
+    '''
+    @wraps(function)
+    def wrapper(self, *args, **kwargs):
+        with self.context.activate():
+            return function(self, *args, **kwargs)
+    return wrapper
@@ -1,25 +1,27 @@
-class Singleton(type):
-    instances = {}
+from core.framework.simulation_context import SimulationContext
+
 
+class Singleton(type):
     def __call__(cls, *args, **kwargs):
-        if cls not in cls.instances:
-            cls.instances[cls] = super().__call__(*args, **kwargs)
-        return cls.instances[cls]
+        context = SimulationContext.get_current()
+        instance = context.get_instance(cls)
+        if instance is None:
+            instance = context.set_instance(cls, super().__call__(*args, **kwargs))
+        return instance
 
     @classmethod
     def clear(mcs):
-        mcs.instances.clear()
+        SimulationContext.get_current().instances.clear()
 
 
 class SingletonByKey(type):
-    instances = {}
-
     def __call__(cls, *args, **kwargs):
+        instances = SimulationContext.get_current().get_keyed_instances(SingletonByKey)
         key = (args, tuple(kwargs.items()))
-        if key not in cls.instances:
-            cls.instances[key] = super().__call__(*args, **kwargs)
-        return cls.instances[key]
+        if key not in instances:
+            instances[key] = super().__call__(*args, **kwargs)
+        return instances[key]
 
     @classmethod
     def clear(cls):
-        cls.instances = {}
+        SimulationContext.get_current().get_keyed_instances(SingletonByKey).clear()
@@ -7,8 +7,9 @@ from core.backbone.bus import BusWaitingQ
 from core.backbone.power_manager import PowerManager
 from core.framework.analyzer import Analyzer
 from core.framework.common import ProductArgs, QFetchType
-from core.framework.latency_logger import LatencyLogger
+from core.framework.latency_logger import LatencyLogger, LoggingSection
 from core.framework.submodule_event import SubmoduleEvent
+from core.framework.submodule_profiler import SubmoduleProfiler
 
 
 class SubmoduleQ(deque):
@@ -60,6 +61,7 @@ class SubmoduleInfo:
             self.wait = self.wait_from_bus
             self.reset_wait_event = self.reset_wait_event_from_bus
             self.pop_queue = self.pop_queue_from_bus
+            self.get_queue_length = self.get_queue_length_from_bus
         else:
             self.wakeup = SubmoduleEvent(self.env)
             if q_fetch_type == QFetchType.FIFO:
@@ -73,6 +75,7 @@ class SubmoduleInfo:
             self.wait = self.wait_from_submodule
             self.reset_wait_event = self.reset_wait_event_from_submodule
             self.pop_queue = self.pop_queue_from_submodule
+            self.get_queue_length = self.get_queue_length_from_submodule
 
         self.generate()
 
@@ -136,6 +139,12 @@ class SubmoduleInfo:
         self.queue[q_id].popleft()
         self.queue_job_count -= 1
 
+    def get_queue_length_from_bus(self):
+        return len(self.queue.dst_queue)
+
+    def get_queue_length_from_submodule(self):
+        return self.queue_job_count
+
 
 class SubModule:
     def __init__(
@@ -162,27 +171,39 @@ class SubModule:
             user_queue,
             is_dummy=is_dummy)
         self.analyzer = Analyzer()
-        if any(
-            (self.param.ENABLE_POWER,
-             self.param.ENABLE_VCD,
-             self.param.RECORD_SUBMODULE_UTILIZATION,
-             self.param.ENABLE_SUBMODULE_WAKEUP_VCD,
-             self.param.ENABLE_LATENCY_LOGGER)):
-            self.power_manager = PowerManager()
-            self.power_manager.add_sub_module(
-                ip_name, self.submodule_info.name, feature_id)
-            self.latency_logger = LatencyLogger()
-        else:
+        self.power_manager = PowerManager()
+        self.power_manager.add_sub_module(
+            ip_name, self.submodule_info.name, feature_id)
+        self.latency_logger = LatencyLogger()
+
+        # Submodule diagram needs per-job latency accounting of the process loop.
+        # Latency logger is attached per submodule as a job done hook in fast sim loop.
+        if not self.param.GENERATE_SUBMODULE_DIAGRAM:
             self.process = self.process_fast_sim
-            self.activate_feature = self.activate_feature_fast_sim
-            self.deactivate_feature = self.deactivate_feature_fast_sim
+            if not any(
+                (self.param.ENABLE_POWER,
+                 self.param.RECORD_SUBMODULE_UTILIZATION,
+                 self.param.ENABLE_VCD and self.param.ENABLE_SUBMODULE_WAKEUP_VCD)):
+                self.activate_feature = self.activate_feature_fast_sim
+                self.deactivate_feature = self.deactivate_feature_fast_sim
 
         if not is_dummy:
-            self.process_handle = self.env.process(self.process(s_id, func))
+            if self.param.ENABLE_SUBMODULE_PROFILER:
+                self.process_handle = self.env.process(self.process_with_profile(s_id, func))
+            else:
+                self.process_handle = self.env.process(self.process(s_id, func))
 
     def __repr__(self):
         return self.submodule_info.name
 
+    def process_with_profile(self, s_id, func):
+        submodule_profiler = SubmoduleProfiler()
+        submodule_info = self.submodule_info
+        record = submodule_profiler.add_record(submodule_info.ip_name, f'{submodule_info.ip_name}.{submodule_info.name}')
+        submodule_info.pop_queue = submodule_profiler.attach_job_hook(
+            record, submodule_info.pop_queue, submodule_info.get_queue_length)
+        return submodule_profiler.profile_process(record, self.process(s_id, func))
+
     def record_utilization(self, time_value):
         try:
             self.submodule_info.consumed_time += time_value
@@ -214,7 +235,10 @@ class SubModule:
             yield from self.power_manager.activate_feature(self.submodule_info.ip_name, self.submodule_info.name, feature_id, runtime_active_power)
 
         result = True
-        yield self.env.timeout(runtime_latency)
+        try:
+            yield self.env.timeout(runtime_latency)
+        except simpy.Interrupt:
+            self.is_interrupt = True
         if self.is_interrupt:
             result = False
             self.is_interrupt = False
@@ -340,9 +364,31 @@ class SubModule:
     def deactivate_feature_fast_sim(self, feature_id=None):
         pass
 
+    def attach_latency_logging_hook(self, func, s_id):
+        if not self.param.ENABLE_LATENCY_LOGGER:
+            return func
+
+        name = self.submodule_info.name
+        section, _ = self.latency_logger.get_section(name, s_id)
+        if section == LoggingSection.eAll:
+            return func
+
+        logging_latency = self.latency_logger.logging_latency
+        if isgeneratorfunction(func):
+            def func_with_latency_logging(packet, *args):
+                yield from func(packet, *args)
+                logging_latency(name, s_id, packet)
+        else:
+            def func_with_latency_logging(packet, *args):
+                func(packet, *args)
+                logging_latency(name, s_id, packet)
+        return func_with_latency_logging
+
     def process_fast_sim(self, s_id, func):
         is_yield_exist_in_func = isgeneratorfunction(func)
         yield self.env.timeout(0)
+        # logging positions are registered after every submodule is generated
+        func = self.attach_latency_logging_hook(func, s_id)
 
         def function_wrapper(func, packet, s_id):
             return func(packet)
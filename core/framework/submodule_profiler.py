@@ -0,0 +1,182 @@
+import gc
+import time
+
+from core.framework.common import ProductArgs
+from core.framework.data_printer import DataPrinter
+from core.framework.simulation_context import SimulationContext
+from simpy.events import NORMAL
+
+
+gc_time = [0, None]
+
+
+def record_gc_time(phase, info):
+    # collections are charged to no submodule, a sampled resume excludes the ones it ran into
+    if phase == 'start':
+        gc_time[1] = time.perf_counter()
+    else:
+        gc_time[0] += time.perf_counter() - gc_time[1]
+
+
+class ProfileRecord:
+    def __init__(self, ip_name, name):
+        self.ip_name = ip_name
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self.host_time = 0
+        self.event_count = 0
+        self.job_count = 0
+        self.queue_high_water = 0
+
+    def scale_sample(self, sample_interval):
+        self.host_time *= sample_interval
+        self.event_count *= sample_interval
+
+    def merge(self, record):
+        self.host_time += record.host_time
+        self.event_count += record.event_count
+        self.job_count += record.job_count
+        self.queue_high_water = max(self.queue_high_water, record.queue_high_water)
+
+
+class SubmoduleProfiler:
+    '''
+    Attributes host time, scheduled simpy events, processed jobs and queue high-water mark to every submodule
+    (and bus process) by wrapping its simpy process generator and queue pop.
+    Host time and scheduled events are each measured on one resume in SAMPLE_INTERVAL (not the same one, the
+    counting hook would be timed) and scaled by it, the other resumes are only forwarded. Jobs and queue
+    high-water are exact.
+    ParallelUnit.wakeup / send_sq and allocator calls run inside the calling submodule's resume, so they are
+    charged to it. Time spent out of any profiled process (simpy kernel, callbacks, host) is reported as unattributed,
+    events scheduled there are not counted.
+    Nothing is wrapped unless ENABLE_SUBMODULE_PROFILER is set.
+    '''
+    # prime, so a process alternating between a few kinds of resume is not always sampled on the same one
+    SAMPLE_INTERVAL = 17
+
+    def __new__(cls, product_args: ProductArgs = None):
+        context = SimulationContext.get_current()
+        instance = context.get_instance(cls)
+        if instance is None:
+            instance = context.set_instance(cls, super().__new__(cls))
+        if product_args is not None:
+            product_args.set_args_to_class_instance(instance)
+            instance.init_profiler()
+        return instance
+
+    def init_profiler(self):
+        self.record_list = list()
+        self.unattributed_record = ProfileRecord('-', 'unattributed')
+        self.active_record = self.unattributed_record
+        self.start_time = 0
+        self.end_time = 0
+        self.schedule = None
+        if self.param.ENABLE_SUBMODULE_PROFILER and record_gc_time not in gc.callbacks:
+            gc.callbacks.append(record_gc_time)
+
+    def counting_schedule(self, event, priority=NORMAL, delay=0):
+        self.active_record.event_count += 1
+        self.schedule(event, priority, delay)
+
+    def add_record(self, ip_name, name):
+        record = ProfileRecord(ip_name, name)
+        self.record_list.append(record)
+        return record
+
+    def profile_process(self, record, generator):
+        # env.schedule is only swapped for the counting one during an event sample, which is never timed
+        perf_counter = time.perf_counter
+        env, counting_schedule = self.env, self.counting_schedule
+        send, throw = generator.send, generator.throw
+        sample_interval = self.SAMPLE_INTERVAL
+        sample_countdown = 2
+        value, exception = None, None
+        while True:
+            sample_countdown -= 1
+            if sample_countdown == 1:
+                self.active_record = record
+                self.schedule = env.schedule
+                env.schedule = counting_schedule
+            elif not sample_countdown:
+                sample_countdown = sample_interval
+                start_gc_time = gc_time[0]
+                start_time = perf_counter()
+            try:
+                if exception is None:
+                    event = send(value)
+                else:
+                    event = throw(exception)
+            except StopIteration as e:
+                return e.value
+            finally:
+                if sample_countdown == 1:
+                    env.schedule = self.schedule
+                elif sample_countdown == sample_interval:
+                    record.host_time += perf_counter() - start_time - (gc_time[0] - start_gc_time)
+
+            try:
+                value = yield event
+            except BaseException as e:
+                exception = e
+            else:
+                exception = None
+
+    def attach_job_hook(self, record, pop_queue, get_queue_length):
+        # the queue only grows between two pops, so its length before each pop gives the high-water mark
+        def pop_queue_with_job_count(q_id=None):
+            queue_length = get_queue_length()
+            if queue_length > record.queue_high_water:
+                record.queue_high_water = queue_length
+            record.job_count += 1
+            pop_queue(q_id)
+        return pop_queue_with_job_count
+
+    def start(self):
+        for record in self.record_list:
+            record.reset()
+        self.unattributed_record.reset()
+        self.start_time = time.perf_counter()
+
+    def stop(self):
+        self.end_time = time.perf_counter()
+        for record in self.record_list:
+            record.scale_sample(self.SAMPLE_INTERVAL)
+        self.unattributed_record.host_time = self.end_time - self.start_time - \
+            sum(record.host_time for record in self.record_list)
+
+    def get_ip_record_list(self):
+        ip_record_dict = dict()
+        for record in self.record_list:
+            if record.ip_name not in ip_record_dict:
+                ip_record_dict[record.ip_name] = ProfileRecord(record.ip_name, record.ip_name)
+            ip_record_dict[record.ip_name].merge(record)
+        return list(ip_record_dict.values())
+
+    def generate_table(self, record_list, total_time):
+        data = [['Name', 'Host Time(ms)', 'Host Time(%)', 'Event', 'Job', 'Queue Max']]
+        for record in sorted(record_list, key=lambda r: r.host_time, reverse=True):
+            if not record.host_time and not record.job_count:
+                continue
+            data.append([record.name,
+                         f'{record.host_time * 1e3:.1f}',
+                         f'{record.host_time / total_time * 100:.2f}',
+                         f'{record.event_count:d}',
+                         f'{record.job_count:d}',
+                         f'{record.queue_high_water:d}'])
+        return data
+
+    def print_profile(self, workload_name=''):
+        if not self.param.ENABLE_SUBMODULE_PROFILER:
+            return
+
+        total_time = max(self.end_time - self.start_time, 1e-9)
+        total_event_count = self.unattributed_record.event_count + sum(record.event_count for record in self.record_list)
+        DataPrinter.print_bold(f'* Print Submodule Profile {workload_name}')
+        DataPrinter.print(f'- Total Host Time: {total_time:.3f} s, Scheduled Events: {total_event_count:d} '
+                          f'(sampled on 1 resume in {self.SAMPLE_INTERVAL})')
+        DataPrinter.print('- Each IP')
+        DataPrinter.print_table(self.generate_table(self.get_ip_record_list() + [self.unattributed_record], total_time))
+        DataPrinter.print('- Each submodule')
+        DataPrinter.print_table(self.generate_table(self.record_list + [self.unattributed_record], total_time))
@@ -2,6 +2,7 @@ import inspect
 
 import numpy as np
 from core.framework.common import ProductArgs
+from core.framework.simulation_context import SimulationContext
 
 
 def VCDManagerFuncDecorator(func):
@@ -23,12 +24,14 @@ def VCDManagerClassDecorator(cls):
 @VCDManagerClassDecorator
 class VCDManager:
     def __new__(cls, product_args: ProductArgs = None):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super().__new__(cls)
+        context = SimulationContext.get_current()
+        instance = context.get_instance(cls)
+        if instance is None:
+            instance = context.set_instance(cls, super().__new__(cls))
         if product_args:
-            product_args.set_args_to_class_instance(cls.instance)
-            cls.instance.init_vcd_manager()
-        return cls.instance
+            product_args.set_args_to_class_instance(instance)
+            instance.init_vcd_manager()
+        return instance
 
     def init_vcd_manager(self):
         self.vcd_file_name = self.param.VCD_FILE_NAME
@@ -1,5 +1,4 @@
 from collections import deque
-from math import ceil
 
 import simpy
 from core.config.basic_workload_generator import BasicWorkloadGenerator
@@ -52,17 +51,8 @@ class Host(ParallelUnit):
         else:
             self.env.process(self.benchmark_start(workload, cmd_count))
 
-    def reset_analyzer_with_workload_size(self, df):
-
-        workload_io_cmd = df.loc[(df[WorkloadColumn.io_type] == 'Write') | (df[WorkloadColumn.io_type] == 'Read') | (df[WorkloadColumn.io_type] == 'Flush'), [WorkloadColumn.min_offset, WorkloadColumn.size]]
-
-        def calculate_aligned_size(min_offset, size):
-            return (ceil((min_offset + size) / self.param.FTL_MAP_UNIT_SIZE) - (
-                        min_offset // self.param.FTL_MAP_UNIT_SIZE)) * self.param.FTL_MAP_UNIT_SIZE
-
-        workload_size_total = workload_io_cmd.apply(lambda x: calculate_aligned_size(x[WorkloadColumn.min_offset], x[WorkloadColumn.size]),
-                                                    axis=1).sum()
-        self.analyzer.reset_analyzer(len(workload_io_cmd), workload_size_total)
+    def reset_analyzer_with_workload_size(self, workload):
+        self.analyzer.reset_analyzer(workload.io_cmd_count, workload.io_aligned_bytes)
 
     def check_host_qd(self):
         host_qd_available = self.host_qd.request()
@@ -88,29 +78,34 @@ class Host(ParallelUnit):
     def benchmark_start(self, workload, cmd_count):
         self.cmd_id = 0
         base_lba = 0
-        df = workload.df
 
         if cmd_count != -1:
             self.analyzer.reset_analyzer(cmd_count)
         else:
-            self.reset_analyzer_with_workload_size(df)
+            self.reset_analyzer_with_workload_size(workload)
 
-        delay_info = deque(df[WorkloadColumn.init_time].iloc[1:].values - df[WorkloadColumn.init_time].iloc[:-1].values)
-        delay_info.appendleft(0)
-        for io_type, size, init_time, min_offset, delay in zip(df[WorkloadColumn.io_type],
-                                                               df[WorkloadColumn.size],
-                                                               df[WorkloadColumn.init_time],
-                                                               df[WorkloadColumn.min_offset],
-                                                               delay_info):
-
-            if io_type not in CommandClassifier.workload_type_dict.keys():
+        last_init_time = None
+        for df in workload.iter_chunks():
+            if df.empty:
                 continue
-            cmd = self.generate_cmd(io_type, size, min_offset, base_lba)
-            yield from self.handle_cmd(delay, cmd)
-
-            self.increase_cmd_id()
-            if cmd_count != -1 and cmd_count <= self.cmd_id:
-                break
+            init_time = df[WorkloadColumn.init_time].values
+            delay_info = deque(init_time[1:] - init_time[:-1])
+            delay_info.appendleft(0 if last_init_time is None else init_time[0] - last_init_time)
+            last_init_time = init_time[-1]
+            for io_type, size, init_time, min_offset, delay in zip(df[WorkloadColumn.io_type],
+                                                                   df[WorkloadColumn.size],
+                                                                   df[WorkloadColumn.init_time],
+                                                                   df[WorkloadColumn.min_offset],
+                                                                   delay_info):
+
+                if io_type not in CommandClassifier.workload_type_dict.keys():
+                    continue
+                cmd = self.generate_cmd(io_type, size, min_offset, base_lba)
+                yield from self.handle_cmd(delay, cmd)
+
+                self.increase_cmd_id()
+                if cmd_count != -1 and cmd_count <= self.cmd_id:
+                    return
 
     def basic_start(self, workload: BasicWorkload):
         self.cmd_id = 0
@@ -1,5 +1,6 @@
 from abc import ABCMeta, abstractmethod
 from collections import deque
+from heapq import heappop, heappush
 from random import seed
 from typing import Dict
 
@@ -38,6 +39,13 @@ class NANDStats:
 
 
 class NANDIOPin:
+    '''
+    Head job of every way queue is indexed by its priority level: a heap of (time_stamp, -way) per level
+    and a bitmask of levels holding a head per channel. fetch_job takes the highest level, the oldest head
+    inside it and the higher way on a time_stamp tie, the same order a scan over all ways gives.
+    '''
+    PRIORITY_LEVEL_COUNT = 6
+
     def __init__(self, env, channel_count, way_count):
         self.env = env
         self.channel_count = channel_count
@@ -46,12 +54,24 @@ class NANDIOPin:
         self.job_count = [0 for _ in range(self.channel_count)]
         self.queue = [[deque() for _ in range(way_count)]
                       for _ in range(channel_count)]
+        self.ready_heap = [[[] for _ in range(self.PRIORITY_LEVEL_COUNT)]
+                           for _ in range(channel_count)]
+        self.ready_level_mask = [0 for _ in range(channel_count)]
         self.event = [SubmoduleEvent(self.env) for _ in range(channel_count)]
 
     def append(self, ch, data):
         way = data['way']
-        self.queue[ch][way].append(data)
+        queue = self.queue[ch][way]
+        queue.append(data)
         self.job_count[ch] += 1
+        if len(queue) == 1:
+            self.push_ready_way(ch, way)
+
+    def push_ready_way(self, ch, way):
+        data = self.queue[ch][way][0]
+        level = self.get_priority_level(data['nand_cmd_type'])
+        heappush(self.ready_heap[ch][level], (data['time_stamp'], -way))
+        self.ready_level_mask[ch] |= 1 << level
 
     def notify(self, ch):
         self.event[ch].trigger()
@@ -81,38 +101,23 @@ class NANDIOPin:
 
         return 1
 
-    def compare_priority(self, left, right):
-        if left is None:
-            return True
-
-        left_nand_cmd_type = left['nand_cmd_type']
-        right_nand_cmd_type = right['nand_cmd_type']
-        if self.get_priority_level(
-                left_nand_cmd_type) > self.get_priority_level(right_nand_cmd_type):
-            return False
-        if self.get_priority_level(
-                left_nand_cmd_type) < self.get_priority_level(right_nand_cmd_type):
-            return True
-        if left['time_stamp'] < right['time_stamp']:
-            return False
-        return True
-
     def fetch_job(self, channel):
-        target_data = None
-        target_way = None
-        for way, Q in enumerate(self.queue[channel]):
-            try:
-                cur_data = Q[0]
-            except IndexError:
-                continue
+        level_mask = self.ready_level_mask[channel]
+        if not level_mask:
+            return None
 
-            if self.compare_priority(target_data, cur_data):
-                target_way, target_data = way, cur_data
+        level = level_mask.bit_length() - 1
+        heap = self.ready_heap[channel][level]
+        way = -heappop(heap)[1]
+        if not heap:
+            self.ready_level_mask[channel] = level_mask & ~(1 << level)
 
-        if target_data is not None:
-            self.job_count[channel] -= 1
-            return self.queue[channel][target_way].popleft()
-        return None
+        queue = self.queue[channel][way]
+        data = queue.popleft()
+        self.job_count[channel] -= 1
+        if queue:
+            self.push_ready_way(channel, way)
+        return data
 
 
 class Latch(metaclass=ABCMeta):
@@ -255,6 +260,8 @@ class WriteTypeInfo:
         self.remain_time: float = 0.0
         self.prev_s_latch_info: list[bool] | None = None
         self.prev_d_latch_info: int | None = None
+        # collapsed plane operation 에서 busy 구간을 수행 중인 plane
+        self.lead_plane: int = -1
 
     def __repr__(self) -> str:
         return f'WriteTypeInfo({self.cmd_type}, end_time={self.expected_end_time}, remain_time={self.remain_time})'
@@ -595,20 +602,31 @@ class NAND(ParallelUnit):
         cmd_type = packet['nand_cmd_type']
         self.write_type_info[chip_id].set_info(
             cmd_type, self.env.now + packet['operation_time'])
+        if self.param.ENABLE_COLLAPSED_PLANE_OPERATION:
+            self.write_type_info[chip_id].lead_plane = self.get_lead_plane(packet, chip_id)
 
     def suspend_operation(self, packet, chip_id):
         cmd_type = packet['nand_cmd_type']
         if busy_cmd := self.write_type_info[chip_id].cmd_type:
-            base_plane_id = chip_id * self.param.PLANE
-            for plane in range(self.param.PLANE):
-                plane_id = base_plane_id + plane
-                self.plane_submodule_list[plane_id].interrupt(
+            if self.param.ENABLE_COLLAPSED_PLANE_OPERATION:
+                self.plane_submodule_list[self.write_type_info[chip_id].lead_plane].interrupt(
                     f'{busy_cmd.name}_suspend')
                 self.wakeup_by_inst(
                     self.way_operation_submodule[chip_id],
-                    self.plane_submodule_list[plane_id],
+                    self.plane_submodule_list[self.get_lead_plane(packet, chip_id)],
                     packet,
                     description=cmd_type.name)
+            else:
+                base_plane_id = chip_id * self.param.PLANE
+                for plane in range(self.param.PLANE):
+                    plane_id = base_plane_id + plane
+                    self.plane_submodule_list[plane_id].interrupt(
+                        f'{busy_cmd.name}_suspend')
+                    self.wakeup_by_inst(
+                        self.way_operation_submodule[chip_id],
+                        self.plane_submodule_list[plane_id],
+                        packet,
+                        description=cmd_type.name)
             self.write_type_info[chip_id].remain_time = (self.write_type_info[
                 chip_id].expected_end_time - self.env.now + self.param.PGM_OVERHEAD_PER_SUSPEND) / 1e3
             self.write_type_info[chip_id].set_prev_info(
@@ -649,6 +667,14 @@ class NAND(ParallelUnit):
                 self.suspend_operation(packet, chip_id)
                 return
 
+        if self.param.ENABLE_COLLAPSED_PLANE_OPERATION:
+            self.wakeup_by_inst(
+                self.way_operation_submodule[chip_id],
+                self.plane_submodule_list[self.get_lead_plane(packet, chip_id)],
+                packet,
+                description=cmd_type.name)
+            return
+
         for plane_id in packet['target_plane_id']:
             plane = chip_id * self.param.PLANE + plane_id
             self.wakeup_by_inst(
@@ -712,21 +738,46 @@ class NAND(ParallelUnit):
         else:
             return plane % self.param.PLANE == 0 or is_1p_program_cmd(cmd_type)
 
+    def get_operation_plane_list(self, packet, chip_id):
+        base_plane_id = chip_id * self.param.PLANE
+        if is_suspend_cmd(packet['nand_cmd_type']):
+            return list(range(base_plane_id, base_plane_id + self.param.PLANE))
+        return [base_plane_id + plane_id for plane_id in packet['target_plane_id']]
+
+    def get_lead_plane(self, packet, chip_id):
+        '''
+        Plane that sends the NFC done of the operation, all planes of a multi-plane operation share one busy time.
+        '''
+        plane_list = self.get_operation_plane_list(packet, chip_id)
+        cmd_type = packet['nand_cmd_type']
+        for plane in plane_list:
+            if self.is_nfc_done_notify_packet(plane, cmd_type):
+                return plane
+        return plane_list[0]
+
     def get_vcd_tag(self, packet):
 
         return 1
 
     def plane_operation(self, packet, plane):
         cmd_type = packet['nand_cmd_type']
+        if self.param.ENABLE_COLLAPSED_PLANE_OPERATION:
+            plane_list = self.get_operation_plane_list(packet, plane // self.param.PLANE)
+        else:
+            plane_list = (plane, )
 
-        self.vcd_manager.nand_operation(
-            plane, self.get_vcd_tag(packet), cmd_type)
+        for op_plane in plane_list:
+            self.vcd_manager.nand_operation(
+                op_plane, self.get_vcd_tag(packet), cmd_type)
         try:
             cell_type = packet['cell_type']
             busy_done = yield from self.plane_submodule_list[plane].activate_feature(self.feature.NAND_OPERATION[hash((cmd_type, cell_type))], runtime_latency=packet['operation_time'])
         except KeyError:
             busy_done = yield from self.plane_submodule_list[plane].activate_feature(self.feature.NAND_OPERATION[cmd_type], runtime_latency=packet['operation_time'])
-        self.vcd_manager.nand_operation(plane, 0, cmd_type)
+        for op_plane in plane_list:
+            self.vcd_manager.nand_operation(op_plane, 0, cmd_type)
+            if op_plane != plane and self.param.RECORD_SUBMODULE_UTILIZATION and self.analyzer.is_sustained_perf_measure_state:
+                self.plane_submodule_list[op_plane].record_utilization(packet['operation_time'])
 
         if busy_done:
             channel = get_channel_id(packet)
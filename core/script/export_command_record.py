@@ -0,0 +1,13 @@
+import argparse
+import os
+
+from core.framework.command_record import CommandRecordReader
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export a binary command record to csv')
+    parser.add_argument('record_file', help='*_command_record.bin file')
+    parser.add_argument('csv_file', nargs='?', help='output csv file, defaults to the record file name with .csv')
+    args = parser.parse_args()
+
+    csv_file = args.csv_file or f'{os.path.splitext(args.record_file)[0]}.csv'
+    CommandRecordReader(args.record_file).export_csv(csv_file)
@@ -1,6 +1,7 @@
-import math
 import os
+import queue
 import re
+import threading
 from collections import deque
 
 import numpy as np
@@ -8,11 +9,130 @@ import pandas as pd
 from core.config.core_parameter import CoreParameter
 
 
+class WorkloadSummary:
+    def __init__(self):
+        self.io_type_count = {}
+        self.io_cmd_count = 0
+        self.io_aligned_bytes = 0
+        self.read_write_aligned_bytes = 0
+        self.max_offset = 0
+
+    def add_chunk(self, df, map_unit_size):
+        for io_type, count in df[WorkloadColumn.io_type].value_counts(sort=False).items():
+            self.io_type_count[io_type] = self.io_type_count.get(io_type, 0) + int(count)
+
+        io_type = df[WorkloadColumn.io_type]
+        is_read_write = (io_type == 'Read') | (io_type == 'Write')
+        is_io = is_read_write | (io_type == 'Flush')
+        end_offset = df[WorkloadColumn.min_offset] + df[WorkloadColumn.size]
+        aligned_size = (-(-end_offset // map_unit_size) - df[WorkloadColumn.min_offset] // map_unit_size) * map_unit_size
+        self.io_cmd_count += int(is_io.sum())
+        self.io_aligned_bytes += int(aligned_size[is_io].sum())
+        self.read_write_aligned_bytes += int(aligned_size[is_read_write].sum())
+        if is_read_write.any():
+            self.max_offset = max(self.max_offset, int(end_offset[is_read_write].max()))
+
+    def print_io_type_count(self):
+        num_write = self.io_type_count.get('Write', 0)
+        num_read = self.io_type_count.get('Read', 0)
+        num_flush = self.io_type_count.get('Flush', 0)
+        print(f"num_write\t{num_write}")
+        print(f"num_read\t{num_read}")
+        print(f"num_flush\t{num_flush}")
+        print("-" * 25)
+        print(f"num_total\t{num_write + num_read + num_flush}")
+
+
 class WorkloadInfo:
-    def __init__(self, workload_name, df, qd=None):
+    def __init__(self, workload_name, map_unit_size, df=None, qd=None, chunk_reader=None, summary_reader=None):
         self.name = workload_name
+        self.map_unit_size = map_unit_size
         self.df = df
         self.qd = qd
+        self.chunk_reader = chunk_reader
+        self.summary_reader = summary_reader
+        self.summary = None
+
+    def iter_chunks(self):
+        '''
+        Chunks of the trace. The first pass reaching the end also fills the summary, so it is not read again for it.
+        '''
+        summary = WorkloadSummary() if self.summary is None else None
+        chunk_iter = [self.df] if self.df is not None else prefetch_chunks(self.chunk_reader())
+        for df in chunk_iter:
+            if summary is not None:
+                summary.add_chunk(df, self.map_unit_size)
+            yield df
+        if summary is not None:
+            self.set_summary(summary)
+
+    def set_summary(self, summary):
+        self.summary = summary
+        summary.print_io_type_count()
+
+    def get_summary(self):
+        '''
+        Summary of a trace not streamed yet comes from a scan of the few columns it needs.
+        '''
+        if self.summary is None:
+            summary = WorkloadSummary()
+            for df in ([self.df] if self.df is not None else self.summary_reader()):
+                summary.add_chunk(df, self.map_unit_size)
+            self.set_summary(summary)
+        return self.summary
+
+    @property
+    def io_type_count(self):
+        return self.get_summary().io_type_count
+
+    @property
+    def io_cmd_count(self):
+        return self.get_summary().io_cmd_count
+
+    @property
+    def io_aligned_bytes(self):
+        return self.get_summary().io_aligned_bytes
+
+    @property
+    def read_write_aligned_bytes(self):
+        return self.get_summary().read_write_aligned_bytes
+
+
+def prefetch_chunks(chunk_iter, depth=1):
+    '''
+    Parse the next chunks in a background thread while the current one is consumed.
+    '''
+    chunk_queue = queue.Queue(maxsize=depth)
+    stop_event = threading.Event()
+    end = object()
+
+    def put(item):
+        while not stop_event.is_set():
+            try:
+                chunk_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def producer():
+        try:
+            for chunk in chunk_iter:
+                if not put(chunk):
+                    return
+        except Exception as e:
+            put(e)
+        put(end)
+
+    thread = threading.Thread(target=producer, daemon=True)
+    thread.start()
+    try:
+        while (item := chunk_queue.get()) is not end:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop_event.set()
 
 
 class WorkloadColumn:
@@ -27,7 +147,9 @@ class WorkloadReader:
     def __init__(self, directory_path, param):
         self.workload_list = deque()
         self.meta_map_file = None
-        self.workload_max_offset = 0
+        self.workload_lines = param.WORKLOAD_LINES
+        self.chunk_lines = param.WORKLOAD_CHUNK_LINES
+        self.map_unit_size = param.FTL_MAP_UNIT_SIZE
 
         file_name_list = sorted([name for name in os.listdir(directory_path) if os.path.isfile(os.path.join(directory_path, name))])
 
@@ -39,67 +161,53 @@ class WorkloadReader:
         workload_file_list = [name for name in file_name_list if name.endswith('.csv') or name.endswith('.txt')]
         for file_name in workload_file_list:
             workload_name = file_name.split('.')[0]
-            df = pd.read_csv(os.path.join(directory_path, file_name))
-            df = df.iloc[:param.WORKLOAD_LINES]
-            df = self.data_processing(df)
-
-            num_write = len(df[df["IO Type"] == "Write"])
-            num_read = len(df[df["IO Type"] == "Read"])
-            num_flush = len(df[df["IO Type"] == "Flush"])
-            print(f"num_write\t{num_write}")
-            print(f"num_read\t{num_read}")
-            print(f"num_flush\t{num_flush}")
-            print("-" * 25)
-            print(f"num_total\t{num_write + num_read + num_flush}")
-
-            self.workload_max_offset = max(self.workload_max_offset, self.get_workload_max_byte_offset(df))
+            file_path = os.path.join(directory_path, file_name)
             try:
                 qd = int(re.search('QD([0-9]+)', file_name).group(1))
-                info = WorkloadInfo(workload_name, df, qd)
             except AttributeError:
-                info = WorkloadInfo(workload_name, df)
+                qd = None
+
+            if self.chunk_lines:
+                info = WorkloadInfo(workload_name, self.map_unit_size, qd=qd,
+                                    chunk_reader=lambda file_path=file_path: self.read_chunks(file_path),
+                                    summary_reader=lambda file_path=file_path: self.read_summary_chunks(file_path))
+            else:
+                df = pd.read_csv(file_path)
+                df = df.iloc[:self.workload_lines]
+                info = WorkloadInfo(workload_name, self.map_unit_size, self.data_processing(df), qd)
+
             self.workload_list.append(info)
 
-    def calculate_unmapped_lpn_set(self, mapunit_size):
-        written_lpn_set = set()
-        unmapped_lpn_set = set()
-        for info in self.workload_list:
-            df = info.df
-            read_write_df = df[(df[WorkloadColumn.io_type] == 'Read') | (df[WorkloadColumn.io_type] == 'Write') | (df[WorkloadColumn.io_type] == 'Flush')]
-            for cmd_type, size, min_offset in zip(read_write_df[WorkloadColumn.io_type], read_write_df[WorkloadColumn.size], read_write_df[WorkloadColumn.min_offset]):
-                start_lpn = math.floor(min_offset / mapunit_size)
-                lpn_count = math.ceil(size / mapunit_size)
-                if cmd_type == 'Write':
-                    written_lpn_set.update([start_lpn + lpn_offset for lpn_offset in range(lpn_count)])
-                else:
-                    unmapped_lpn_list = [start_lpn + lpn_offset for lpn_offset in range(lpn_count) if start_lpn + lpn_offset not in written_lpn_set]
-                    unmapped_lpn_set.update(unmapped_lpn_list)
-
-        return unmapped_lpn_set
-
-    def generate_prevent_unmap_df(self, param):
-        unmapped_lpn_set = self.calculate_unmapped_lpn_set(param.MAPUNIT_SIZE)
-        df = pd.DataFrame(columns=self.workload_list[0].df.columns)
-
-        df[WorkloadColumn.init_time] = [0 for _ in range(len(unmapped_lpn_set))]
-        df[WorkloadColumn.io_type] = ['Write' for _ in range(len(unmapped_lpn_set))]
-        df[WorkloadColumn.size] = [param.MAPUNIT_SIZE for _ in range(len(unmapped_lpn_set))]
-        df[WorkloadColumn.min_offset] = [lpn * param.MAPUNIT_SIZE for lpn in sorted(unmapped_lpn_set)]
-        df[WorkloadColumn.qd] = [32 for _ in range(len(unmapped_lpn_set))]
-        return df
+    @property
+    def workload_max_offset(self):
+        return max((info.get_summary().max_offset for info in self.workload_list), default=0)
 
-    def get_workload_max_byte_offset(self, df):
-        is_read = df[WorkloadColumn.io_type] == 'Read'
-        is_write = df[WorkloadColumn.io_type] == 'Write'
-        read_write_df = df[is_read | is_write]
+    def read_chunks(self, file_path):
+        for df in pd.read_csv(file_path, chunksize=self.chunk_lines, nrows=self.workload_lines):
+            yield self.data_processing(df)
 
-        return (read_write_df[WorkloadColumn.size] + read_write_df[WorkloadColumn.min_offset]).max()
+    def read_summary_chunks(self, file_path):
+        summary_columns = (WorkloadColumn.io_type, WorkloadColumn.size, WorkloadColumn.min_offset)
+        for df in pd.read_csv(file_path, chunksize=self.chunk_lines, nrows=self.workload_lines, usecols=summary_columns):
+            yield self.convert_offset_size(self.strip_comma(df))
+
+    def strip_comma(self, df):
+        # df = df.applymap(lambda x: x.replace(',', '') if isinstance(x, str) else x)
+        return df.assign(**{column: df[column].map(lambda x: x.replace(',', '') if isinstance(x, str) else x)
+                            for column in df.columns if not pd.api.types.is_numeric_dtype(df[column])})
+
+    def convert_offset_size(self, df):
+        df[WorkloadColumn.size] = df[WorkloadColumn.size].astype(int)
+        if '0x' in str(df[WorkloadColumn.min_offset].iloc[0]):
+            df[WorkloadColumn.min_offset] = df[WorkloadColumn.min_offset].map(lambda x: int(x, 16))
+        else:
+            df[WorkloadColumn.min_offset] = df[WorkloadColumn.min_offset].astype(np.int64)
+        return df
 
     def data_processing(self, df):
         src_time = {'(s)': 1e9, '(ms)': 1e6, '(us)': 1e3, '(ps)': 1e-3}
 
-        # df = df.applymap(lambda x: x.replace(',', '') if isinstance(x, str) else x)
-        df = df.map(lambda x: x.replace(',', '') if isinstance(x, str) else x)
+        df = self.strip_comma(df)
 
         if 'QD' in df.columns or 'QD/I - Queue Depth at Init Time' in df.columns:
             qd_column = [column for column in df if 'QD' in column]
@@ -117,8 +225,6 @@ class WorkloadReader:
                 assert WorkloadColumn.init_time == 'Init Time (ns)', 'workload support ns scale'
                 break
 
-        df['Size (B)'] = df['Size (B)'].astype(int)
-
         if 'Completion Time (us)' in df:
             df['Completion Time (us)'] = df['Completion Time (us)'].astype('int64').apply(lambda x: x * 1e3)
             df['Latency (us)'] = df['Latency (us)'].astype('int64').apply(lambda x: x * 1e3)
@@ -128,12 +234,7 @@ class WorkloadReader:
             df.rename(columns={'Latency (us)': 'Latency (ns)'}, inplace=True)
             df.rename(columns={'Host Delay (us)': 'Host Delay (ns)'}, inplace=True)
 
-        if '0x' in str(df[WorkloadColumn.min_offset].iloc[0]):
-            df[WorkloadColumn.min_offset] = df[WorkloadColumn.min_offset].map(lambda x: int(x, 16))
-        else:
-            df[WorkloadColumn.min_offset] = df[WorkloadColumn.min_offset].astype(np.int64)
-
-        return df
+        return self.convert_offset_size(df)
 
 
 class StorageWorkloadReader(WorkloadReader):
@@ -0,0 +1,60 @@
+import argparse
+import json
+import os
+import sys
+
+from product.general.framework.parameter_sweep import (ParameterSweep,
+                                                       get_sweep_points)
+
+
+def parse_grid_value(value):
+    if value.lower() in ('true', 'false'):
+        return value.lower() == 'true'
+    return value
+
+
+def parse_grid(arg):
+    if '=' not in arg:
+        raise argparse.ArgumentTypeError(
+            f"Invalid format: '{arg}'. Must be 'option=value[,value...]' (e.g., channel=8,16).")
+    name, values = arg.split('=', 1)
+    return name, [parse_grid_value(value) for value in values.split(',')]
+
+
+parser = argparse.ArgumentParser(
+    description='Run storage_simulator.py over a grid or list of argument overrides',
+    epilog='Arguments after -- are passed to every point, e.g. -- --range-bytes 4MB')
+parser.add_argument("sweep_name", type=str, help='results are stored in output/<sweep_name>')
+parser.add_argument(
+    "--spec",
+    type=str,
+    help='json file with optional "base" (argument list), "grid" ({option: [values]}) and "points" ([{option: value}])')
+parser.add_argument(
+    "--grid",
+    type=parse_grid,
+    action='append',
+    default=[],
+    help="option=value[,value...] added to the grid, may be repeated")
+parser.add_argument("--workers", type=int, default=os.cpu_count(), help='number of worker processes')
+
+
+if __name__ == "__main__":
+    os.system("")
+    argv = sys.argv[1:]
+    base_argv = list()
+    if '--' in argv:
+        argv, base_argv = argv[:argv.index('--')], argv[argv.index('--') + 1:]
+    sweep_args = parser.parse_args(argv)
+    grid, point_list = dict(), list()
+    if sweep_args.spec:
+        with open(sweep_args.spec) as f:
+            spec = json.load(f)
+        base_argv = spec.get('base', list()) + base_argv
+        grid.update(spec.get('grid', dict()))
+        point_list.extend(spec.get('points', list()))
+    grid.update(dict(sweep_args.grid))
+
+    sweep_points = get_sweep_points(grid, point_list)
+    assert sweep_points, 'no sweep point given, use --grid or --spec'
+    sweep = ParameterSweep(sweep_args.sweep_name, base_argv, sweep_points, sweep_args.workers)
+    exit(0 if sweep.run() else 1)
@@ -32,10 +32,28 @@ parser.add_argument("--nand-cell-type", type=str.upper, choices=['SLC', 'MLC', '
 
 parser.add_argument("--gc-threshold", type=float, default=0.2)
 parser.add_argument("--urgent-gc-threshold", type=float, default=0.05)
+parser.add_argument(
+    "--gc-victim-policy",
+    type=str,
+    choices=['legacy', 'greedy', 'cost_benefit'],
+    default='legacy',
+    help="GC victim selection. 'legacy' keeps the former victim and does one O(BLOCK_COUNT) numpy pass per strictly "
+         "better candidate, 'cost_benefit' does one O(BLOCK_COUNT) pass per selection, only 'greedy' "
+         "(fewest valid pages, kept in valid count buckets) is near-O(1)")
+parser.add_argument(
+    "--dcl-cache-policy",
+    type=str,
+    choices=['write_through', 'fifo', 'lru', 'clock'],
+    default='write_through',
+    help='replacement policy of the DCL write cache, write_through drops an entry once its NAND write is done')
 parser.add_argument("--sustained-block-rate", type=float, default=0.8)
 parser.add_argument("--sustained-page-rate", type=float, default=0.8)
 
 parser.add_argument("--make-sustained", action='store_true')
+parser.add_argument(
+    "--precondition-image",
+    type=str,
+    help='preconditioned FTL image file, saved when missing and restored when present (an image of another configuration is an error)')
 
 parser.add_argument(
     "--workload-type",
@@ -50,6 +68,20 @@ parser.add_argument(
     help='enable utilization')
 
 parser.add_argument("--enable-qos", action='store_true')
+parser.add_argument(
+    "--enable-profiler",
+    action='store_true',
+    help='print host time, scheduled events, jobs and queue high-water of each submodule')
+parser.add_argument(
+    "--enable-analytic-memc",
+    action='store_true',
+    help='model each SRAM/DRAM access as one bandwidth reservation instead of one job per 128B payload')
+parser.add_argument(
+    "--enable-collapsed-plane-op",
+    action='store_true',
+    help='run a multi-plane NAND operation as one busy period on its lead plane instead of one per plane, '
+         'for event-count reduction only: follower planes get no busy period or power, so it cannot be combined '
+         'with --enable-power')
 
 parser.add_argument(
     "--pre-defined-workload",
@@ -61,6 +93,30 @@ parser.add_argument(
     "--range-bytes",
     type=str,
     help='total data range (Bytes) of each TestCase')
+parser.add_argument(
+    "--qd",
+    type=int,
+    help='queue depth of every basic workload TestCase')
 
 parser.add_argument("--enable-power", action='store_true')
-args = parser.parse_args()
+parser.add_argument(
+    "--independent-workloads",
+    action='store_true',
+    help='run every workload on its own freshly preconditioned drive instead of the drive left by the previous one')
+parser.add_argument(
+    "--jobs",
+    type=int,
+    default=1,
+    help='number of worker processes running --independent-workloads in parallel, '
+         'the summary is the same as with --jobs 1')
+
+
+def parse_args(argv=None):
+    args = parser.parse_args(argv)
+    if args.jobs > 1 and not args.independent_workloads:
+        # a sequential run hands the drive state of a workload to the next one, which workers cannot reproduce
+        parser.error('--jobs needs --independent-workloads')
+    if args.enable_collapsed_plane_op and args.enable_power:
+        # follower planes of a collapsed operation are never activated, their power would be missing
+        parser.error('--enable-collapsed-plane-op cannot be combined with --enable-power')
+    return args
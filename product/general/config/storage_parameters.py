@@ -3,20 +3,23 @@ from math import ceil
 from core.config.core_parameter import CoreParameter
 from core.framework.cell_type import Cell
 from core.framework.fifo_id import NVMe_FIFO_ID
+from core.framework.simulation_context import SimulationContext
 
 
 class Parameter:
     def __new__(cls, args=None, init_flag=False):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super(Parameter, cls).__new__(cls)
-            cls.instance.init_param(args)
+        context = SimulationContext.get_current()
+        instance = context.get_instance(cls)
+        if instance is None:
+            instance = context.set_instance(cls, super(Parameter, cls).__new__(cls))
+            instance.init_param(args)
         elif args:
-            cls.instance.set_param_from_args(args)
+            instance.set_param_from_args(args)
 
         if init_flag:
-            cls.instance.init_param()
+            instance.init_param()
 
-        return cls.instance
+        return instance
 
     def set_param_from_args(self, args):
 
@@ -40,6 +43,9 @@ class Parameter:
         self.NAND_CELL_TYPE = Cell[args.nand_cell_type]
         self.SIM_CMD_COUNT = -1
         self.ENABLE_QOS = args.enable_qos
+        self.ENABLE_SUBMODULE_PROFILER = args.enable_profiler
+        self.ENABLE_ANALYTIC_MEMORY_MODEL = args.enable_analytic_memc
+        self.ENABLE_COLLAPSED_PLANE_OPERATION = args.enable_collapsed_plane_op
         self.ENABLE_COMMAND_RECORD = self.args.enable_command_record
         self.ENABLE_PERFORMANCE_RECORD = self.args.enable_performance_record
         self.USE_FIXED_LATENCY = True if self.WORKLOAD_TYPE in (
@@ -55,9 +61,14 @@ class Parameter:
         self.RECORD_SUBMODULE_UTILIZATION = args.enable_utilization
         self.GC_THRESHOLD = args.gc_threshold
         self.URGENT_GC_THRESHOLD = args.urgent_gc_threshold
+        self.GC_VICTIM_POLICY = args.gc_victim_policy
+        self.DCL_CACHE_POLICY = args.dcl_cache_policy
         self.SUSTAINED = args.make_sustained
         self.SUSTAINED_BLOCK_RATE = args.sustained_block_rate
         self.SUSTAINED_SIZE = args.sustained_page_rate
+        self.PRECONDITION_IMAGE = args.precondition_image
+        self.INDEPENDENT_WORKLOADS = args.independent_workloads
+        self.JOBS = args.jobs
 
         self.ENABLE_POWER = args.enable_power
         self.ENABLE_OPTION_PRINT = args.enable_power
@@ -125,6 +136,7 @@ class Parameter:
         self.HOST_QD_DEFAULT = 1
 
         self.QOS_CANDIDATES = [1, 50, 90, 99, 99.9, 99.99, 99.999, 99.9999]
+        self.QOS_SIGNIFICANT_DIGITS = 3
 
         self.POWER_SNAP_SHOT_INTERVAL = 5 * 1e6
         self.SDC_BACK_GROUND_ENTER_LATENCY = 0
@@ -149,9 +161,16 @@ class Parameter:
         self.GENERATE_SUBMODULE_DIAGRAM = 0
 
         self.IP_TRANSACTION_LATENCY_NS = 1  # 21e3 // 200
+        self.ENABLE_BUS_BATCH_TRANSFER = 1
         self.ENABLE_NAND_SUSPEND = 0
         self.ENABLE_NAND_CACHE_PROGRAM = 0
 
+        # Mapping
+        self.ENABLE_ARRAY_MAPPING_TABLE = 1
+
+        # Workload
+        self.WORKLOAD_CHUNK_LINES = 1 << 16
+
         # Buffer
 
         self.ENABLE_LOGICAL_CACHE = 1
@@ -0,0 +1,406 @@
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import numpy as np
+import simpy
+from core.config.basic_workload_types import (KiB, MiB, BasicPattern,
+                                              BasicPatternType, BasicWorkload)
+from core.framework.bandwidth_timeline import BandwidthTimeline
+from core.framework.common import QFetchType, eCMDType
+from core.framework.simulation_context import SimulationContext
+from core.framework.submodule import SubModule
+from core.script.workload_reader import WorkloadColumn, WorkloadReader
+from product.general.config.argument import parse_args
+from product.general.config.storage_parameters import Parameter
+from product.general.framework.environment import initialize_environment
+from product.general.framework.simulation_env import StorageSimulationEnv
+from product.general.framework.simulation_runner import SimulationRunner
+from product.general.modules.nvm_transaction_class.nvm_transaction import (
+    AddressID, NvmTransactionFlash)
+from simpy.events import NORMAL
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# wall time grows and rates drop by more than this ratio before a scenario is reported as a regression
+DEFAULT_TIME_THRESHOLD = 0.1
+DEFAULT_RSS_THRESHOLD = 0.2
+# runs per scenario, the fastest one is reported
+DEFAULT_REPEAT = 3
+
+
+def get_param(argv=()):
+    args = parse_args(list(argv))
+    with SimulationContext().activate():
+        return Parameter(args, init_flag=True)
+
+
+def count_scheduled_events(env):
+    '''
+    Count every event scheduled on env from now on, the returned list holds the count.
+    '''
+    counter = [0]
+    schedule = env.schedule
+
+    def counting_schedule(event, priority=NORMAL, delay=0):
+        counter[0] += 1
+        schedule(event, priority, delay)
+
+    env.schedule = counting_schedule
+    return counter
+
+
+def run_simulation(simulation_env, runner, workload):
+    event_counter = count_scheduled_events(simulation_env.env)
+    runner.set_qd(workload.qd)
+    start_time = time.perf_counter()
+    is_success = runner.run_workload(workload)
+    wall_time = time.perf_counter() - start_time
+    return {'wall_time_s': wall_time,
+            'event_count': event_counter[0],
+            'cmd_count': simulation_env.analyzer.total_command_done_count,
+            'success': bool(is_success)}
+
+
+def run_basic_workload(cmd_type, pattern_type, chunk_size_bytes, range_bytes, qd):
+    '''
+    PreDefinedWorkload style pattern on a new environment whose mapping table covers range_bytes.
+    '''
+    simulation_env = StorageSimulationEnv(get_param())
+    runner = SimulationRunner(simulation_env)
+    pattern = BasicPattern(cmd_type=cmd_type, pattern_type=pattern_type,
+                           chunk_size_bytes=chunk_size_bytes, range_bytes=range_bytes)
+    workload = BasicWorkload(pattern, qd=qd)
+    runner.set_mapping_table(runner.get_max_mapping_table([workload]), False)
+    return run_simulation(simulation_env, runner, workload)
+
+
+def run_sustained_precondition(range_bytes):
+    '''
+    --make-sustained preconditioning (mapping table and block state of the whole device) on a new environment.
+    '''
+    simulation_env = StorageSimulationEnv(get_param(['--make-sustained']))
+    runner = SimulationRunner(simulation_env)
+    start_time = time.perf_counter()
+    runner.set_mapping_table(range_bytes // simulation_env.param.FTL_MAP_UNIT_SIZE, True)
+    wall_time = time.perf_counter() - start_time
+    return {'wall_time_s': wall_time, 'event_count': 0, 'op_count': len(simulation_env.aml.mapping_table),
+            'success': True}
+
+
+def generate_trace(file_name, cmd_count, range_bytes, seed=0):
+    '''
+    Random read/write trace in the WorkloadReader format: 4KB aligned commands of 4KB ~ 128KB, 70% read.
+    '''
+    rng = np.random.default_rng(seed)
+    size = rng.choice([4 * KiB, 16 * KiB, 32 * KiB, 128 * KiB], cmd_count, p=[0.6, 0.2, 0.1, 0.1])
+    offset = rng.integers(0, (range_bytes - size) // (4 * KiB)) * 4 * KiB
+    io_type = np.where(rng.random(cmd_count) < 0.7, 'Read', 'Write')
+    init_time = np.cumsum(rng.integers(0, 20000, cmd_count))
+    with open(file_name, 'w') as f:
+        f.write(f'{WorkloadColumn.init_time},{WorkloadColumn.io_type},{WorkloadColumn.size},{WorkloadColumn.min_offset},{WorkloadColumn.qd}\n')
+        for row in zip(init_time, io_type, size, offset):
+            f.write('{},{},{},{},32\n'.format(*row))
+
+
+def run_trace_workload(cmd_count, range_bytes):
+    trace_dir = tempfile.mkdtemp(prefix='arno_trace_', dir='.')
+    generate_trace(os.path.join(trace_dir, 'benchmark_QD32.csv'), cmd_count, range_bytes)
+    param = get_param(['--workload-type', f'trace={cmd_count}'])
+    simulation_env = StorageSimulationEnv(param)
+    runner = SimulationRunner(simulation_env)
+    with simulation_env.context.activate():
+        workload = WorkloadReader(trace_dir, param).workload_list[0]
+    runner.set_mapping_table(runner.get_max_mapping_table([workload]), False)
+    return run_simulation(simulation_env, runner, workload)
+
+
+class MicroBenchmarkEnv:
+    '''
+    Framework services (env, bus, address map, ...) of initialize_environment without any IP.
+    '''
+
+    def __init__(self, param):
+        initialize_environment(self, param)
+
+
+def run_bus_micro(packet_count, burst_size):
+    '''
+    Bus.send_sq bursts to one destination FIFO drained by a consumer process.
+    '''
+    micro_env = MicroBenchmarkEnv(get_param())
+    env, bus, address_map = micro_env.env, micro_env.bus, micro_env.address_map
+    src, dst = address_map.NVMe, address_map.AML
+    bus.connect_bus(dst)
+    waiting_queue = bus.waiting_queue[dst][0][0]
+    received = [0]
+
+    def producer():
+        for packet_id in range(packet_count):
+            bus.send_sq({'id': packet_id}, src, dst)
+            if packet_id % burst_size == burst_size - 1:
+                yield env.timeout(1)
+
+    def consumer():
+        while True:
+            yield waiting_queue.dst_event.wait()
+            waiting_queue.dst_event.reset()
+            while waiting_queue.dst_queue:
+                waiting_queue.dst_queue.popleft()
+                received[0] += 1
+
+    event_counter = count_scheduled_events(env)
+    start_time = time.perf_counter()
+    env.process(consumer())
+    env.process(producer())
+    env.run()
+    wall_time = time.perf_counter() - start_time
+    return {'wall_time_s': wall_time, 'event_count': event_counter[0], 'op_count': received[0],
+            'success': received[0] == packet_count}
+
+
+def run_submodule_queue_micro(packet_count, queue_count, burst_size):
+    '''
+    SubModule.wakeup into round robin SubmoduleQs, fetched, processed and popped by the submodule process.
+    '''
+    micro_env = MicroBenchmarkEnv(get_param())
+    env = micro_env.env
+    processed = [0]
+
+    def handle_packet(packet):
+        processed[0] += 1
+
+    with micro_env.context.activate():
+        submodule = SubModule('BENCH', micro_env.product_args, -1, handle_packet, micro_env.feature.ZERO,
+                              q_fetch_type=QFetchType.RoundRobin, q_count=queue_count)
+
+    def producer():
+        for packet_id in range(packet_count):
+            submodule.wakeup({'id': packet_id}, packet_id % queue_count)
+            if packet_id % burst_size == burst_size - 1:
+                yield env.timeout(1)
+
+    event_counter = count_scheduled_events(env)
+    start_time = time.perf_counter()
+    env.process(producer())
+    env.run()
+    wall_time = time.perf_counter() - start_time
+    return {'wall_time_s': wall_time, 'event_count': event_counter[0], 'op_count': processed[0],
+            'success': processed[0] == packet_count}
+
+
+def run_address_mapping_micro(op_count, range_bytes, seed=0):
+    '''
+    AddressMappingLayer read lookup, plane allocation, ppn decode and L2P / P2L update on a prefilled table.
+    '''
+    simulation_env = StorageSimulationEnv(get_param())
+    runner = SimulationRunner(simulation_env)
+    test_size = range_bytes // simulation_env.param.FTL_MAP_UNIT_SIZE
+    runner.set_mapping_table(test_size, False)
+    aml = simulation_env.aml
+    lpn_list = np.random.default_rng(seed).integers(0, test_size, op_count).tolist()
+    packet = {'nvm_transaction_flash': NvmTransactionFlash(AddressID())}
+    map_unit_count = aml.map_unit_count
+
+    start_time = time.perf_counter()
+    for lpn in lpn_list:
+        mapped_ppn = aml.lookup_mapping_table(lpn)
+        packet['nvm_transaction_flash'].ppn = mapped_ppn // map_unit_count
+        aml.get_address(packet)
+        aml.allocate_plane(0)
+        aml.mapping_table[lpn] = mapped_ppn
+        aml.p2l_map[mapped_ppn] = lpn
+    wall_time = time.perf_counter() - start_time
+    return {'wall_time_s': wall_time, 'event_count': 0, 'op_count': op_count, 'success': True}
+
+
+def run_bandwidth_timeline_micro(op_count, start_time_ns, queue_count, seed=0):
+    '''
+    Analytic memory model accesses on the SRAM and DRAM bandwidths, started late enough to run past 1e10 ns where
+    one ulp of the simulation time is a sizeable fraction of a byte transfer. The step budget turns a stuck
+    timeline into a failure instead of a hang.
+    '''
+    param = get_param()
+    bandwidth_list = (param.sram_param['BANDWIDTH_B_PER_NS'], param.dram_param['BANDWIDTH_B_PER_NS'])
+    size_list = (128, 512, 4 * KiB, 16 * KiB)
+    env = simpy.Environment(initial_time=start_time_ns)
+    timeline_list = [BandwidthTimeline(env, bandwidth, queue_count) for bandwidth in bandwidth_list]
+    done_count = [0]
+
+    def done_callback():
+        done_count[0] += 1
+
+    def issue_process(timeline, rng):
+        for _ in range(op_count):
+            timeline.reserve(int(rng.integers(queue_count)), size_list[rng.integers(len(size_list))], done_callback)
+            yield env.timeout(float(rng.exponential(200)))
+
+    for index, timeline in enumerate(timeline_list):
+        env.process(issue_process(timeline, np.random.default_rng(seed + index)))
+
+    step_budget = 20 * op_count * len(timeline_list)
+    step_count = 0
+    start_time = time.perf_counter()
+    while step_count < step_budget:
+        try:
+            env.step()
+        except simpy.core.EmptySchedule:
+            break
+        step_count += 1
+    wall_time = time.perf_counter() - start_time
+    return {'wall_time_s': wall_time, 'event_count': step_count, 'op_count': done_count[0],
+            'success': done_count[0] == op_count * len(timeline_list) and env.now > 1e10}
+
+
+SCENARIOS = {
+    'seqw_128k_qd32': (run_basic_workload, dict(cmd_type=eCMDType.Write, pattern_type=BasicPatternType.Seq,
+                                                chunk_size_bytes=128 * KiB, range_bytes=8 * MiB, qd=32)),
+    'seqr_128k_qd32': (run_basic_workload, dict(cmd_type=eCMDType.Read, pattern_type=BasicPatternType.Seq,
+                                                chunk_size_bytes=128 * KiB, range_bytes=4 * MiB, qd=32)),
+    'ranw_4k_qd512': (run_basic_workload, dict(cmd_type=eCMDType.Write, pattern_type=BasicPatternType.Ran,
+                                               chunk_size_bytes=4 * KiB, range_bytes=4 * MiB, qd=512)),
+    'ranr_4k_qd512': (run_basic_workload, dict(cmd_type=eCMDType.Read, pattern_type=BasicPatternType.Ran,
+                                               chunk_size_bytes=4 * KiB, range_bytes=2 * MiB, qd=512)),
+    'sustained_precondition': (run_sustained_precondition, dict(range_bytes=64 * MiB)),
+    'trace_replay': (run_trace_workload, dict(cmd_count=300, range_bytes=64 * MiB)),
+    'micro_bus': (run_bus_micro, dict(packet_count=50000, burst_size=8)),
+    'micro_submodule_queue': (run_submodule_queue_micro, dict(packet_count=100000, queue_count=4, burst_size=8)),
+    'micro_address_mapping': (run_address_mapping_micro, dict(op_count=200000, range_bytes=64 * MiB)),
+    'micro_bandwidth_timeline': (run_bandwidth_timeline_micro, dict(op_count=50000, start_time_ns=1e10,
+                                                                    queue_count=4)),
+}
+
+
+def get_peak_rss_mb():
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def run_scenario(name, repeat):
+    '''
+    Best of repeat runs of one scenario, run in a clean process inside a temporary directory.
+    '''
+    os.environ['PYTHONBREAKPOINT'] = '0'
+    function, kwargs = SCENARIOS[name]
+    cwd = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix='arno_benchmark_')
+    os.chdir(work_dir)
+    try:
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            result_list = [function(**kwargs) for _ in range(repeat)]
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = min(result_list, key=lambda r: r['wall_time_s'])
+    wall_time = result['wall_time_s']
+    result['success'] = all(r['success'] for r in result_list)
+    result['repeat'] = repeat
+    result['events_per_s'] = result['event_count'] / wall_time
+    for count_name, rate_name in (('cmd_count', 'cmds_per_s'), ('op_count', 'ops_per_s')):
+        if count_name in result:
+            result[rate_name] = result[count_name] / wall_time
+    result['peak_rss_mb'] = get_peak_rss_mb()
+    return result
+
+
+class BenchmarkSuite:
+    '''
+    Runs the selected SCENARIOS one by one, each in a freshly spawned interpreter so peak RSS belongs to one
+    scenario only, and writes wall time, events/s, simulated commands/s (or operations/s for micro benchmarks)
+    and peak RSS of every scenario to JSON.
+    '''
+
+    def __init__(self, scenario_names=None, repeat=DEFAULT_REPEAT):
+        self.scenario_names = list(scenario_names) if scenario_names else list(SCENARIOS)
+        for name in self.scenario_names:
+            assert name in SCENARIOS, f'unknown scenario {name}, choose from {list(SCENARIOS)}'
+        self.repeat = repeat
+        self.mp_context = multiprocessing.get_context('spawn')
+
+    def get_meta(self):
+        return {'date': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'machine': platform.machine(),
+                'cpu_count': os.cpu_count(),
+                'repeat': self.repeat}
+
+    def run(self, output_file=None):
+        scenario_result = dict()
+        for name in self.scenario_names:
+            with ProcessPoolExecutor(max_workers=1, mp_context=self.mp_context) as executor:
+                result = executor.submit(run_scenario, name, self.repeat).result()
+            scenario_result[name] = result
+            print(f'{name:<26} {result["wall_time_s"]:8.3f} s {result["events_per_s"]:12.0f} events/s '
+                  f'{format_rate(result):>22} {format_rss(result["peak_rss_mb"]):>10}'
+                  f'{"" if result["success"] else "  FAIL"}', flush=True)
+
+        benchmark_result = {'meta': self.get_meta(), 'scenarios': scenario_result}
+        if output_file:
+            with open(output_file, 'w') as f:
+                json.dump(benchmark_result, f, indent=1)
+        return benchmark_result
+
+
+def format_rate(result):
+    if 'cmds_per_s' in result:
+        return f'{result["cmds_per_s"]:.0f} cmds/s'
+    return f'{result["ops_per_s"]:.0f} ops/s'
+
+
+def format_rss(peak_rss_mb):
+    return '-' if peak_rss_mb is None else f'{peak_rss_mb:.0f} MB'
+
+
+def compare_result(baseline, current, time_threshold=DEFAULT_TIME_THRESHOLD, rss_threshold=DEFAULT_RSS_THRESHOLD):
+    '''
+    Compare two BenchmarkSuite JSON results scenario by scenario.
+    Returns (rows, regression list): wall time and peak RSS regress when they grow by more than their threshold,
+    events/s, commands/s and operations/s when they drop by more than time_threshold.
+    '''
+    metric_list = (('wall_time_s', 1, time_threshold), ('events_per_s', -1, time_threshold),
+                   ('cmds_per_s', -1, time_threshold), ('ops_per_s', -1, time_threshold),
+                   ('peak_rss_mb', 1, rss_threshold))
+    rows, regression_list = list(), list()
+    for name, current_result in current['scenarios'].items():
+        baseline_result = baseline['scenarios'].get(name)
+        if baseline_result is None:
+            continue
+        for metric, direction, threshold in metric_list:
+            base_value, current_value = baseline_result.get(metric), current_result.get(metric)
+            if not base_value or current_value is None:
+                continue
+            change = (current_value - base_value) / base_value
+            is_regression = change * direction > threshold
+            rows.append((name, metric, base_value, current_value, change, is_regression))
+            if is_regression:
+                regression_list.append(f'{name} {metric} {change * 100:+.1f}%')
+        if not current_result.get('success', True):
+            regression_list.append(f'{name} failed')
+    return rows, regression_list
+
+
+def print_comparison(rows, regression_list):
+    print(f'{"scenario":<26} {"metric":<14} {"baseline":>14} {"current":>14} {"change":>9}')
+    for name, metric, base_value, current_value, change, is_regression in rows:
+        print(f'{name:<26} {metric:<14} {base_value:14.3f} {current_value:14.3f} {change * 100:+8.1f}%'
+              f'{"  REGRESSION" if is_regression else ""}')
+    if regression_list:
+        print(f'[ERROR] {len(regression_list)} regression(s): ' + ', '.join(regression_list))
+    else:
+        print('[INFO] no regression')
@@ -4,11 +4,12 @@ import simpy
 from core.backbone.address_map import AddressMap
 from core.backbone.bus import Bus
 from core.backbone.power_manager import PowerManager
-from core.framework.allocator import Allocator
+from core.config.core_parameter import CoreParameter
 from core.framework.analyzer import Analyzer
 from core.framework.latency_logger import LatencyLogger
 from core.framework.performance_measure import PerformanceMeasure
-from core.framework.singleton import Singleton
+from core.framework.simulation_context import SimulationContext
+from core.framework.submodule_profiler import SubmoduleProfiler
 from core.framework.timer import FrameworkTimer
 from product.general.config.storage_feature import Feature
 from product.general.config.storage_parameters import Parameter
@@ -39,15 +40,18 @@ def set_max_user_ppn(param):
 
 
 def initialize_environment(cls_instance, param=None):
-    Allocator.reset()
+    if param is None:
+        param = Parameter(init_flag=True)
+    context = SimulationContext().set_current()
+    context.set_instance(Parameter, param)
+    context.set_instance(CoreParameter, param.core_parameter)
+    cls_instance.context = context
+
     env = simpy.Environment()
     timer = FrameworkTimer(env)
     timer.__init__(env)
-    if param is None:
-        param = Parameter(init_flag=True)
     set_max_user_ppn(param)
     feature = Feature()
-    Singleton.clear()
     cls_instance.product_args = StorageProductArgs(
         env=env, param=param, feature=feature)
     cls_instance.product_args.set_args_to_class_instance(cls_instance)
@@ -63,5 +67,6 @@ def initialize_environment(cls_instance, param=None):
 
     cls_instance.power_manager = PowerManager(cls_instance.product_args)
     cls_instance.latency_logger = LatencyLogger(cls_instance.product_args)
+    cls_instance.submodule_profiler = SubmoduleProfiler(cls_instance.product_args)
     cls_instance.performance_measure = PerformanceMeasure(
         cls_instance.product_args)
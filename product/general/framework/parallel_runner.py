@@ -0,0 +1,86 @@
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+from core.framework.simulation_context import SimulationContext
+from product.general.config.storage_parameters import Parameter
+from product.general.framework.simulation_env import StorageSimulationEnv
+from product.general.framework.simulation_runner import SimulationRunner
+
+job_context = dict()
+
+
+def get_job_file_name(file_name, job_index):
+    stem, ext = os.path.splitext(file_name)
+    return f'{stem}_job{job_index}{ext}'
+
+
+def set_job_context(args, workload_list, test_size, sustained):
+    job_context['args'] = args
+    job_context['workload_list'] = workload_list
+    job_context['test_size'] = test_size
+    job_context['sustained'] = sustained
+
+
+def run_job(job_index):
+    '''
+    Build a new environment, precondition it the same way as the sequential run and replay one workload.
+    Pool workers are reused, so the job runs in a fresh simulation context and its parameters (file names
+    included) start from the command line defaults instead of the previous job's values.
+    Returns the console output of the job and whether the simulation succeeded.
+    '''
+    os.environ['PYTHONBREAKPOINT'] = '0'
+    workload = job_context['workload_list'][job_index]
+    output = io.StringIO()
+    with redirect_stdout(output), SimulationContext().activate():
+        Parameter(job_context['args'])
+        param = Parameter(init_flag=True)
+        param.VCD_FILE_NAME = get_job_file_name(param.VCD_FILE_NAME, job_index)
+        param.TOTAL_POWER_LOG_FILE_NAME = get_job_file_name(param.TOTAL_POWER_LOG_FILE_NAME, job_index)
+
+        runner = SimulationRunner(StorageSimulationEnv(param))
+        runner.set_mapping_table(job_context['test_size'], job_context['sustained'])
+        runner.set_qd(workload.qd)
+        is_success = runner.run_workload(workload)
+        # pool workers leave with os._exit, which would drop what is still buffered
+        runner.env.close_log_files()
+    return output.getvalue(), is_success
+
+
+class ParallelSimulationRunner:
+    '''
+    Runs the workloads of an --independent-workloads run, each on its own freshly preconditioned environment,
+    in worker processes with --jobs N or one after another in this process otherwise. Both give the same summary.
+    Output files keep the sequential layout (one prefix per workload), console output is printed in workload order.
+    '''
+
+    def __init__(self, args, jobs):
+        self.args = args
+        self.jobs = jobs
+        if 'fork' in multiprocessing.get_all_start_methods():
+            self.mp_context = multiprocessing.get_context('fork')
+        else:
+            self.mp_context = multiprocessing.get_context()
+
+    def run(self, workload_list, test_size, sustained):
+        job_args = (self.args, workload_list, test_size, sustained)
+        job_index_list = range(len(workload_list))
+        if self.jobs <= 1:
+            set_job_context(*job_args)
+            return self.print_result(map(run_job, job_index_list))
+
+        with ProcessPoolExecutor(
+                max_workers=min(self.jobs, len(workload_list)),
+                mp_context=self.mp_context,
+                initializer=set_job_context,
+                initargs=job_args) as executor:
+            return self.print_result(executor.map(run_job, job_index_list))
+
+    def print_result(self, result_iter):
+        success_list = list()
+        for output, is_success in result_iter:
+            print(output, end='')
+            success_list.append(is_success)
+        return all(success_list)
@@ -0,0 +1,195 @@
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+import pandas as pd
+from core.framework.common import eCMDType
+from core.framework.simulation_context import SimulationContext
+from product.general.config.argument import parse_args
+from product.general.config.storage_parameters import Parameter
+from product.general.framework.simulation_env import StorageSimulationEnv
+from product.general.framework.simulation_runner import SimulationRunner
+
+
+def get_option_name(name):
+    return name.lstrip('-').replace('_', '-')
+
+
+def get_point_argv(base_argv, overrides):
+    argv = list(base_argv)
+    for name, value in overrides.items():
+        option = f'--{get_option_name(name)}'
+        if isinstance(value, bool):
+            if value:
+                argv.append(option)
+        else:
+            argv.extend((option, str(value)))
+    return argv
+
+
+def get_point_id(base_argv, overrides):
+    key = json.dumps(get_point_argv(base_argv, dict(sorted(overrides.items()))))
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def get_sweep_points(grid=None, point_list=None):
+    '''
+    Points of the cartesian product of grid ({name: [value, ...]}) followed by the explicit point_list,
+    names being argument.py options with or without the leading dashes.
+    '''
+    sweep_points = list()
+    if grid:
+        name_list = [get_option_name(name) for name in grid]
+        for value_list in itertools.product(*grid.values()):
+            sweep_points.append(dict(zip(name_list, value_list)))
+    for point in point_list or list():
+        sweep_points.append({get_option_name(name): value for name, value in point.items()})
+    return sweep_points
+
+
+def collect_workload_result(runner, workload, is_success):
+    analyzer = runner.env.analyzer
+    result = {'workload': workload.name, 'qd': runner.qd, 'success': bool(is_success)}
+    for cmd_type in (eCMDType.Read, eCMDType.Write):
+        name = cmd_type.name.lower()
+        if analyzer.command_done_count[cmd_type]:
+            perf_MBs, perf_MiBs, perf_KIOPs = analyzer.calculate_performance(cmd_type)
+        else:
+            perf_MBs, perf_KIOPs = 0, 0
+        result[f'{name}_MBs'] = round(perf_MBs, 2)
+        result[f'{name}_KIOPs'] = round(perf_KIOPs, 2)
+
+        histogram = analyzer.qos_record.qos_log[cmd_type.name]
+        result[f'{name}_avg_us'] = round(histogram.get_mean() / 1e3, 2) if len(histogram) else None
+        qos_list = analyzer.qos_record.get_qos(cmd_type.name)
+        for qos_candidate, qos_us in zip(analyzer.qos_record.qos_candidates, qos_list):
+            result[f'{name}_p{qos_candidate}_us'] = None if qos_us == '-' else round(qos_us, 2)
+    result['waf'] = round(analyzer.calculate_waf(), 4)
+    return result
+
+
+def run_sweep_point(base_argv, overrides, sweep_name, point_id):
+    '''
+    Simulate every workload of one point on a new environment and return its per workload results.
+    Console output goes to output/<sweep_name>/logs/<point_id>.log.
+    '''
+    os.environ['PYTHONBREAKPOINT'] = '0'
+    argv = get_point_argv(base_argv, overrides)
+    args = parse_args(argv + ['--enable-qos'])
+    if args.folder_name is None:
+        args.folder_name = os.path.join(sweep_name, point_id)
+
+    sweep_dir = os.path.join('output', sweep_name)
+    log_prefix = os.path.join(sweep_dir, 'logs', point_id)
+    with open(f'{log_prefix}.log', 'w') as log_file, redirect_stdout(log_file):
+        with SimulationContext().activate():
+            param = Parameter(args, init_flag=True)
+        param.VCD_FILE_NAME = f'{log_prefix}.vcd'
+        param.TOTAL_POWER_LOG_FILE_NAME = f'{log_prefix}_power.txt'
+
+        runner = SimulationRunner(StorageSimulationEnv(param))
+        workload_list = runner.get_workload_list()
+        runner.set_mapping_table(runner.get_max_mapping_table(workload_list), param.SUSTAINED)
+
+        workload_result_list = list()
+        for workload in workload_list:
+            runner.set_qd(workload.qd)
+            is_success = runner.run_workload(workload)
+            with runner.env.context.activate():
+                workload_result_list.append(collect_workload_result(runner, workload, is_success))
+        runner.env.vcd_manager.vcd_manager.close_vcd_file()
+    return workload_result_list
+
+
+class ParameterSweep:
+    '''
+    Runs every point of a sweep on a bounded process pool and merges the results in output/<sweep_name>/sweep_result.csv.
+    Each finished point is stored in output/<sweep_name>/points/<point_id>.json, so an interrupted sweep resumes
+    with the remaining points only.
+    '''
+
+    def __init__(self, sweep_name, base_argv, sweep_points, workers=1):
+        self.sweep_name = sweep_name
+        self.sweep_dir = os.path.join('output', sweep_name)
+        self.base_argv = list(base_argv)
+        self.sweep_points = sweep_points
+        self.workers = workers
+        self.point_id_list = [get_point_id(self.base_argv, overrides) for overrides in sweep_points]
+        if 'fork' in multiprocessing.get_all_start_methods():
+            self.mp_context = multiprocessing.get_context('fork')
+        else:
+            self.mp_context = multiprocessing.get_context()
+
+        for overrides in sweep_points:
+            try:
+                parse_args(get_point_argv(self.base_argv, overrides))
+            except SystemExit:
+                raise ValueError(f'invalid sweep point {overrides}')
+
+    def get_point_file_name(self, point_id):
+        return os.path.join(self.sweep_dir, 'points', f'{point_id}.json')
+
+    def load_point(self, point_id):
+        file_name = self.get_point_file_name(point_id)
+        if not os.path.isfile(file_name):
+            return None
+        with open(file_name) as f:
+            return json.load(f)
+
+    def save_point(self, point_id, overrides, workload_result_list):
+        file_name = self.get_point_file_name(point_id)
+        with open(f'{file_name}.tmp', 'w') as f:
+            json.dump({'base': self.base_argv, 'overrides': overrides, 'result': workload_result_list}, f, indent=1)
+        os.replace(f'{file_name}.tmp', file_name)
+
+    def get_pending_points(self):
+        pending_points = dict()
+        for point_id, overrides in zip(self.point_id_list, self.sweep_points):
+            if point_id not in pending_points and self.load_point(point_id) is None:
+                pending_points[point_id] = overrides
+        return pending_points
+
+    def run(self):
+        for sub_dir in ('points', 'logs'):
+            os.makedirs(os.path.join(self.sweep_dir, sub_dir), exist_ok=True)
+
+        pending_points = self.get_pending_points()
+        print(f'[INFO] {len(self.sweep_points) - len(pending_points)} / {len(self.sweep_points)} points already done')
+
+        failed_point_count = 0
+        if pending_points:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending_points)), mp_context=self.mp_context) as executor:
+                future_dict = {executor.submit(run_sweep_point, self.base_argv, overrides, self.sweep_name, point_id): point_id
+                               for point_id, overrides in pending_points.items()}
+                for done_count, future in enumerate(as_completed(future_dict), start=1):
+                    point_id = future_dict[future]
+                    overrides = pending_points[point_id]
+                    try:
+                        self.save_point(point_id, overrides, future.result())
+                        status = 'done'
+                    except Exception as e:
+                        failed_point_count += 1
+                        status = f'failed ({type(e).__name__}: {e})'
+                    print(f'[{done_count}/{len(pending_points)}] {point_id} {overrides} {status}')
+
+        result_table = self.merge_result()
+        print(result_table.to_string(index=False))
+        return failed_point_count == 0
+
+    def merge_result(self):
+        row_list = list()
+        for point_id, overrides in zip(self.point_id_list, self.sweep_points):
+            point = self.load_point(point_id)
+            if point is None:
+                continue
+            for workload_result in point['result']:
+                row_list.append({'point_id': point_id, **overrides, **workload_result})
+        result_table = pd.DataFrame(row_list)
+        if len(result_table):
+            result_table = result_table.drop_duplicates(subset=['point_id', 'workload'])
+        result_table.to_csv(os.path.join(self.sweep_dir, 'sweep_result.csv'), index=False)
+        return result_table
@@ -0,0 +1,62 @@
+import json
+import os
+
+import numpy as np
+from core.framework.exception import PreconditionImageMismatch
+
+PRECONDITION_IMAGE_VERSION = 1
+
+
+class PreconditionImage:
+    '''
+    Post-preconditioning FTL state (AML mapping tables, FBM block state) stored in a single npz file.
+    The image keeps a fingerprint of the geometry and prefill arguments and is only restored when it matches.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+
+    def get_fingerprint(self, param, aml, test_size, sustained):
+        fingerprint = {
+            'version': PRECONDITION_IMAGE_VERSION,
+            'channel': param.CHANNEL,
+            'way': param.WAY,
+            'plane': param.PLANE,
+            'block_per_plane': param.BLOCK_PER_PLANE,
+            'page_per_block': param.PAGE_PER_BLOCK,
+            'mapunit_per_plane': aml.map_unit_count,
+            'stream_count': param.STREAM_COUNT,
+            'nand_cell_type': param.NAND_CELL_TYPE.name,
+            'plane_allocation_scheme': aml.plane_allocation_scheme,
+            'sustained': bool(sustained),
+        }
+        if sustained:
+            fingerprint['sustained_block_rate'] = param.SUSTAINED_BLOCK_RATE
+            fingerprint['sustained_page_rate'] = param.SUSTAINED_SIZE
+        else:
+            fingerprint['test_size'] = int(test_size)
+        return fingerprint
+
+    def exists(self):
+        return os.path.isfile(self.path)
+
+    def save(self, fingerprint, aml, fbm):
+        state = {f'aml_{key}': value for key, value in aml.get_precondition_state().items()}
+        state.update({f'fbm_{key}': value for key, value in fbm.get_precondition_state().items()})
+        state['fingerprint'] = np.array(json.dumps(fingerprint, sort_keys=True))
+
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            np.savez(f, **state)
+        os.replace(temp_path, self.path)
+
+    def load(self, fingerprint, aml, fbm):
+        with np.load(self.path, allow_pickle=False) as image:
+            image_fingerprint = json.loads(str(image['fingerprint']))
+            if image_fingerprint != fingerprint:
+                mismatch = sorted(key for key in fingerprint.keys() | image_fingerprint.keys()
+                                  if fingerprint.get(key) != image_fingerprint.get(key))
+                raise PreconditionImageMismatch(
+                    f'{self.path} does not match the current configuration: {", ".join(mismatch)}')
+            aml.set_precondition_state({key[len('aml_'):]: image[key] for key in image.files if key.startswith('aml_')})
+            fbm.set_precondition_state({key[len('fbm_'):]: image[key] for key in image.files if key.startswith('fbm_')})
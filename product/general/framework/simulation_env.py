@@ -7,12 +7,14 @@ from core.framework.file_path_generator import FilePathGenerator
 from core.framework.latency_logger import LoggingSection
 from core.framework.media_common import eMediaFifoID
 from core.framework.memory_c import MemoryC
+from core.framework.simulation_context import in_simulation_context
 from core.framework.timer import FrameworkTimer
 from core.modules.buffer_allocator import BufferAllocator
 from core.modules.ecc import ECC
 from core.modules.nand import NAND
 from product.general.config.storage_parameters import Parameter
 from product.general.framework.environment import initialize_environment
+from product.general.framework.precondition_image import PreconditionImage
 from product.general.modules.address_mapping_layer import AddressMappingLayer
 from product.general.modules.block_copy_manager import BlockCopyManager
 from product.general.modules.data_cache_layer import DataCacheLayer
@@ -123,31 +125,52 @@ class StorageSimulationEnv:
         self.file_path_generator = FilePathGenerator(self.param)
         self.vcd_manager.add_vcd_module_done()
 
+    @in_simulation_context
     def start_power_snapshot(self, workload, qd):
         self.power_manager.power_manager_reset()
         self.power_manager.start_power_snapshot(workload, qd)
 
+    @in_simulation_context
     def reset_log(self):
         self.nvme.reset_nvme()
         self.pcie.reset_test()
         self.hdma.reset_test()
         self.memc.init_memc_log()
 
+    @in_simulation_context
     def set_qd(self, qd):
         self.nvme.set_qd(qd)
         self.host.set_qd(qd)
 
+    @in_simulation_context
     def set_mapping_table(self, test_size, sustained):
+        precondition_image = None
+        if self.param.PRECONDITION_IMAGE:
+            precondition_image = PreconditionImage(self.param.PRECONDITION_IMAGE)
+            fingerprint = precondition_image.get_fingerprint(self.param, self.aml, test_size, sustained)
+            if precondition_image.exists():
+                if sustained:
+                    assert test_size <= self.aml.get_sustained_test_size(self.param.SUSTAINED_SIZE, self.param.SUSTAINED_BLOCK_RATE), \
+                        "Increase the block rate or size, or decrease the test size."
+                precondition_image.load(fingerprint, self.aml, self.fbm)
+                print("Precondition image loaded :", self.param.PRECONDITION_IMAGE)
+                return
+
         if sustained:
-            for i in self.aml.set_sustained_mapping_table(self.param.SUSTAINED_SIZE, self.param.SUSTAINED_BLOCK_RATE, test_size):
-                self.fbm.set_init_block(i)
+            layout = self.aml.set_sustained_mapping_table_bulk(self.param.SUSTAINED_SIZE, self.param.SUSTAINED_BLOCK_RATE, test_size)
         else:  # normal
-            for i in self.aml.set_mapping_table(test_size):
-                self.fbm.set_init_block(i)
+            layout = self.aml.set_mapping_table_bulk(test_size)
+        self.fbm.set_init_block_bulk(layout)
+
+        if precondition_image is not None:
+            precondition_image.save(fingerprint, self.aml, self.fbm)
+            print("Precondition image saved :", self.param.PRECONDITION_IMAGE)
 
+    @in_simulation_context
     def set_file_prefix(self, prefix_name, qd):
         self.file_path_generator.set_file_prefix(prefix_name, qd)
 
+    @in_simulation_context
     def start(
             self,
             workload,
@@ -158,7 +181,13 @@ class StorageSimulationEnv:
         self.host.run(workload, cmd_count)
 
         self.performance_measure.start_perf_measure()
+        self.submodule_profiler.start()
         self.env.run()
+        self.submodule_profiler.stop()
+
+    @in_simulation_context
+    def print_submodule_profile(self, workload_name):
+        self.submodule_profiler.print_profile(workload_name)
 
     def check_all_cmd_done(self):
         return self.analyzer.check_all_cmd_done()
@@ -167,6 +196,7 @@ class StorageSimulationEnv:
         return self.nvme.check_DMA(self.analyzer.data_transfer_mapunit_count[eCMDType.Read],
                                    self.analyzer.data_transfer_mapunit_count[eCMDType.Write])
 
+    @in_simulation_context
     def success(self):
         success = 1
         success &= self.check_all_cmd_done()
@@ -177,6 +207,7 @@ class StorageSimulationEnv:
         success &= self.check_all_dma_done()
         return success
 
+    @in_simulation_context
     def report_output(self, workload_name, is_success, skip_report=False):
         if is_success:
             self.analyzer.print_elapsed_time()
@@ -200,6 +231,17 @@ class StorageSimulationEnv:
         self.power_manager.print_power()
         self.analyzer.generate_diagram()
 
+    def close_log_files(self):
+        '''
+        Close the files written during the run (VCD, power logs, command and performance records), which
+        interpreter shutdown would otherwise flush. Needed before leaving a process with os._exit.
+        '''
+        self.vcd_manager.vcd_manager.close_vcd_file()
+        self.power_manager.close_log_files()
+        self.performance_measure.close_log_file()
+        if self.analyzer.command_record_file_generator is not None:
+            self.analyzer.command_record_file_generator.close_file()
+
     def print_debug_info(self):
         print()
         print("-" * 50)
@@ -1,6 +1,9 @@
+import math
 import sys
-from math import ceil
 
+from core.config.basic_workload_types import BasicWorkload, PreDefinedWorkload
+from core.script.workload_reader import PCMARK10
+from product.general.config.storage_parameters import Parameter
 from product.general.framework.print_workload import PrintWorkload
 from product.general.framework.simulation_env import StorageSimulationEnv
 
@@ -8,13 +11,14 @@ from product.general.framework.simulation_env import StorageSimulationEnv
 class SimulationRunner:
     def __init__(
             self,
-            env: StorageSimulationEnv,
+            env: StorageSimulationEnv = None,
             pcmark_workload=False,
             snappiness_workload=False):
+        # without env the runner only plans workloads, e.g. in the parent of --jobs workers
         self.env = env
-        self.param = self.env.param
+        self.param = self.env.param if env is not None else Parameter()
         self.qd = None
-        self.print_workload = PrintWorkload(self.env)
+        self.print_workload = PrintWorkload(self.env) if env is not None else None
 
     def print_nand_option(self) -> None:
         emphasis = '\033[1m' + \
@@ -25,6 +29,51 @@ class SimulationRunner:
             f'Cache Read {"Enable" if self.param.ENABLE_NAND_CACHE_READ else "Disable"}, '
             f'Logical Cache {"Enable" if self.param.ENABLE_LOGICAL_CACHE else "Disable"} \033[0m')
 
+    def get_basic_workload(self):
+        pre_defined_workload = PreDefinedWorkload(self.param)
+        self.param.ENABLE_tHost = 1
+
+        workload_name = self.param.args.pre_defined_workload
+
+        if workload_name:
+            try:
+                workload_patterns: tuple[BasicWorkload] = eval(
+                    f'pre_defined_workload.{workload_name}')
+            except SyntaxError:
+                assert 0, f'not defined workload: {workload_name}'
+        else:
+            # Assign pre-defined workload or make custom workload
+            workload_patterns: tuple[BasicWorkload] = pre_defined_workload.performance
+
+        if workload_name is None:
+            if range_bytes_str := self.param.args.range_bytes:
+                for workload in workload_patterns:
+                    workload.set_range_bytes(range_bytes_str)
+
+        if qd := self.param.args.qd:
+            for workload in workload_patterns:
+                workload.qd = qd
+
+        workload_list = [workload for workload in workload_patterns]
+        return workload_list
+
+    def get_benchmark_workload(self):
+        if self.param.WORKLOAD_TYPE == 'pcmark10':
+            workload_reader = PCMARK10(self.param)
+        else:
+            assert False, f'invalid workload: {self.param.WORKLOAD_TYPE}'
+        workload_list = workload_reader.workload_list
+        max_lpn = int(math.ceil(workload_reader.workload_max_offset / self.param.MAPUNIT_SIZE))
+        map_file = workload_reader.meta_map_file
+
+        return workload_list, max_lpn, map_file
+
+    def get_workload_list(self):
+        if self.param.WORKLOAD_TYPE == 'basic':
+            return self.get_basic_workload()
+        workload_list, max_lpn, map_file = self.get_benchmark_workload()
+        return workload_list
+
     def set_qd(self, qd):
         if qd is None:
             qd = self.param.HOST_QD_DEFAULT
@@ -39,13 +88,7 @@ class SimulationRunner:
         if workload_type == 'basic':
             range_bytes = workload.pattern.range_bytes
         else:
-            df = workload.df
-            workload_io_cmd = df.loc[(df['IO Type'] == 'Write') | (df['IO Type'] == 'Read'), ['Min Offset', 'Size (B)']]
-
-            def calculate_aligned_size(min_offset, size):
-                return int(ceil((min_offset + size) / self.param.FTL_MAP_UNIT_SIZE) - (
-                            min_offset // self.param.FTL_MAP_UNIT_SIZE)) * self.param.FTL_MAP_UNIT_SIZE
-            range_bytes = workload_io_cmd.apply(lambda x: calculate_aligned_size(x['Min Offset'], x['Size (B)']), axis=1).sum()
+            range_bytes = workload.read_write_aligned_bytes
         return range_bytes
 
     def get_max_mapping_table(self, workload_list):
@@ -82,4 +125,6 @@ class SimulationRunner:
             self.env.reset_log()
 
         self.start_sim(workload, skip_perf_measure)
-        self.print_workload.result(skip_report=skip_report)
+        is_success = self.print_workload.result(skip_report=skip_report)
+        self.env.print_submodule_profile(workload.name)
+        return is_success
@@ -0,0 +1,37 @@
+import json
+import os
+import socket
+import sys
+import tempfile
+
+EXIT_MARKER = b'\0exit:'
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), 'arno_simulator.sock')
+
+
+def send_request(request, socket_path=DEFAULT_SOCKET_PATH, output=None):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(socket_path)
+    client.sendall(json.dumps(request).encode() + b'\n')
+    if output is None:
+        client.close()
+        return 0
+
+    tail = b''
+    while data := client.recv(1 << 16):
+        data = tail + data
+        tail = data[-len(EXIT_MARKER) - 8:]
+        output.write(data[:-len(tail)])
+        output.flush()
+    client.close()
+    body, _, exit_code = tail.rpartition(EXIT_MARKER)
+    output.write(body)
+    output.flush()
+    return int(exit_code) if exit_code else 1
+
+
+def run_on_server(argv, socket_path=DEFAULT_SOCKET_PATH):
+    return send_request({'argv': list(argv), 'cwd': os.getcwd()}, socket_path, sys.stdout.buffer)
+
+
+def stop_server(socket_path=DEFAULT_SOCKET_PATH):
+    send_request({'command': 'stop'}, socket_path)
@@ -0,0 +1,167 @@
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import traceback
+
+import numpy as np
+from core.framework.file_path_generator import FilePathGenerator
+from core.framework.simulation_context import SimulationContext
+from product.general.config.argument import parse_args
+from product.general.config.storage_parameters import Parameter
+from product.general.framework.simulation_env import StorageSimulationEnv
+from product.general.framework.warm_client import DEFAULT_SOCKET_PATH, EXIT_MARKER
+
+# Options only read when the workload list is built, a warm environment is reused when all other options match
+RUN_ONLY_OPTIONS = ('pre_defined_workload', 'range_bytes', 'qd')
+
+
+def get_random_state():
+    return random.getstate(), np.random.get_state()
+
+
+def set_random_state(random_state):
+    random.setstate(random_state[0])
+    np.random.set_state(random_state[1])
+
+
+def get_env_options(args):
+    return {key: value for key, value in vars(args).items() if key not in RUN_ONLY_OPTIONS}
+
+
+class WarmSimulatorServer:
+    '''
+    Imports the simulator and builds one StorageSimulationEnv for warm_argv once, then forks a copy-on-write child
+    per run request received on a unix socket. A child reuses the warm environment when the requested arguments
+    only differ in RUN_ONLY_OPTIONS and builds a new one otherwise, so every run matches a fresh storage_simulator.py.
+    Output and exit code of the child are streamed back on the request connection.
+    '''
+
+    def __init__(self, run_function, socket_path=DEFAULT_SOCKET_PATH, warm_argv=()):
+        self.run_function = run_function
+        self.socket_path = socket_path
+        self.initial_random_state = get_random_state()
+        self.warm_dir = tempfile.mkdtemp(prefix='arno_warm_')
+        self.warm_args = parse_args(list(warm_argv))
+        self.warm_env = None
+        self.warm_random_state = None
+        self.simulation_env = None
+        if not self.warm_args.enable_command_record:
+            self.build_warm_env()
+
+    def build_warm_env(self):
+        cwd = os.getcwd()
+        os.chdir(self.warm_dir)
+        try:
+            SimulationContext().set_current()
+            Parameter(self.warm_args)
+            self.warm_env = StorageSimulationEnv()
+            self.warm_random_state = get_random_state()
+            for owner, name in self.get_log_file_list(self.warm_env):
+                getattr(owner, name).flush()
+        finally:
+            os.chdir(cwd)
+
+    def is_warm_env_usable(self, args):
+        return self.warm_env is not None and get_env_options(args) == get_env_options(self.warm_args)
+
+    def get_log_file_list(self, env):
+        '''
+        (owner, attribute) of the log files opened while building an environment (VCD and total power log).
+        '''
+        log_file_list = [(env.vcd_manager.vcd_manager, 'vcd_file'), (env.power_manager, 'total_power_filename')]
+        return [(owner, name) for owner, name in log_file_list if hasattr(owner, name)]
+
+    def reopen_log_file(self, log_file):
+        '''
+        Copy a log file written while building the warm environment into the run directory and continue there.
+        '''
+        with open(os.path.join(self.warm_dir, log_file.name)) as f:
+            content = f.read()
+        log_file.close()
+        new_log_file = open(log_file.name, 'w')
+        new_log_file.write(content)
+        return new_log_file
+
+    def get_warm_env(self, args):
+        set_random_state(self.warm_random_state)
+        env = self.warm_env
+        with env.context.activate():
+            env.param.args = args
+            FilePathGenerator(env.param)
+            for owner, name in self.get_log_file_list(env):
+                setattr(owner, name, self.reopen_log_file(getattr(owner, name)))
+        return env
+
+    def run_request(self, request):
+        os.chdir(request['cwd'])
+        os.environ['PYTHONBREAKPOINT'] = '0'
+        args = parse_args(request['argv'])
+        if self.is_warm_env_usable(args):
+            simulation_env = self.get_warm_env(args)
+            param = simulation_env.param
+        else:
+            set_random_state(self.initial_random_state)
+            SimulationContext().set_current()
+            param = Parameter(args)
+            # the environment start_sim would build, made here so its log files can be closed before os._exit
+            simulation_env = None if param.INDEPENDENT_WORKLOADS else StorageSimulationEnv()
+        self.simulation_env = simulation_env
+        self.run_function(param, args, simulation_env)
+
+    def run_child(self, connection, request):
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(connection.fileno(), sys.stdout.fileno())
+        os.dup2(connection.fileno(), sys.stderr.fileno())
+        exit_code = 0
+        try:
+            self.run_request(request)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+        self.close_log_files()
+        connection.sendall(EXIT_MARKER + str(exit_code).encode())
+        connection.close()
+        os._exit(0)
+
+    def close_log_files(self):
+        '''
+        The child leaves with os._exit, so close what interpreter shutdown would have flushed (VCD, logs, stdout).
+        Workloads of an --independent-workloads run close their own environment's files.
+        '''
+        if self.simulation_env is not None:
+            self.simulation_env.close_log_files()
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+    def serve(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen()
+        print(f'[INFO] Simulator server ready on {self.socket_path}', flush=True)
+        try:
+            while True:
+                connection, _ = server.accept()
+                request = json.loads(connection.makefile('rb').readline())
+                if request.get('command') == 'stop':
+                    connection.close()
+                    break
+                if os.fork() == 0:
+                    server.close()
+                    self.run_child(connection, request)
+                connection.close()
+        finally:
+            server.close()
+            os.remove(self.socket_path)
+            shutil.rmtree(self.warm_dir, ignore_errors=True)
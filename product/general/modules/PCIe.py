@@ -1,5 +1,3 @@
-import math
-
 from core.framework.common import RoundRobinQueues, eCMDType
 from core.modules.parallel_unit import ParallelUnit
 from product.general.modules.nvme import ePCIeOpcode
@@ -22,7 +20,7 @@ class PCIe(ParallelUnit):
         # for dma
         self.user_dma_payload = 512
         if self.user_dma_payload != self.param.SECTOR_SIZE:
-            assert 0, 'need to check split_cnt in handling_dma_request'
+            assert 0, 'need to check dma_latency in handling_dma_request'
         self.update_archive_size = 4096
         self.hmd_payload = 32
         self.update_archive_cnt = self.update_archive_size / self.hmd_payload
@@ -31,14 +29,15 @@ class PCIe(ParallelUnit):
         self.r_dma_feature_id = self.feature.PCIE_RDMA
         self.w_dma_feature_id = self.feature.PCIE_WDMA
         # R/WDMA = 4K Transfer latency
+        sector_per_4k = 4096 // self.user_dma_payload
         self.r_dma_latency_512B = self.feature.get_latency(
-            self.r_dma_feature_id) / 8
+            self.r_dma_feature_id) / sector_per_4k
         self.w_dma_latency_512B = self.feature.get_latency(
-            self.w_dma_feature_id) / 8
+            self.w_dma_feature_id) / sector_per_4k
 
+        # One DMA job moves a whole FTL MapUnit, its latency is the sum of its 512B transfers
         self.dma_queue_type = {'user': 0}
         self.dma_rr_queues = RoundRobinQueues(len(self.dma_queue_type))
-        self.remain_dma_cnt = {}
         self.dma_unique_id = 0
         self.dma_submodule = self.generate_submodule(
             self.dma, [self.feature.PCIE_RDMA, self.feature.PCIE_WDMA])
@@ -60,7 +59,6 @@ class PCIe(ParallelUnit):
 
     def reset_test(self):
         self.host_request_dma_size = dict()
-        self.remain_dma_cnt = {}
         self.dma_unique_id = 0
 
     def rx_pcie_handler(self, packet):
@@ -72,39 +70,33 @@ class PCIe(ParallelUnit):
             src_submodule=self.rx_pcie_handler)
 
     def dma(self, packet):
-        # Process One LBA Unit
+        # Process One FTL MapUnit
         latency = packet['dma_latency']
         if packet['cmd_type'] == eCMDType.Read:
             feature_id = self.r_dma_feature_id
             cmd_type = eCMDType.Read
             packet['opcode'] = ePCIeOpcode.ReadCompletion
         else:
-            latency += self.dma_delay_latency_ns
+            latency += self.dma_delay_latency_ns * packet['desc_id']['sector_count']
             feature_id = self.w_dma_feature_id
             cmd_type = eCMDType.Write
 
         yield from self.dma_submodule.activate_feature(feature_id, runtime_latency=latency)
 
-        dma_unique_id = packet['dma_unique_id']
-        self.remain_dma_cnt[dma_unique_id] -= 1
-        # All the DMAs of LBAs were done for one FTL MapUnit
-        if self.remain_dma_cnt[dma_unique_id] == 0:
-            del self.remain_dma_cnt[dma_unique_id]
-
-            if packet['desc_id']['sector_count'] != 0:
-                self.analyzer.increase_data_transfer_done_count(
-                    cmd_type, packet['desc_id']['sector_count'] * self.param.SECTOR_SIZE / 4096)
+        if packet['desc_id']['sector_count'] != 0:
+            self.analyzer.increase_data_transfer_done_count(
+                cmd_type, packet['desc_id']['sector_count'] * self.param.SECTOR_SIZE / 4096)
 
-            self.vcd_manager.increase_pcie_dma(cmd_type)
+        self.vcd_manager.increase_pcie_dma(cmd_type)
 
-            send_packet = hdma_pif.HDMADoneSQ(packet, self.address)
-            self.send_sq(
-                send_packet,
-                self.address,
-                self.address_map.HDMA,
-                src_submodule=self.dma,
-                description=cmd_type.name +
-                ' DMA Done')
+        send_packet = hdma_pif.HDMADoneSQ(packet, self.address)
+        self.send_sq(
+            send_packet,
+            self.address,
+            self.address_map.HDMA,
+            src_submodule=self.dma,
+            description=cmd_type.name +
+            ' DMA Done')
 
         if self.dma_rr_queues.any_remaining_jobs():
             packet = self.dma_rr_queues.pop_round_robin()
@@ -112,25 +104,17 @@ class PCIe(ParallelUnit):
 
     def handling_dma_request(self, packet, src_fifo):
         # process one FTL MapUnit (4KB)
-        # * self.param.SECTOR_SIZE // self.user_dma_payload
-        split_cnt = packet['desc_id']['sector_count']
+        sector_count = packet['desc_id']['sector_count']
 
-        overhead = self.small_user_cmd_overhead / \
-            split_cnt if 1 == self.host_request_dma_size[packet['cmd_id']] else 0
+        overhead = self.small_user_cmd_overhead if 1 == self.host_request_dma_size[packet['cmd_id']] else 0
         latency = self.r_dma_latency_512B if packet['cmd_type'] == eCMDType.Read else self.w_dma_latency_512B
-        latency += overhead
-
-        packet['dma_latency'] = latency
+        packet['dma_latency'] = latency * sector_count + overhead
 
-        split_cnt = math.ceil(split_cnt)
         packet['dma_unique_id'] = self.dma_unique_id
-        self.remain_dma_cnt[self.dma_unique_id] = split_cnt
-        for _ in range(split_cnt):
-            self.dma_rr_queues.push(packet, 0)
+        self.dma_rr_queues.push(packet, 0)
 
         self.dma_unique_id += 1
 
-        # Process Each LBA Units in One FTL MapUnit
         if self.dma_rr_queues.any_remaining_jobs():
             packet = self.dma_rr_queues.pop_round_robin()
             self.wakeup(self.address, self.dma, packet, src_id=src_fifo)
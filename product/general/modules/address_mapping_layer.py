@@ -1,6 +1,7 @@
 import copy
 import sys
 
+import numpy as np
 from core.config.core_parameter import CoreParameter
 from core.framework.common import (BufferedUnitType, MemAccessInfo,
                                    QueueDepthChecker, StatusType,
@@ -9,6 +10,10 @@ from core.framework.common import (BufferedUnitType, MemAccessInfo,
 from core.modules.parallel_unit import ParallelUnit
 from product.general.config.storage_feature import Feature
 from product.general.config.storage_parameters import Parameter
+from product.general.modules.address_mapping_layer_class.aml_mapping_table import (
+    ArrayMappingTable, DictMappingTable)
+from product.general.modules.address_mapping_layer_class.aml_precondition_layout import (
+    PreconditionLayout, repeat_segments)
 from product.general.modules.nvm_transaction_class.nvm_transaction import (
     AddressID, NvmTransactionFlash)
 from product.general.provided_interface.aml_pif import AMLPIF
@@ -66,9 +71,7 @@ class AddressMappingLayer(ParallelUnit):
         self.not_update_map = 0
 
         self.l2p_size_b = 4
-        self.mapping_table = {}
-        self.check_hazard_mapping_table = {}
-        self.p2l_map = {}
+        self.init_mapping_table()
         self.receive_call_back_event = self.env.event()
         self.receive_done_event = self.env.event()
         self.receive_release_done_event = self.env.event()
@@ -88,6 +91,19 @@ class AddressMappingLayer(ParallelUnit):
         self.addr = [AddressID()] * self.param.STREAM_COUNT
         self.plane_allocation_scheme = self.core.PlaneAllocationScheme
 
+    def init_mapping_table(self):
+        if self.param.ENABLE_ARRAY_MAPPING_TABLE:
+            map_unit_count = (self.param.CHANNEL * self.param.WAY * self.param.PLANE *
+                              self.param.BLOCK_PER_PLANE * self.param.PAGE_PER_BLOCK * self.core.MAPUNIT_PER_PLANE)
+            lpn_count = max(map_unit_count, self.param.TOTAL_USER_PPN_COUNT)
+            self.mapping_table = ArrayMappingTable(lpn_count, map_unit_count)
+            self.check_hazard_mapping_table = ArrayMappingTable(lpn_count, map_unit_count)
+            self.p2l_map = ArrayMappingTable(map_unit_count, lpn_count)
+        else:
+            self.mapping_table = DictMappingTable()
+            self.check_hazard_mapping_table = DictMappingTable()
+            self.p2l_map = DictMappingTable()
+
     class AddressID:
         def __init__(self):
             self.channel = 0
@@ -97,19 +113,6 @@ class AddressMappingLayer(ParallelUnit):
             self.page = 0
             self.lpo = 0
 
-    def get_init_ppn(self):
-        ppn = (
-            ((((self.addr[0].channel *
-                self.way_count) +
-               self.addr[0].way) *
-              self.plane_count +
-              self.addr[0].plane) *
-             self.block_count +
-             self.addr[0].block) *
-            self.page_count +
-            self.addr[0].page)
-        return ppn
-
     def print_unmapped_lpn(self, lpn):
         emphasis = '\033[1m'
         if sys.platform == 'win32':
@@ -118,104 +121,193 @@ class AddressMappingLayer(ParallelUnit):
             emphasis += '\033[5m'
         # print(f"\n{emphasis}\033[33m[WARNING] Host Read 명령이 \'Unmap\' 발생하였습니다. LPN={lpn}({lpn:#x})\033[0m")
 
-    def set_mapping_table(self, test_size):
+    def get_last_plane_unit(self, channel, way, plane, test_size):
+        if self.map_unit_count <= 3:
+            return np.empty(0, dtype=np.int64)
+
+        # block and page move on at the 4th map unit of the last plane
+        is_last_plane = ((channel == self.channel_count - 1) &
+                         (way == self.way_count - 1) &
+                         (plane == self.plane_count - 1))
+        last_plane_unit = np.flatnonzero(is_last_plane)
+        return last_plane_unit[last_plane_unit * self.map_unit_count + 3 < test_size]
+
+    def write_prefill_mapping_table(self, layout, test_size, update_hazard_table):
+        unit_ppn = layout.get_ppn(
+            self.way_count,
+            self.plane_count,
+            self.block_count,
+            self.page_count)
+        chunk_size = 1 << 22
+        for start in range(0, test_size, chunk_size):
+            lpn = np.arange(start, min(start + chunk_size, test_size), dtype=np.int64)
+            map_unit = unit_ppn[lpn // self.map_unit_count] * self.map_unit_count + lpn % self.map_unit_count
+            self.mapping_table.update_range(start, map_unit)
+            if update_hazard_table:
+                self.check_hazard_mapping_table.update_range(start, map_unit)
+            self.p2l_map.update_bulk(map_unit, lpn)
+
+        if len(layout):
+            self.addr[0] = AddressID()
+            self.addr[0].channel = int(layout.channel[-1])
+            self.addr[0].way = int(layout.way[-1])
+            self.addr[0].plane = int(layout.plane[-1])
+            self.addr[0].block = int(layout.block[-1])
+            self.addr[0].page = int(layout.page[-1])
+        self.write_count[0] = 0
+
+    def set_mapping_table_bulk(self, test_size):
         assert self.page_count % self.cell_type.value == 0
+        unit_count = -(-test_size // self.map_unit_count)
+        channel, way, plane = self.get_plane_address(
+            np.arange(unit_count, dtype=np.int64) + self.write_count[0])
+
+        # (unit, 0): block and page move on after the last plane unit, (unit, 1): next page starts
+        events = [(unit, 1) for unit in range(
+            0, unit_count, self.channel_count * self.way_count * self.plane_count)]
+        events += [(unit + 1, 0) for unit in self.get_last_plane_unit(channel, way, plane, test_size).tolist()]
+        events.sort()
+
         page = -1
         block = 0
-        for i in range(test_size):
-            if i % (self.channel_count * self.way_count *
-                    self.plane_count * self.map_unit_count) == 0:
+        segment_start = 0
+        segment_length, segment_block, segment_page = [], [], []
+        for unit, is_next_page in events:
+            if unit > segment_start:
+                segment_length.append(unit - segment_start)
+                segment_block.append(block)
+                segment_page.append(page)
+                segment_start = unit
+            if is_next_page:
                 page += 1
-            if i % self.map_unit_count == 0:
-                self.addr[0] = self.allocate_plane(0)
-                self.addr[0].block = block
-                self.addr[0].page = page
-            ppn = self.get_init_ppn()
-            self.mapping_table[i] = ppn * self.map_unit_count + i % self.map_unit_count
-            self.check_hazard_mapping_table[i] = ppn * self.map_unit_count + i % self.map_unit_count
-            self.p2l_map[ppn * self.map_unit_count + i % self.map_unit_count] = i
-            if page == self.page_count - 1 and i % self.map_unit_count == 3 and self.addr[0].channel == self.channel_count - 1 and self.addr[0].way == self.way_count - 1 and self.addr[0].plane == self.plane_count - 1:
+            elif page == self.page_count - 1:
                 page = 0
                 block += 1
                 if block == self.block_count:
                     block = 0
-            address = AddressID()
-            address.copy_from(self.addr[0])
-            yield address
-        self.write_count[0] = 0
-
-    def set_sustained_mapping_table(self, size, block_ratio, nead_test_size):
+        if unit_count > segment_start:
+            segment_length.append(unit_count - segment_start)
+            segment_block.append(block)
+            segment_page.append(page)
+
+        layout = PreconditionLayout(
+            channel,
+            way,
+            plane,
+            repeat_segments(segment_block, segment_length),
+            repeat_segments(segment_page, segment_length))
+        self.write_prefill_mapping_table(layout, test_size, update_hazard_table=True)
+        return layout
+
+    def set_sustained_mapping_table_bulk(self, size, block_ratio, nead_test_size):
         assert self.page_count % self.cell_type.value == 0
-        page = 0
-        block = 0
-        test_size = int(self.channel_count * self.way_count * self.plane_count * self.block_count * self.page_count * self.map_unit_count * block_ratio * size)
+        test_size = self.get_sustained_test_size(size, block_ratio)
 
         assert nead_test_size <= test_size, "Increase the block rate or size, or decrease the test size."
 
-        for i in range(test_size):
-            assert page <= self.page_count
-            if i % self.map_unit_count == 0:
-                self.addr[0] = self.allocate_plane(0)
-                self.addr[0].block = block
-                self.addr[0].page = page
-            ppn = self.get_init_ppn()
-            self.mapping_table[i] = ppn * self.map_unit_count + i % self.map_unit_count
-            self.p2l_map[ppn * self.map_unit_count + i % self.map_unit_count] = i
-            if i % self.map_unit_count == 3 and self.addr[0].channel == self.channel_count - 1 and self.addr[0].way == self.way_count - 1 and self.addr[0].plane == self.plane_count - 1:
-                block += 1
-                if block > self.block_count * block_ratio:
-                    block = 0
-                    page += 1
-            address = AddressID()
-            address.copy_from(self.addr[0])
-            yield address
-        self.write_count[0] = 0
-        print("The pages in the block are filled up to page :", page)
+        unit_count = -(-test_size // self.map_unit_count)
+        channel, way, plane = self.get_plane_address(
+            np.arange(unit_count, dtype=np.int64) + self.write_count[0])
 
-    def allocate_plane(self, stream):
-        address = AddressID()
+        page = 0
+        block = 0
+        segment_start = 0
+        segment_length, segment_block, segment_page = [], [], []
+        for unit in (self.get_last_plane_unit(channel, way, plane, test_size) + 1).tolist():
+            if unit > segment_start:
+                segment_length.append(unit - segment_start)
+                segment_block.append(block)
+                segment_page.append(page)
+                segment_start = unit
+            block += 1
+            if block > self.block_count * block_ratio:
+                block = 0
+                page += 1
+        if unit_count > segment_start:
+            segment_length.append(unit_count - segment_start)
+            segment_block.append(block)
+            segment_page.append(page)
+        assert not segment_page or segment_page[-1] <= self.page_count
+
+        layout = PreconditionLayout(
+            channel,
+            way,
+            plane,
+            repeat_segments(segment_block, segment_length),
+            repeat_segments(segment_page, segment_length))
+        self.write_prefill_mapping_table(layout, test_size, update_hazard_table=False)
+        print("The pages in the block are filled up to page :", page)
+        return layout
+
+    def get_sustained_test_size(self, size, block_ratio):
+        return int(self.channel_count * self.way_count * self.plane_count * self.block_count * self.page_count * self.map_unit_count * block_ratio * size)
+
+    def get_precondition_state(self):
+        state = {}
+        for name in ('mapping_table', 'check_hazard_mapping_table', 'p2l_map'):
+            state[f'{name}_key'], state[f'{name}_value'] = getattr(self, name).get_items()
+        state['addr'] = np.array([self.addr[0].channel, self.addr[0].way, self.addr[0].plane,
+                                  self.addr[0].block, self.addr[0].page, self.addr[0].lpo], dtype=np.int64)
+        state['write_count'] = np.array(self.write_count, dtype=np.int64)
+        return state
+
+    def set_precondition_state(self, state):
+        for name in ('mapping_table', 'check_hazard_mapping_table', 'p2l_map'):
+            getattr(self, name).update_bulk(state[f'{name}_key'], state[f'{name}_value'])
+        self.addr[0] = AddressID()
+        (self.addr[0].channel, self.addr[0].way, self.addr[0].plane,
+         self.addr[0].block, self.addr[0].page, self.addr[0].lpo) = state['addr'].tolist()
+        self.write_count = state['write_count'].tolist()
+
+    def get_plane_address(self, write_count):
+        channel = way = plane = write_count * 0
         if self.plane_allocation_scheme == 'CWP':
-            address.channel = self.write_count[stream] % self.channel_count
-            address.way = (
-                self.write_count[stream] // self.channel_count) % self.way_count
-            address.plane = (
-                self.write_count[stream] // (self.channel_count * self.way_count)) % self.plane_count
+            channel = write_count % self.channel_count
+            way = (
+                write_count // self.channel_count) % self.way_count
+            plane = (
+                write_count // (self.channel_count * self.way_count)) % self.plane_count
 
         elif self.plane_allocation_scheme == 'CPW':
-            address.channel = self.write_count[stream] % self.channel_count
-            address.way = (
-                self.write_count[stream] // (self.channel_count * self.plane_count)) % self.way_count
-            address.plane = (
-                self.write_count[stream] // self.channel_count) % self.plane_count
+            channel = write_count % self.channel_count
+            way = (
+                write_count // (self.channel_count * self.plane_count)) % self.way_count
+            plane = (
+                write_count // self.channel_count) % self.plane_count
 
         elif self.plane_allocation_scheme == 'WCP':
-            address.channel = (
-                self.write_count[stream] // self.way_count) % self.channel_count
-            address.way = self.write_count[stream] % self.way_count
-            address.plane = (
-                self.write_count[stream] // (self.way_count * self.channel_count)) % self.plane_count
+            channel = (
+                write_count // self.way_count) % self.channel_count
+            way = write_count % self.way_count
+            plane = (
+                write_count // (self.way_count * self.channel_count)) % self.plane_count
 
         elif self.plane_allocation_scheme == 'WPC':
-            address.channel = (
-                self.write_count[stream] // (self.way_count * self.plane_count)) % self.channel_count
-            address.way = self.write_count[stream] % self.way_count
-            address.plane = (
-                self.write_count[stream] // self.way_count) % self.plane_count
+            channel = (
+                write_count // (self.way_count * self.plane_count)) % self.channel_count
+            way = write_count % self.way_count
+            plane = (
+                write_count // self.way_count) % self.plane_count
 
         elif self.plane_allocation_scheme == 'PCW':
-            address.channel = (
-                self.write_count[stream] // self.plane_count) % self.channel_count
-            address.way = (self.write_count[stream] // (self.plane_count *
-                           self.channel_count)) % self.way_count
-            address.plane = self.write_count[stream] % self.plane_count
+            channel = (
+                write_count // self.plane_count) % self.channel_count
+            way = (write_count // (self.plane_count * self.channel_count)) % self.way_count
+            plane = write_count % self.plane_count
 
         elif self.plane_allocation_scheme == 'PWC':
-            address.channel = (
-                self.write_count[stream] // (self.plane_count * self.way_count)) % self.channel_count
-            address.way = (
-                self.write_count[stream] // self.plane_count) % self.way_count
-            address.plane = self.write_count[stream] % self.plane_count
+            channel = (
+                write_count // (self.plane_count * self.way_count)) % self.channel_count
+            way = (
+                write_count // self.plane_count) % self.way_count
+            plane = write_count % self.plane_count
 
+        return channel, way, plane
+
+    def allocate_plane(self, stream):
+        address = AddressID()
+        address.channel, address.way, address.plane = self.get_plane_address(
+            self.write_count[stream])
         self.write_count[stream] += 1
         return address
 
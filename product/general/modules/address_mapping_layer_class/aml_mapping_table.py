@@ -0,0 +1,120 @@
+import numpy as np
+
+UNMAPPED = -1
+
+
+class DictMappingTable(dict):
+    def lookup_range(self, start, count):
+        return np.fromiter((self.get(key, UNMAPPED) for key in range(start, start + count)),
+                           dtype=np.int64, count=count)
+
+    def update_range(self, start, values):
+        values = np.asarray(values).tolist()
+        self.update(zip(range(start, start + len(values)), values))
+
+    def update_bulk(self, keys, values):
+        self.update(zip(np.asarray(keys).tolist(), np.asarray(values).tolist()))
+
+    def get_items(self):
+        return (np.fromiter(self.keys(), dtype=np.int64, count=len(self)),
+                np.fromiter(self.values(), dtype=np.int64, count=len(self)))
+
+    def invalidate_range(self, start, count):
+        for key in range(start, start + count):
+            self.pop(key, None)
+
+    def invalidate_bulk(self, keys):
+        for key in np.asarray(keys).tolist():
+            self.pop(key, None)
+
+
+class ArrayMappingTable:
+    '''
+    Dense mapping table indexed by key with the same read / update / invalidate semantics as DictMappingTable.
+    Each entry keeps value + 1 so that zero means unmapped, and the zero filled table only occupies
+    memory for the pages that have been written.
+    '''
+
+    def __init__(self, capacity, max_value):
+        if max_value + 1 < np.iinfo(np.int32).max:
+            self.dtype = np.int32
+        else:
+            self.dtype = np.int64
+        self.table = np.zeros(capacity, dtype=self.dtype)
+        self.capacity = capacity
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(capacity={self.capacity}, mapped={len(self)})'
+
+    def __len__(self):
+        return int(np.count_nonzero(self.table))
+
+    def __contains__(self, key):
+        return 0 <= key < self.capacity and self.table[key] != 0
+
+    def __getitem__(self, key):
+        if 0 <= key < self.capacity:
+            value = int(self.table[key])
+            if value:
+                return value - 1
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if 0 <= key < self.capacity:
+            value = int(self.table[key])
+            if value:
+                return value - 1
+        return default
+
+    def __setitem__(self, key, value):
+        if key < 0:
+            raise KeyError(key)
+        if key >= self.capacity:
+            self.extend(key + 1)
+        self.table[key] = value + 1
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.table[key] = 0
+
+    def extend(self, capacity):
+        capacity = max(capacity, self.capacity * 2)
+        table = np.zeros(capacity, dtype=self.dtype)
+        table[:self.capacity] = self.table
+        self.table = table
+        self.capacity = capacity
+
+    def lookup_range(self, start, count):
+        values = np.full(count, UNMAPPED, dtype=np.int64)
+        end = min(start + count, self.capacity)
+        if start < end:
+            values[:end - start] = self.table[start:end]
+            values[:end - start] -= 1
+        return values
+
+    def update_range(self, start, values):
+        values = np.asarray(values)
+        if start + len(values) > self.capacity:
+            self.extend(start + len(values))
+        self.table[start:start + len(values)] = values + 1
+
+    def update_bulk(self, keys, values):
+        keys = np.asarray(keys)
+        if len(keys) == 0:
+            return
+        max_key = int(keys.max())
+        if max_key >= self.capacity:
+            self.extend(max_key + 1)
+        self.table[keys] = np.asarray(values) + 1
+
+    def get_items(self):
+        keys = np.flatnonzero(self.table)
+        return keys, self.table[keys].astype(np.int64) - 1
+
+    def invalidate_range(self, start, count):
+        self.table[start:min(start + count, self.capacity)] = 0
+
+    def invalidate_bulk(self, keys):
+        keys = np.asarray(keys)
+        self.table[keys[keys < self.capacity]] = 0
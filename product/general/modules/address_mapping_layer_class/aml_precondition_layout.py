@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class PreconditionLayout:
+    '''
+    Prefilled address of every write unit (MAPUNIT_PER_PLANE LPNs) in write order.
+    '''
+    channel: np.ndarray
+    way: np.ndarray
+    plane: np.ndarray
+    block: np.ndarray
+    page: np.ndarray
+
+    def __len__(self):
+        return len(self.block)
+
+    def get_plane_id(self, way_count, plane_count):
+        return (self.channel * way_count + self.way) * plane_count + self.plane
+
+    def get_ppn(self, way_count, plane_count, block_count, page_count):
+        return ((self.get_plane_id(way_count, plane_count) *
+                 block_count + self.block) * page_count + self.page)
+
+
+def repeat_segments(segment_values, segment_lengths):
+    return np.repeat(np.asarray(segment_values, dtype=np.int64),
+                     np.asarray(segment_lengths, dtype=np.int64))
@@ -3,6 +3,7 @@ from core.framework.common import (BufferedUnitType, MemAccessInfo,
                                    QueueDepthChecker, StatusType,
                                    TransactionSourceType, eCMDType,
                                    eResourceType)
+from core.framework.sector_bitmap import make_sector_bitmap
 from core.modules.parallel_unit import ParallelUnit
 from product.general.config.storage_feature import Feature
 from product.general.config.storage_parameters import Parameter
@@ -38,6 +39,8 @@ class BlockCopyManager(ParallelUnit):
         self.gc_page_buffer_ids_2 = {}
         self.wait_buffer_alloc = {}
         self.channel_count = self.param.CHANNEL
+        # GC reads copy whole map units
+        self.full_sector_bitmap = make_sector_bitmap(0, self.param.SECTOR_PER_GAUDI_MAP_UNIT)
         self.way_count = self.param.WAY
         self.plane_count = self.param.PLANE
         self.page_count = self.param.PAGE_PER_BLOCK
@@ -110,7 +113,8 @@ class BlockCopyManager(ParallelUnit):
                                     buffer_ptr=buffer_ptr,
                                     old_ppn=old_ppn,
                                     user='gc',
-                                    src_num=packet["src_num"]
+                                    src_num=packet["src_num"],
+                                    valid_sector_bitmap=self.full_sector_bitmap
                                 )
                                 read_packet["src_num"] = packet["src_num"]
 
@@ -1,8 +1,12 @@
+from collections import deque
+
 from core.framework.common import (BufferedUnitType, MemAccessInfo,
                                    QueueDepthChecker, StatusType,
                                    TransactionSourceType, eCMDType,
                                    eResourceType)
 from core.modules.parallel_unit import ParallelUnit
+from product.general.modules.data_cache_layer_class.dcl_data_cache import (
+    DataCache, cache_replacement_policy_dict)
 from product.general.provided_interface.dcl_pif import DCLPIF
 
 
@@ -104,34 +108,52 @@ class DataCacheLayer(ParallelUnit):
         self.generate_submodule(self.check_write_wait_need, self.feature.ZERO)
         self.generate_submodule(self.flush_handler, self.feature.ZERO)
 
-        self.data_cache_use_count = {}
-        self.data_cache_list = {}
-        self.wait_read_done_packet = {}
+        self.cache_policy = cache_replacement_policy_dict[self.param.DCL_CACHE_POLICY]()
+        self.data_cache = DataCache(self.param.LOGICAL_CACHE_ENTRY_CNT, self.cache_policy)
+        self.cache_slot_waiter = deque()
         self.flush_lpn_list = {}
 
         self.flush_done_count = 0
         self.flush_issue_count = 0
 
         self.wait_lpn = None
-        self.active_lpn = []
-        self.data_cache_slot_count = self.param.LOGICAL_CACHE_ENTRY_CNT
-        self.data_cache_empty_count = self.data_cache_slot_count
-        self.receive_write_done_event = self.env.event()
+        self.active_lpn_count = {}
         self.wait_lpn_use_done = self.env.event()
 
-    class CacheInfo:
-        def __init__(self, packet, clean):
-            self.cache_packet = packet
-            self.is_clean = clean
-
     def check_cache_hit(self, lpn):
-        return lpn in self.data_cache_list
+        return lpn in self.data_cache
+
+    def add_active_lpn(self, lpn):
+        self.active_lpn_count[lpn] = self.active_lpn_count.get(lpn, 0) + 1
+
+    def remove_active_lpn(self, lpn):
+        if lpn == self.wait_lpn:
+            self.wait_lpn_use_done.succeed()
+            self.wait_lpn_use_done = self.env.event()
+            self.wait_lpn = None
+        if self.active_lpn_count[lpn] == 1:
+            del self.active_lpn_count[lpn]
+        else:
+            self.active_lpn_count[lpn] -= 1
+
+    def reserve_cache_slot(self, src_submodule):
+        reserved, evicted_entry = self.data_cache.reserve_slot()
+        if evicted_entry is not None:
+            self.stats.inc_cache_evict()
+            self.wakeup(src_submodule, self.release_buffer, evicted_entry.clean_done_packet)
+        return reserved
+
+    def wake_cache_slot_waiter(self, src_submodule):
+        # 대기 중인 Write miss마다 슬롯을 하나씩 예약해서 깨움
+        while self.cache_slot_waiter and self.reserve_cache_slot(src_submodule):
+            self.cache_slot_waiter.popleft().succeed()
 
     def read_handler(self, packet):
         lpn = packet['nvm_transaction'].lpn
         if self.check_cache_hit(lpn):
-            cache_info = self.data_cache_list[lpn].cache_packet['nvm_transaction']
-            self.data_cache_use_count[lpn] += 1
+            cache_entry = self.data_cache.hit(lpn)
+            cache_info = cache_entry.cache_packet['nvm_transaction']
+            cache_entry.use_count += 1
             if cache_info.valid_sector_bitmap == packet['nvm_transaction'].valid_sector_bitmap:
                 packet['nvm_transaction'].buffer_ptr = cache_info.buffer_ptr
                 self.stats.inc_read_cache_hit()
@@ -154,23 +176,26 @@ class DataCacheLayer(ParallelUnit):
                 self.address_map.AML,
                 src_submodule=self.read_handler)
 
-        if lpn == self.wait_lpn:
-            self.wait_lpn_use_done.succeed()
-            self.wait_lpn_use_done = self.env.event()
-            self.wait_lpn = None
-        self.active_lpn.remove(lpn)
+        self.remove_active_lpn(lpn)
 
     def read_completion_handler(self, packet):
         lpn = packet['nvm_transaction'].lpn
-        if lpn in self.data_cache_use_count:
-            if self.data_cache_use_count[lpn] > 0:
-                self.data_cache_use_count[lpn] -= 1
-        if lpn in self.data_cache_use_count:
-            if self.data_cache_use_count[lpn] == 0 and lpn in self.wait_read_done_packet:
-                self.wakeup(
-                    self.read_completion_handler,
-                    self.done_handler,
-                    self.wait_read_done_packet[lpn])
+        if lpn in self.data_cache:
+            cache_entry = self.data_cache[lpn]
+            if cache_entry.use_count > 0:
+                cache_entry.use_count -= 1
+            if cache_entry.use_count == 0:
+                if cache_entry.stale_done_packet is not None:
+                    stale_done_packet, cache_entry.stale_done_packet = cache_entry.stale_done_packet, None
+                    self.wakeup(self.read_completion_handler, self.release_buffer, stale_done_packet)
+                if cache_entry.pending_done_packet is not None:
+                    pending_done_packet, cache_entry.pending_done_packet = cache_entry.pending_done_packet, None
+                    self.wakeup(
+                        self.read_completion_handler,
+                        self.done_handler,
+                        pending_done_packet)
+                elif cache_entry.is_clean:
+                    self.wake_cache_slot_waiter(self.read_completion_handler)
         if 'nvm_transaction_flash' in packet:
             self.wakeup(self.read_completion_handler, self.release_buffer, packet)
             self.stats.inc_read_buffer_release_done()
@@ -194,11 +219,7 @@ class DataCacheLayer(ParallelUnit):
                 yield from self.handle_write_miss(lpn, packet)
         finally:
             # 공통 처리: LPN 블록 해제 및 활성 상태 제거
-            if lpn == self.wait_lpn:
-                self.wait_lpn_use_done.succeed()
-                self.wait_lpn_use_done = self.env.event()
-                self.wait_lpn = None
-            self.active_lpn.remove(lpn)
+            self.remove_active_lpn(lpn)
 
     def handle_write_hit(self, lpn, packet):
         # 1. Hazard 플래그 설정
@@ -206,13 +227,14 @@ class DataCacheLayer(ParallelUnit):
         self.stats.inc_hazard()
 
         # 2. 비트맵 병합: 캐시된 비트맵과 현재 패킷 비트맵 통합
-        cached_bitmap = self.data_cache_list[lpn].cache_packet['nvm_transaction'].valid_sector_bitmap
+        cached_bitmap = self.data_cache.hit(lpn).cache_packet['nvm_transaction'].valid_sector_bitmap
         packet['nvm_transaction'].valid_sector_bitmap |= cached_bitmap
 
-        # 3. 캐시 업데이트: 패킷 복사 후 캐시 갱신
+        # 3. 캐시 업데이트: 패킷 복사 후 캐시 갱신, clean 엔트리가 잡고 있던 버퍼는 해제 (읽는 중이면 읽기 완료 후 해제)
         cache_packet = DCLPIF.create_cache_packet(packet)
-        self.data_cache_list[lpn].cache_packet = cache_packet
-        self.data_cache_list[lpn].is_clean = False
+        clean_done_packet = self.data_cache.set_dirty(lpn, cache_packet)
+        if clean_done_packet is not None:
+            self.wakeup(self.write_handler, self.release_buffer, clean_done_packet)
 
         # 4. 통계 업데이트
         self.stats.inc_write_cache_hit()
@@ -230,17 +252,16 @@ class DataCacheLayer(ParallelUnit):
         )
 
     def handle_write_miss(self, lpn, packet):
-        # 1. 캐시가 꽉 찼는지 확인 → 꽉 찼다면 기다림
-        if len(self.data_cache_list) == self.data_cache_slot_count:
-            yield self.receive_write_done_event
+        # 1. 슬롯 예약 (필요 시 clean 엔트리 evict) → 실패하면 슬롯이 예약될 때까지 기다림
+        if not self.reserve_cache_slot(self.write_handler):
+            slot_event = self.env.event()
+            self.cache_slot_waiter.append(slot_event)
+            yield slot_event
             self.stats.inc_wait_cache_write()
 
         # 2. 캐시 할당: 새 엔트리 생성
         cache_packet = DCLPIF.create_cache_packet(packet)
-        cache = self.CacheInfo(packet=cache_packet, clean=False)
-        self.data_cache_empty_count -= 1
-        self.data_cache_list[lpn] = cache
-        self.data_cache_use_count[lpn] = 0
+        self.data_cache.insert(lpn, cache_packet)
 
         # 3. 통계 업데이트
         self.stats.inc_send_aml()
@@ -309,14 +330,15 @@ class DataCacheLayer(ParallelUnit):
         if packet['nvm_transaction'].transaction_type == eCMDType.Flush:
             check = True
             self.flush_lpn_list[(packet['slot_id'], packet['cmd_id'])] = {}
-            for lpn in self.data_cache_list:
+            for lpn in self.data_cache.get_dirty_lpn_list():
+                buffer_ptr = self.data_cache[lpn].cache_packet['nvm_transaction'].buffer_ptr
                 for list_key in self.flush_lpn_list:
                     if lpn in self.flush_lpn_list[list_key]:
-                        if self.flush_lpn_list[list_key][lpn] == self.data_cache_list[lpn].cache_packet['nvm_transaction'].buffer_ptr:
+                        if self.flush_lpn_list[list_key][lpn] == buffer_ptr:
                             check = False
                             break
                 if check:
-                    self.flush_lpn_list[(packet['slot_id'], packet['cmd_id'])][lpn] = self.data_cache_list[lpn].cache_packet['nvm_transaction'].buffer_ptr
+                    self.flush_lpn_list[(packet['slot_id'], packet['cmd_id'])][lpn] = buffer_ptr
                 else:
                     check = True
             if len(self.flush_lpn_list[(packet['slot_id'], packet['cmd_id'])]) == 0:
@@ -369,18 +391,21 @@ class DataCacheLayer(ParallelUnit):
                                 self.address_map.NVMe,
                                 src_submodule=self.done_handler)
 
-        if lpn in self.data_cache_list:
-            cached_buffer_ptr = self.data_cache_list[lpn].cache_packet['nvm_transaction'].buffer_ptr
+        if lpn in self.data_cache:
+            cache_entry = self.data_cache[lpn]
+            cached_buffer_ptr = cache_entry.cache_packet['nvm_transaction'].buffer_ptr
             if packet['nvm_transaction'].buffer_ptr == cached_buffer_ptr:
-                if self.data_cache_use_count[lpn] != 0:
+                if cache_entry.use_count != 0:
                     # 아직 사용 중인 경우, 완료 패킷 보류
-                    self.wait_read_done_packet[lpn] = packet
+                    cache_entry.pending_done_packet = packet
+                elif self.cache_policy.keep_clean:
+                    # 읽기용으로 clean 상태로 유지, 버퍼는 evict 시 해제
+                    self.data_cache.set_clean(lpn, packet)
+                    self.wake_cache_slot_waiter(self.done_handler)
                 else:
-                    del self.data_cache_list[lpn]
-                    del self.data_cache_use_count[lpn]
+                    self.data_cache.remove(lpn)
                     # 블로킹 중인 Write 요청 해제
-                    self.receive_write_done_event.succeed()
-                    self.receive_write_done_event = self.env.event()
+                    self.wake_cache_slot_waiter(self.done_handler)
                     self.wakeup(self.done_handler, self.release_buffer, packet)
             else:
                 # 버퍼 포인터가 다른 경우 → 기존 캐시와 무관
@@ -402,10 +427,10 @@ class DataCacheLayer(ParallelUnit):
 
     def check_write_wait_need(self, packet):
         lpn = packet['nvm_transaction'].lpn
-        if lpn in self.active_lpn:
+        if lpn in self.active_lpn_count:
             self.wait_lpn = lpn
             yield self.wait_lpn_use_done
-        self.active_lpn.append(lpn)
+        self.add_active_lpn(lpn)
         if packet['nvm_transaction'].transaction_type == eCMDType.Write:
             self.wakeup(self.check_write_wait_need, self.write_handler, packet)
         elif packet['nvm_transaction'].transaction_type == eCMDType.Read:
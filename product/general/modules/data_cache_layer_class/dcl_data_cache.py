@@ -0,0 +1,167 @@
+from collections import OrderedDict
+
+
+class CacheEntry:
+    def __init__(self, cache_packet):
+        self.cache_packet = cache_packet
+        self.is_clean = False
+        self.use_count = 0
+        # NAND write done held back while the entry is still read
+        self.pending_done_packet = None
+        # NAND write done of a clean entry, its buffer is released when the entry leaves the cache
+        self.clean_done_packet = None
+        # NAND write done of a clean entry overwritten while still read, released once the reads are done
+        self.stale_done_packet = None
+        self.referenced = False
+
+
+class DataCache:
+    '''
+    LPN -> CacheEntry of the DCL with slot accounting. A write miss reserves its slot first, so a slot handed
+    to a woken waiter can not be taken by a later command. Only clean and unread entries can be evicted,
+    clean entries are kept in clean_entry_dict in the order the replacement policy evicts them, dirty LPNs in dirty_lpn_set.
+    Insert, hit, removal and eviction are O(1) (eviction skips clean entries still being read).
+    '''
+
+    def __init__(self, slot_count, policy):
+        self.slot_count = slot_count
+        self.policy = policy
+        self.entry_dict = dict()
+        self.clean_entry_dict = OrderedDict()
+        self.dirty_lpn_set = set()
+        self.reserved_count = 0
+
+    def __contains__(self, lpn):
+        return lpn in self.entry_dict
+
+    def __getitem__(self, lpn):
+        return self.entry_dict[lpn]
+
+    def __len__(self):
+        return len(self.entry_dict)
+
+    def get_dirty_lpn_list(self):
+        return list(self.dirty_lpn_set)
+
+    def reserve_slot(self):
+        '''
+        Returns (reserved, evicted entry or None).
+        '''
+        if len(self.entry_dict) + self.reserved_count < self.slot_count:
+            self.reserved_count += 1
+            return True, None
+        lpn = self.policy.select_victim(self.clean_entry_dict)
+        if lpn is None:
+            return False, None
+        self.reserved_count += 1
+        return True, self.remove(lpn)
+
+    def insert(self, lpn, cache_packet):
+        assert self.reserved_count > 0
+        self.reserved_count -= 1
+        entry = self.entry_dict[lpn] = CacheEntry(cache_packet)
+        self.dirty_lpn_set.add(lpn)
+        return entry
+
+    def hit(self, lpn):
+        entry = self.entry_dict[lpn]
+        if entry.is_clean:
+            self.policy.touch(self.clean_entry_dict, lpn, entry)
+        return entry
+
+    def set_dirty(self, lpn, cache_packet):
+        '''
+        Returns the done packet whose buffer can be released now, the buffer of an entry still read is kept
+        in stale_done_packet until the reads are done.
+        '''
+        entry = self.entry_dict[lpn]
+        entry.cache_packet = cache_packet
+        if entry.is_clean:
+            del self.clean_entry_dict[lpn]
+            entry.is_clean = False
+            self.dirty_lpn_set.add(lpn)
+        clean_done_packet, entry.clean_done_packet = entry.clean_done_packet, None
+        if clean_done_packet is not None and entry.use_count:
+            assert entry.stale_done_packet is None
+            entry.stale_done_packet = clean_done_packet
+            return None
+        return clean_done_packet
+
+    def set_clean(self, lpn, done_packet):
+        entry = self.entry_dict[lpn]
+        entry.is_clean = True
+        entry.clean_done_packet = done_packet
+        self.dirty_lpn_set.discard(lpn)
+        entry.referenced = False
+        self.clean_entry_dict[lpn] = entry
+
+    def remove(self, lpn):
+        self.clean_entry_dict.pop(lpn, None)
+        self.dirty_lpn_set.discard(lpn)
+        return self.entry_dict.pop(lpn)
+
+
+class WriteThroughPolicy:
+    '''
+    Entries leave the cache as soon as their NAND write is done, nothing is kept for reads.
+    '''
+    keep_clean = False
+
+    def touch(self, clean_entry_dict, lpn, entry):
+        pass
+
+    def select_victim(self, clean_entry_dict):
+        return None
+
+
+class FIFOPolicy:
+    '''
+    Clean entry that turned clean first.
+    '''
+    keep_clean = True
+
+    def touch(self, clean_entry_dict, lpn, entry):
+        pass
+
+    def select_victim(self, clean_entry_dict):
+        for lpn, entry in clean_entry_dict.items():
+            if not entry.use_count:
+                return lpn
+        return None
+
+
+class LRUPolicy(FIFOPolicy):
+    '''
+    Clean entry hit least recently.
+    '''
+
+    def touch(self, clean_entry_dict, lpn, entry):
+        clean_entry_dict.move_to_end(lpn)
+
+
+class CLOCKPolicy:
+    '''
+    Second chance: the hand (front of clean_entry_dict) clears the reference bit of a hit entry
+    and moves it behind, the first unreferenced and unread entry is evicted.
+    '''
+    keep_clean = True
+
+    def touch(self, clean_entry_dict, lpn, entry):
+        entry.referenced = True
+
+    def select_victim(self, clean_entry_dict):
+        for _ in range(2 * len(clean_entry_dict)):
+            lpn, entry = next(iter(clean_entry_dict.items()))
+            if not entry.use_count and not entry.referenced:
+                return lpn
+            entry.referenced = False
+            clean_entry_dict.move_to_end(lpn)
+        return None
+
+
+cache_replacement_policy_dict = {
+    'write_through': WriteThroughPolicy,
+    'fifo': FIFOPolicy,
+    'lru': LRUPolicy,
+    'clock': CLOCKPolicy,
+}
@@ -1,3 +1,4 @@
+import numpy as np
 from core.backbone.bus import Bus
 from core.framework.common import (BufferedUnitType, MemAccessInfo,
                                    QueueDepthChecker, StatusType,
@@ -6,6 +7,8 @@ from core.framework.common import (BufferedUnitType, MemAccessInfo,
 from core.modules.parallel_unit import ParallelUnit
 from product.general.config.storage_feature import Feature
 from product.general.config.storage_parameters import Parameter
+from product.general.modules.flash_block_manager_class.fbm_superblock_index import (
+    SuperblockIndex, gc_victim_policy_dict)
 from product.general.provided_interface.fbm_pif import FBMPIF
 
 
@@ -23,6 +26,7 @@ class PlainInfo:
         self.invalid_page_count = 0
         self.chip_id = 0
         self.stream_id = stream_id
+        self.superblock_index = None
         for i in range(self.block_count):
             block = BlockInfo(i)
             self.blocks.append(block)
@@ -32,9 +36,14 @@ class PlainInfo:
             else:
                 self.free_block_pool.append(block)
 
+    def set_block_status(self, block, status):
+        if self.superblock_index is not None:
+            self.superblock_index.update_status(block.block_id, block.current_status == 'data', status == 'data')
+        block.current_status = status
+
     def get_a_free_block(self, stream_id):
         if self.active_block[stream_id] != -1:
-            self.active_block[stream_id].current_status = 'data'
+            self.set_block_status(self.active_block[stream_id], 'data')
         self.active_block[stream_id] = self.free_block_pool[0]
         del self.free_block_pool[0]
 
@@ -43,7 +52,7 @@ class PlainInfo:
 
     def add_to_free_block_pool(self, block_id):
         self.free_block_pool.append(self.blocks[block_id])
-        self.blocks[block_id].current_status = 'free'
+        self.set_block_status(self.blocks[block_id], 'free')
 
 
 class BlockInfo:
@@ -112,18 +121,120 @@ class FlashBlockManager(ParallelUnit):
         self.urgent_gc_count = 0
         self.a_plane_info = [[[PlainInfo(0) for _ in range(self.plane_count)] for _ in range(
             self.way_count)] for _ in range(self.channel_count)]
-        self.remain_free_block = [0] * 32
-
-    def set_init_block(self, address):
-        plane = self.a_plane_info[address.channel][address.way][address.plane]
-        block_id = address.block
-        page = address.page
-        if block_id == plane.free_block_pool[0].block_id:
-            plane.free_block_pool[0].current_status = 'data'
-            del plane.free_block_pool[0]
-        if page not in plane.blocks[block_id].valid_page_list:
-            plane.blocks[block_id].valid_page_list[page] = 0b1111
-            plane.blocks[block_id].valid_page_count += 1
+        self.remain_free_block = [0] * (self.channel_count * self.way_count)
+        self.gc_victim_policy = gc_victim_policy_dict[self.param.GC_VICTIM_POLICY]()
+        self.superblock_index = SuperblockIndex(
+            self.env,
+            self.block_count,
+            self.channel_count * self.way_count * self.plane_count,
+            self.page_count,
+            self.gc_victim_policy.use_valid_bucket)
+        for plane in self.get_plane_list():
+            plane.superblock_index = self.superblock_index
+
+    def set_init_block_bulk(self, layout):
+        if not len(layout):
+            return
+
+        plane_list = self.get_plane_list()
+        plane_id = layout.get_plane_id(self.way_count, self.plane_count)
+
+        # free block pool head is taken when a plane visits it, replay it once per run of the same block
+        free_block_pool_id = np.full((len(plane_list), self.block_count + 1), -1, dtype=np.int64)
+        for plane_index, plane in enumerate(plane_list):
+            free_block_pool_id[plane_index, :len(plane.free_block_pool)] = [
+                block.block_id for block in plane.free_block_pool]
+        all_plane = np.arange(len(plane_list))
+        free_block_taken = np.zeros(len(plane_list), dtype=np.int64)
+        run_start = np.concatenate(([0], np.flatnonzero(np.diff(layout.block)) + 1, [len(layout)]))
+        for start, end in zip(run_start[:-1].tolist(), run_start[1:].tolist()):
+            taken = free_block_pool_id[all_plane, free_block_taken] == layout.block[start]
+            if end - start < len(plane_list):
+                visited = np.zeros(len(plane_list), dtype=bool)
+                visited[plane_id[start:end]] = True
+                taken &= visited
+            free_block_taken += taken
+
+        for plane, taken_count in zip(plane_list, free_block_taken.tolist()):
+            for block in plane.free_block_pool[:taken_count]:
+                block.current_status = 'data'
+            del plane.free_block_pool[:taken_count]
+
+        # valid pages are kept in the order they were first written
+        page_stride = self.page_count + 1
+        key = (plane_id * (self.block_count + 1) + layout.block) * page_stride + layout.page
+        _, first_visit = np.unique(key, return_index=True)
+        first_visit.sort()
+        block_key = plane_id[first_visit] * (self.block_count + 1) + layout.block[first_visit]
+        order = np.argsort(block_key, kind='stable')
+        block_key = block_key[order]
+        page = layout.page[first_visit][order]
+        group_start = np.concatenate(([0], np.flatnonzero(np.diff(block_key)) + 1, [len(block_key)]))
+        for start, end in zip(group_start[:-1].tolist(), group_start[1:].tolist()):
+            plane_index, block_id = divmod(int(block_key[start]), self.block_count + 1)
+            block = plane_list[plane_index].blocks[block_id]
+            if not block.valid_page_list:
+                block.valid_page_list.update(dict.fromkeys(page[start:end].tolist(), 0b1111))
+                block.valid_page_count += end - start
+                continue
+            for page_id in page[start:end].tolist():
+                if page_id not in block.valid_page_list:
+                    block.valid_page_list[page_id] = 0b1111
+                    block.valid_page_count += 1
+        self.superblock_index.rebuild(plane_list)
+
+    def get_plane_list(self):
+        return [plane for way_list in self.a_plane_info for plane_list in way_list for plane in plane_list]
+
+    def get_precondition_state(self):
+        plane_list = self.get_plane_list()
+        block_list = [block for plane in plane_list for block in plane.blocks]
+        valid_page_count = [len(block.valid_page_list) for block in block_list]
+        free_block_count = [len(plane.free_block_pool) for plane in plane_list]
+        return {
+            'block_status': np.array([block.current_status for block in block_list]),
+            'block_erase_count': np.array([block.erase_count for block in block_list], dtype=np.int64),
+            'block_page_write_id': np.array([block.current_page_write_id for block in block_list], dtype=np.int64),
+            'block_valid_page_count': np.array([block.valid_page_count for block in block_list], dtype=np.int64),
+            'valid_page_offset': np.concatenate(([0], np.cumsum(valid_page_count, dtype=np.int64))),
+            'valid_page': np.fromiter((page for block in block_list for page in block.valid_page_list),
+                                      dtype=np.int64, count=sum(valid_page_count)),
+            'valid_page_bitmap': np.fromiter((bitmap for block in block_list for bitmap in block.valid_page_list.values()),
+                                             dtype=np.int64, count=sum(valid_page_count)),
+            'free_block_offset': np.concatenate(([0], np.cumsum(free_block_count, dtype=np.int64))),
+            'free_block': np.fromiter((block.block_id for plane in plane_list for block in plane.free_block_pool),
+                                      dtype=np.int64, count=sum(free_block_count)),
+            'active_block': np.array([[-1 if block == -1 else block.block_id for block in plane.active_block]
+                                      for plane in plane_list], dtype=np.int64),
+        }
+
+    def set_precondition_state(self, state):
+        plane_list = self.get_plane_list()
+        block_list = [block for plane in plane_list for block in plane.blocks]
+        valid_page_offset = state['valid_page_offset'].tolist()
+        valid_page = state['valid_page'].tolist()
+        valid_page_bitmap = state['valid_page_bitmap'].tolist()
+        for block_index, (block, status, erase_count, page_write_id, valid_page_count) in enumerate(zip(
+                block_list,
+                state['block_status'].tolist(),
+                state['block_erase_count'].tolist(),
+                state['block_page_write_id'].tolist(),
+                state['block_valid_page_count'].tolist())):
+            block.current_status = status
+            block.erase_count = erase_count
+            block.current_page_write_id = page_write_id
+            block.valid_page_count = valid_page_count
+            start, end = valid_page_offset[block_index], valid_page_offset[block_index + 1]
+            block.valid_page_list = dict(zip(valid_page[start:end], valid_page_bitmap[start:end]))
+
+        free_block_offset = state['free_block_offset'].tolist()
+        free_block = state['free_block'].tolist()
+        for plane_index, plane in enumerate(plane_list):
+            start, end = free_block_offset[plane_index], free_block_offset[plane_index + 1]
+            plane.free_block_pool[:] = [plane.blocks[block_id] for block_id in free_block[start:end]]
+            plane.active_block[:] = [-1 if block_id == -1 else plane.blocks[block_id]
+                                     for block_id in state['active_block'][plane_index].tolist()]
+        self.superblock_index.rebuild(plane_list)
 
     def page_release_handler(self, packet):
         address = packet['nvm_transaction_flash'].address
@@ -134,6 +245,7 @@ class FlashBlockManager(ParallelUnit):
             if plane.blocks[address.block].valid_page_list[address.page] == 0b0000:
                 del plane.blocks[address.block].valid_page_list[address.page]
                 plane.blocks[address.block].valid_page_count -= 1
+                self.superblock_index.add_valid(address.block, -1)
         self.send_sq(
             packet,
             self.address,
@@ -149,10 +261,13 @@ class FlashBlockManager(ParallelUnit):
                     if len(plane.free_block_pool) == 0:
                         yield self.wait_free_block_event[chip_id]
                     plane.get_a_free_block(stream_id)
-                    plane.active_block[stream_id].current_status = 'active'
-                    plane.active_block[stream_id].erase_count += 1
-                    plane.active_block[stream_id].current_page_write_id = 0
-                    plane.active_block[stream_id].valid_page_count = 0
+                    active_block = plane.active_block[stream_id]
+                    plane.set_block_status(active_block, 'active')
+                    active_block.erase_count += 1
+                    self.superblock_index.add_erase(active_block.block_id, 1)
+                    active_block.current_page_write_id = 0
+                    self.superblock_index.add_valid(active_block.block_id, -active_block.valid_page_count)
+                    active_block.valid_page_count = 0
                     plane.active_block[stream_id].valid_page_list.clear()
                 erase_packet = FBMPIF.create_erase_packet(
                     channel=ch,
@@ -180,6 +295,7 @@ class FlashBlockManager(ParallelUnit):
         packet['nvm_transaction_flash'].address.block = plane.active_block[stream].block_id
         plane.active_block[stream].current_page_write_id += 1
         plane.active_block[stream].valid_page_count += 1
+        self.superblock_index.add_valid(plane.active_block[stream].block_id, 1)
         plane.active_block[stream].valid_page_list[packet['nvm_transaction_flash'].address.page] = 0b1111
 
     def check_gc_required(self, packet):
@@ -240,33 +356,17 @@ class FlashBlockManager(ParallelUnit):
         return total
 
     def get_src_block(self, stream_id):
-
-        min_erase_cnt = self.max_erase_count * self.plane_count * 2
-        min_valid_page = self.page_count ** 3
-        src_block_id = None
-        for block_id in range(self.block_count):
-            total_valid = 0
-            total_erase = 0
-            for ch in range(self.channel_count):
-                for way in range(self.way_count):
-                    for plane in self.a_plane_info[ch][way]:
-                        if plane.blocks[block_id].current_status != 'data':
-                            total_valid += self.page_count ** 3
-                        total_valid += plane.blocks[block_id].valid_page_count
-                        total_erase += plane.blocks[block_id].erase_count
-
-            if total_valid <= min_valid_page and total_erase <= min_erase_cnt:
-                min_valid_page = total_valid
-                min_erase_cnt = total_erase
-                src_block_id = block_id
-        return src_block_id, min_valid_page
+        return self.gc_victim_policy.select(
+            self.superblock_index,
+            self.page_count ** 3,
+            self.max_erase_count * self.plane_count * 2)
 
     def check_urgent_gc_required(self, src_block):
         check_urgent = False
         for ch in range(self.channel_count):
             for way in range(self.way_count):
                 for plane in self.a_plane_info[ch][way]:
-                    plane.blocks[src_block].current_status = 'gc'
+                    plane.set_block_status(plane.blocks[src_block], 'gc')
                     if self.get_total_free_block_size() / self.block_count / self.plane_count / self.way_count / self.channel_count <= self.urgent_gc_threshold:
                         check_urgent = True
         if check_urgent:
@@ -0,0 +1,157 @@
+import numpy as np
+
+
+class SuperblockIndex:
+    '''
+    Valid page count, erase count and non-data plane count of every superblock (one block id on every plane),
+    kept in numpy arrays updated in place by the FBM as blocks change so that victim selection does not rescan every plane.
+    With use_valid_bucket, superblocks whose blocks are all 'data' are also kept in a bucket queue keyed by valid page count.
+    '''
+
+    def __init__(self, env, block_count, plane_count, page_count, use_valid_bucket=False):
+        self.env = env
+        self.block_count = block_count
+        self.plane_count = plane_count
+        self.page_count = page_count
+        self.not_data_penalty = page_count ** 3
+        self.use_valid_bucket = use_valid_bucket
+        self.reset()
+
+    def reset(self):
+        self.valid_count = np.zeros(self.block_count, dtype=np.int64)
+        self.erase_count = np.zeros(self.block_count, dtype=np.int64)
+        self.not_data_count = np.full(self.block_count, self.plane_count, dtype=np.int64)
+        self.valid_score = self.not_data_count * self.not_data_penalty
+        self.seal_time = np.zeros(self.block_count, dtype=np.float64)
+        self.valid_bucket = [set() for _ in range(self.plane_count * self.page_count + 1)] if self.use_valid_bucket else None
+        self.min_valid_bucket = self.plane_count * self.page_count + 1
+
+    def rebuild(self, plane_list):
+        self.reset()
+        for plane in plane_list:
+            for block in plane.blocks:
+                self.valid_count[block.block_id] += block.valid_page_count
+                self.erase_count[block.block_id] += block.erase_count
+                self.not_data_count[block.block_id] -= block.current_status == 'data'
+        self.valid_score = self.valid_count + self.not_data_count * self.not_data_penalty
+        if self.use_valid_bucket:
+            for block_id in np.flatnonzero(self.not_data_count == 0).tolist():
+                self.push_bucket(block_id)
+
+    def push_bucket(self, block_id):
+        valid_count = int(self.valid_count[block_id])
+        self.valid_bucket[valid_count].add(block_id)
+        if valid_count < self.min_valid_bucket:
+            self.min_valid_bucket = valid_count
+
+    def pop_bucket(self, block_id):
+        self.valid_bucket[self.valid_count[block_id]].remove(block_id)
+
+    def add_valid(self, block_id, delta):
+        if self.use_valid_bucket and not self.not_data_count[block_id]:
+            self.pop_bucket(block_id)
+            self.valid_count[block_id] += delta
+            self.push_bucket(block_id)
+        else:
+            self.valid_count[block_id] += delta
+        self.valid_score[block_id] += delta
+
+    def add_erase(self, block_id, delta):
+        self.erase_count[block_id] += delta
+
+    def update_status(self, block_id, was_data, is_data):
+        if was_data == is_data:
+            return
+        if is_data:
+            self.not_data_count[block_id] -= 1
+            self.valid_score[block_id] -= self.not_data_penalty
+            if not self.not_data_count[block_id]:
+                self.seal_time[block_id] = self.env.now
+                if self.use_valid_bucket:
+                    self.push_bucket(block_id)
+        else:
+            if self.use_valid_bucket and not self.not_data_count[block_id]:
+                self.pop_bucket(block_id)
+            self.not_data_count[block_id] += 1
+            self.valid_score[block_id] += self.not_data_penalty
+
+    def get_min_valid_bucket(self):
+        while self.min_valid_bucket < len(self.valid_bucket) and not self.valid_bucket[self.min_valid_bucket]:
+            self.min_valid_bucket += 1
+        if self.min_valid_bucket == len(self.valid_bucket):
+            return None
+        return self.valid_bucket[self.min_valid_bucket]
+
+    def get_valid_score(self):
+        return self.valid_score
+
+    def get_data_block_list(self):
+        return np.flatnonzero(self.not_data_count == 0)
+
+
+class LegacyVictimPolicy:
+    '''
+    Same victim as the former scan over every block id: walking the ids in order, a block is taken whenever
+    its valid score and erase count are both not above the last taken one. Runs of equal blocks are skipped
+    in one step, so only strictly better candidates cost a pass over the index.
+    '''
+    use_valid_bucket = False
+
+    def select(self, index: SuperblockIndex, max_valid, max_erase):
+        valid = index.get_valid_score()
+        erase = index.erase_count
+        block_id = None
+        start = 0
+        while True:
+            candidate = np.flatnonzero((valid[start:] <= max_valid) & (erase[start:] <= max_erase)) + start
+            if block_id is not None:
+                better = candidate[(valid[candidate] < max_valid) | (erase[candidate] < max_erase)]
+                if not len(better):
+                    if len(candidate):
+                        block_id = int(candidate[-1])
+                    break
+                candidate = better
+            if not len(candidate):
+                break
+            block_id = int(candidate[0])
+            max_valid, max_erase = int(valid[block_id]), int(erase[block_id])
+            start = block_id + 1
+        return block_id, max_valid
+
+
+class GreedyVictimPolicy:
+    '''
+    Data superblock with the fewest valid pages, ties broken by erase count and block id.
+    '''
+    use_valid_bucket = True
+
+    def select(self, index: SuperblockIndex, max_valid, max_erase):
+        bucket = index.get_min_valid_bucket()
+        if bucket is None:
+            return None, max_valid
+        block_id = min(bucket, key=lambda block_id: (index.erase_count[block_id], block_id))
+        return block_id, int(index.valid_count[block_id])
+
+
+class CostBenefitVictimPolicy:
+    '''
+    Data superblock with the highest (1 - u) * age / (1 + u), u being the valid page ratio
+    and age the time since its last block turned into 'data'.
+    '''
+    use_valid_bucket = False
+
+    def select(self, index: SuperblockIndex, max_valid, max_erase):
+        data_block_list = index.get_data_block_list()
+        if not len(data_block_list):
+            return None, max_valid
+        utilization = index.valid_count[data_block_list] / (index.plane_count * index.page_count)
+        age = index.env.now - index.seal_time[data_block_list] + 1
+        block_id = int(data_block_list[np.argmax((1 - utilization) * age / (1 + utilization))])
+        return block_id, int(index.valid_count[block_id])
+
+
+gc_victim_policy_dict = {
+    'legacy': LegacyVictimPolicy,
+    'greedy': GreedyVictimPolicy,
+    'cost_benefit': CostBenefitVictimPolicy,
+}
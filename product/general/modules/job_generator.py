@@ -7,6 +7,8 @@ from core.framework.common import (BufferedUnitType, MemAccessInfo,
                                    TransactionSourceType, eCMDType,
                                    eResourceType)
 from core.framework.media_common import *
+from core.framework.sector_bitmap import (make_sector_bitmap,
+                                          sector_bitmap_to_tuple)
 from core.modules.parallel_unit import ParallelUnit
 from product.general.framework.ppn_translator import PhysicalInfo
 from product.general.framework.storage_vcd_variables import VCDVariables
@@ -89,8 +91,7 @@ class BufferedUnit:
     def add(self, data, offset):
         self.nand_packet['host_packets'][offset] = data
         self.nand_packet['valid_page_bitmap'][offset] = 1
-        # temp>> to be fixed
-        self.nand_packet['valid_sector_bitmap'][offset] = self.int_to_list(data['nvm_transaction']['valid_sector_bitmap'])
+        self.nand_packet['valid_sector_bitmap'][offset] = data['nvm_transaction']['valid_sector_bitmap']
         self.nand_packet['slot_id_list'][offset] = data['slot_id']
         self.nand_packet['lpn_list'][offset] = data['nvm_transaction']['lpn']
         self.nand_packet['ppn_list'][offset] = data['nvm_transaction_flash']['ppn']
@@ -104,12 +105,6 @@ class BufferedUnit:
         self.nand_packet = {}
         self.buffered_nvm_trans_count = 0
 
-    # temp
-    def int_to_list(self, n, size=8):
-        if not (0 <= n < 2 ** size):
-            raise ValueError(f"Input must be between 0 and {2 ** size - 1}")
-        return [(n >> i) & 1 for i in reversed(range(size))]
-
 
 class SeqReadBufferedUnit(BufferedUnit):
     def __init__(self, param, stats, id):
@@ -753,7 +748,7 @@ class JobGenerator(ParallelUnit):
                         packet,
                         plane,
                         meta,
-                        valid_sector_bitmap[plane]))
+                        sector_bitmap_to_tuple(valid_sector_bitmap[plane], self.param.MAPUNIT_PER_PLANE)))
 
         dout_cmd_list[0]['dfirst'] = True
         dout_cmd_list[-1]['dlast'] = True
@@ -1115,13 +1110,13 @@ class JobGenerator(ParallelUnit):
 
         nand_packet['valid_page_bitmap'][idx_in_pgm_unit_by_gaudi_map_unit] = int(
             packet is not None)
-        nand_packet['valid_sector_bitmap'][idx_in_pgm_unit_by_gaudi_map_unit] = [
-            1] * self.param.SECTOR_PER_GAUDI_MAP_UNIT
+        nand_packet['valid_sector_bitmap'][idx_in_pgm_unit_by_gaudi_map_unit] = make_sector_bitmap(
+            0, self.param.SECTOR_PER_GAUDI_MAP_UNIT)
 
         if packet and packet.get(
                 'by_hcore') and packet['hcore_cmd_type'] == 'write_uncor':
-            nand_packet['faked_uncor_sbitmap'][idx_in_pgm_unit_by_gaudi_map_unit] = [
-                1] * self.param.SECTOR_PER_GAUDI_MAP_UNIT
+            nand_packet['faked_uncor_sbitmap'][idx_in_pgm_unit_by_gaudi_map_unit] = make_sector_bitmap(
+                0, self.param.SECTOR_PER_GAUDI_MAP_UNIT)
         # except IndexError:
         #     breakpoint()
 
@@ -1199,10 +1194,8 @@ class JobGenerator(ParallelUnit):
             self.param.PLANE * self.param.FTL_MAP_UNIT_PER_PLANE
         program_g_unit_count = program_nvm_trans_count
         nand_packet['valid_page_bitmap'] = [0] * program_g_unit_count
-        nand_packet['valid_sector_bitmap'] = [[0 for _ in range(
-            self.param.SECTOR_PER_GAUDI_MAP_UNIT)] for _ in range(program_g_unit_count)]
-        nand_packet['faked_uncor_sbitmap'] = [[0 for _ in range(
-            self.param.SECTOR_PER_GAUDI_MAP_UNIT)] for _ in range(program_g_unit_count)]
+        nand_packet['valid_sector_bitmap'] = [0] * program_g_unit_count
+        nand_packet['faked_uncor_sbitmap'] = [0] * program_g_unit_count
         nand_packet['slot_id_list'] = [-1] * program_g_unit_count
         nand_packet['host_packets'] = [{} for _ in range(program_g_unit_count)]
         nand_packet['lpn_list'] = [-1] * program_g_unit_count
@@ -157,7 +157,7 @@ class JobScheduler(ParallelUnit):
                     break
 
     def insert_task(self, queue_data, channel):
-        self.queue_facade.add(queue_data)
+        self.scheduling_context.add_task(queue_data)
         self.scheduling_context.wakeup(channel)
         if self.param.GENERATE_SUBMODULE_DIAGRAM:
             self.record_packet_transfer_to_diagram(
@@ -0,0 +1,86 @@
+from heapq import heapify, heappop, heappush
+
+from product.general.modules.job_scheduler_class.js_nand_config import \
+    NANDConfig
+
+
+class ReadyTaskSet:
+    '''
+    NAND ready queue-head jobs of every way. A way is evaluated again only after a state change marked it dirty,
+    a volatile way (its readiness depends on the current time) is evaluated on every selection.
+    Ready jobs of a channel sit in a heap of (time_stamp, way, index, version, data),
+    entries of an older evaluation of the way are dropped lazily.
+    '''
+    HEAP_COMPACT_MARGIN = 64
+
+    def __init__(self, nand_config: NANDConfig):
+        all_way_mask = (1 << nand_config.way_count) - 1
+        self.dirty_way_mask = [all_way_mask for _ in range(nand_config.channel_count)]
+        self.volatile_way_mask = [0 for _ in range(nand_config.channel_count)]
+        self.way_version = [[0 for _ in range(nand_config.way_count)]
+                            for _ in range(nand_config.channel_count)]
+        self.ready_task_list = [[[] for _ in range(nand_config.way_count)]
+                                for _ in range(nand_config.channel_count)]
+        self.ready_task_count = [0 for _ in range(nand_config.channel_count)]
+        self.ready_heap = [[] for _ in range(nand_config.channel_count)]
+
+    def mark_dirty(self, ch, way):
+        self.dirty_way_mask[ch] |= 1 << way
+
+    def pop_dirty_way_list(self, ch):
+        way_mask = self.dirty_way_mask[ch] | self.volatile_way_mask[ch]
+        self.dirty_way_mask[ch] = 0
+        way_list = []
+        while way_mask:
+            low_bit = way_mask & -way_mask
+            way_list.append(low_bit.bit_length() - 1)
+            way_mask ^= low_bit
+        return way_list
+
+    def get_ready_task_list(self, ch, way):
+        return self.ready_task_list[ch][way]
+
+    def update(self, ch, way, task_list, is_volatile):
+        version = self.way_version[ch][way] + 1
+        self.way_version[ch][way] = version
+        self.ready_task_count[ch] += len(task_list) - len(self.ready_task_list[ch][way])
+        self.ready_task_list[ch][way] = task_list
+        if is_volatile:
+            self.volatile_way_mask[ch] |= 1 << way
+        else:
+            self.volatile_way_mask[ch] &= ~(1 << way)
+
+        heap = self.ready_heap[ch]
+        for idx, data in enumerate(task_list):
+            heappush(heap, (data['time_stamp'], way, idx, version, data))
+        if len(heap) > 2 * self.ready_task_count[ch] + self.HEAP_COMPACT_MARGIN:
+            self.compact(ch)
+
+    def compact(self, ch):
+        way_version = self.way_version[ch]
+        heap = [entry for entry in self.ready_heap[ch] if entry[3] == way_version[entry[1]]]
+        heapify(heap)
+        self.ready_heap[ch] = heap
+
+    def select_oldest(self, ch, is_available):
+        '''
+        Oldest ready job passing is_available. A time_stamp tie goes to the lower way and then to the
+        earlier queue of the way, the same order as a scan over all ways.
+        '''
+        heap = self.ready_heap[ch]
+        way_version = self.way_version[ch]
+        skipped_entry_list = []
+        data = None
+        while heap:
+            entry = heap[0]
+            if entry[3] != way_version[entry[1]]:
+                heappop(heap)
+                continue
+            if is_available(entry[4]):
+                data = entry[4]
+                break
+            skipped_entry_list.append(heappop(heap))
+
+        for entry in skipped_entry_list:
+            heappush(heap, entry)
+        return data
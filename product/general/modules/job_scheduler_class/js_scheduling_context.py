@@ -17,6 +17,8 @@ from product.general.modules.job_scheduler_class.js_queue import (QFacade,
                                                                   SchedulerQ)
 from product.general.modules.job_scheduler_class.js_queue_selecter import \
     QueueSelecter
+from product.general.modules.job_scheduler_class.js_ready_task_set import \
+    ReadyTaskSet
 from product.general.modules.job_scheduler_class.js_starvation_manager import \
     StarvationManager
 from product.general.modules.job_scheduler_class.js_way_preemption_handler import \
@@ -60,6 +62,7 @@ class JSSchedulingContext:
         self.trrc_manager = tRRCManager(nand_config)
         self.way_preemption_handler = WayPreemptionHandler(
             nand_config, vcd_manager, self.busy_checker)
+        self.ready_task_set = ReadyTaskSet(nand_config)
         self.scheduling_event = [self.env.event()
                                  for _ in range(self.param.CHANNEL)]
         if self.param.ENABLE_NAND_SUSPEND:
@@ -71,11 +74,17 @@ class JSSchedulingContext:
             self.din_cmd_ready: callable = self.din_cmd_ready_wo_suspend
             self.erase_cmd_ready: callable = self.erase_cmd_ready_wo_suspend
 
+    def add_task(self, data):
+        self.q_facade.add(data)
+        self.ready_task_set.mark_dirty(data['channel'], data['way'])
+
     def start_tRRC(self, ch, way, plane):
         self.trrc_manager.update_bitmap(ch, way, plane, True)
+        self.ready_task_set.mark_dirty(ch, way)
 
     def end_tRRC(self, ch, way, plane):
         self.trrc_manager.update_bitmap(ch, way, plane, False)
+        self.ready_task_set.mark_dirty(ch, way)
 
     def wakeup(self, channel):
         self.scheduling_event[channel].succeed()
@@ -175,47 +184,39 @@ class JSSchedulingContext:
 
         return not nand_busy_state and not latch_busy_state
 
-    def select_nand_ready_task(self, ch):
+    def select_nand_ready_task(self, ch, way):
         candidate_list = []
-        for way in range(self.param.WAY):
-            curQ_list: List[SchedulerQ] = self.queue_selecter.select_queue(
-                ch, way)
-            if not curQ_list:
+        is_volatile = False
+        curQ_list: List[SchedulerQ] = self.queue_selecter.select_queue(ch, way)
+        if not curQ_list:
+            return candidate_list, is_volatile
+
+        for curQ in curQ_list:
+            try:
+                data = curQ.get_front()
+            except IndexError:
                 continue
 
-            for curQ in curQ_list:
-                try:
-                    data = curQ.get_front()
-                except IndexError:
-                    continue
-
-                nand_busy_state = self.busy_checker.get_busy_state(data)
-                latch_busy_state = self.busy_checker.get_busy_state(data, True)
+            nand_busy_state = self.busy_checker.get_busy_state(data)
+            latch_busy_state = self.busy_checker.get_busy_state(data, True)
 
-                if self.is_nand_ready(
-                        data, nand_busy_state, latch_busy_state, curQ):
-                    candidate_list.append(data)
+            if self.is_nand_ready(
+                    data, nand_busy_state, latch_busy_state, curQ):
+                candidate_list.append(data)
+            # suspend 가능 여부는 현재 시간에 따라 바뀜
+            if self.param.ENABLE_NAND_SUSPEND and is_tr_cmd(data['nand_cmd_type']):
+                is_volatile = True
 
-        return candidate_list
+        return candidate_list, is_volatile
 
-    def ask_channel_arbiter(self, prev_candidate_list):
-        candidate_list = []
-        for candidate in prev_candidate_list:
-            nand_cmd_type = candidate['nand_cmd_type']
-            ch = candidate['channel']
-            if is_data_cmd(nand_cmd_type) and not self.channel_arbiter.ask_available(
-                    ch, candidate['buffered_unit_id']):
-                continue
+    def update_ready_task_set(self, ch):
+        for way in self.ready_task_set.pop_dirty_way_list(ch):
+            candidate_list, is_volatile = self.select_nand_ready_task(ch, way)
+            self.ready_task_set.update(ch, way, candidate_list, is_volatile)
 
-            candidate_list.append(candidate)
-        return candidate_list
-
-    def select_old_task(self, candidate_list):
-        data = candidate_list[0]
-        for candidate in candidate_list[1:]:
-            if candidate['time_stamp'] < data['time_stamp']:
-                data = candidate
-        return data
+    def ask_channel_arbiter(self, candidate):
+        return not is_data_cmd(candidate['nand_cmd_type']) or self.channel_arbiter.ask_available(
+            candidate['channel'], candidate['buffered_unit_id'])
 
     def delete_duplicated_suspend(self,
                                   data: dict[Any],
@@ -232,15 +233,11 @@ class JSSchedulingContext:
             data['nand_cmd_type']) and data['cache_read_ctxt'].is_cache_read
 
     def select_task(self, ch):
-        candidate_list = self.select_nand_ready_task(ch)
-        if not candidate_list:
-            return None
-
-        candidate_list = self.ask_channel_arbiter(candidate_list)
-        if not candidate_list:
+        self.update_ready_task_set(ch)
+        data = self.ready_task_set.select_oldest(ch, self.ask_channel_arbiter)
+        if data is None:
             return None
 
-        data = self.select_old_task(candidate_list)
         nand_cmd_type: NANDCMDType = data['nand_cmd_type']
 
         skip_starvation_update = False
@@ -250,6 +247,8 @@ class JSSchedulingContext:
                 ch, way)
             skip_starvation_update = is_suspended_way
             if data.get('suspend_read', False):
+                candidate_list = [candidate for candidate in self.ready_task_set.get_ready_task_list(ch, way)
+                                  if self.ask_channel_arbiter(candidate)]
                 self.delete_duplicated_suspend(data, candidate_list)
                 self.way_preemption_handler.set_suspended_state(ch, way)
                 skip_starvation_update = True
@@ -274,6 +273,7 @@ class JSSchedulingContext:
         self.busy_checker.set_nand_busy(data, is_data_cmd(nand_cmd_type))
         self.starvation_manager.update_starvation_state(
             data, skip_starvation_update)
+        self.ready_task_set.mark_dirty(ch, data['way'])
         return data
 
     def done(self, data):
@@ -299,10 +299,12 @@ class JSSchedulingContext:
             self.busy_checker.set_nand_ready(data, is_data_cmd(nand_cmd_type))
 
         self.cache_controller.done(data)
+        self.ready_task_set.mark_dirty(ch, way)
         self.wakeup(data['channel'])
 
     def handle_suspend_done(self, data: dict[Any], nand_job_id_allocator) -> bool:
         ch, way = data['channel'], data['way']
+        self.ready_task_set.mark_dirty(ch, way)
         if self.way_preemption_handler.is_suspend_miss(ch, way):
             self.way_preemption_handler.set_way_state_to_read(data, False)
             return None
@@ -320,3 +322,4 @@ class JSSchedulingContext:
         self.way_preemption_handler.set_suspend_start_time(
             ch, way, self.env.now)
         self.way_preemption_handler.increase_suspend_count(ch, way)
+        self.ready_task_set.mark_dirty(ch, way)
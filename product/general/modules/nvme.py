@@ -3,6 +3,7 @@ from enum import Enum, auto
 
 from core.framework.common import (CMD_PATH_FIFO_ID, TransactionSourceType,
                                    eCacheResultType, eCMDType, eResourceType)
+from core.framework.sector_bitmap import make_sector_bitmap
 from core.modules.parallel_unit import ParallelUnit
 from product.general.modules.nvm_transaction_class.nvm_transaction import \
     NVMTransaction
@@ -409,8 +410,7 @@ class NVMe(ParallelUnit):
 
         packet['desc_id'] = desc_id_list
         sector_offset, sector_count, remnent = self.get_sector_count(packet)
-        packet['valid_sector_bitmap'] = (
-            [0] * sector_offset) + ([1] * sector_count) + ([0] * remnent)
+        packet['valid_sector_bitmap'] = make_sector_bitmap(sector_offset, sector_count)
         packet['is_last_dma'] = True if packet['start_g_lpn'] == packet['end_g_lpn'] else False
         packet['is_valid'] = True
         packet['is_first_dma'] = True
@@ -486,8 +486,7 @@ class NVMe(ParallelUnit):
                 packet['start_lba'] = g_lpn * \
                     self.param.SECTOR_PER_GAUDI_MAP_UNIT
                 packet['lba_size'] -= sector_count
-                packet['valid_sector_bitmap'] = (
-                    [0] * sector_offset) + ([1] * sector_count) + ([0] * remnent)
+                packet['valid_sector_bitmap'] = make_sector_bitmap(sector_offset, sector_count)
                 packet['sector_count'] = sector_count
 
                 # The last FTL MapUnit in one LogicalMapUnit
@@ -583,7 +582,7 @@ class NVMe(ParallelUnit):
             send_packet = dcl_pif.FlushSQ(packet, self.address)
             send_packet['deac'] = packet.get('deac', 0)
             send_packet['lpn'] = -1
-            send_packet['valid_sector_bitmap'] = [1, 1, 1, 1, 1, 1, 1, 1]
+            send_packet['valid_sector_bitmap'] = make_sector_bitmap(0, self.param.SECTOR_PER_GAUDI_MAP_UNIT)
         else:
             assert 0, f' {packet["cmd_type"]} is invalid'
 
@@ -596,9 +595,6 @@ class NVMe(ParallelUnit):
             src_submodule=self.data_cache_layer_request_arbiter,
             dst_fifo_id=CMD_PATH_FIFO_ID.eDown.value)
 
-    def binary_list_to_int(self, bits):
-        return int(''.join(map(str, bits)), 2)
-
     def generate_dcl_packet(self, packet):
         if packet['cmd_type'] == eCMDType.Write:
             transaction_type = eCMDType.Write
@@ -619,8 +615,7 @@ class NVMe(ParallelUnit):
                 TransactionSourceType.UserIO,
                 transaction_type,
                 packet['lpn'],
-                self.binary_list_to_int(
-                    packet['valid_sector_bitmap']),
+                packet['valid_sector_bitmap'],
                 buffer_ptr)
             packet['nvm_transaction'] = nvm_transaction
 
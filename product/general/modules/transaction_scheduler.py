@@ -5,6 +5,8 @@ from core.framework.common import (BufferedUnitType, MemAccessInfo,
 from core.modules.parallel_unit import ParallelUnit
 from product.general.modules.nvm_transaction_class.nvm_transaction import (
     AddressID, NvmTransactionFlash)
+from product.general.modules.transaction_scheduler_class.tsu_request_queue import (
+    RequestPriority, TSURequestQueue)
 
 
 class TransactionScheduler(ParallelUnit):
@@ -25,16 +27,31 @@ class TransactionScheduler(ParallelUnit):
         self.generate_submodule(self.done_handler, self.feature.TSU_DONE)
 
         self.state_urgent = 0
-        self.write_request = []
-        self.read_request = []
-        self.erase_request = []
-        self.gc_write_request = []
-        self.gc_read_request = []
+        self.request_queue = TSURequestQueue()
         self.user = 0
         self.gc = 0
 
         self.receive_call_back_event = self.env.event()
 
+    def get_priority(self, packet):
+        transaction_type = packet['nvm_transaction'].transaction_type
+        if packet['nvm_transaction'].transaction_source_type == TransactionSourceType.UserIO:
+            if transaction_type == eCMDType.Read:
+                return RequestPriority.UserRead
+            elif transaction_type == eCMDType.Write:
+                return RequestPriority.UserWrite
+            elif transaction_type == eCMDType.Flush:
+                # 앞서 들어온 Write가 모두 나간 뒤에 전달
+                return RequestPriority.Flush
+            elif transaction_type == eCMDType.Erase:
+                return RequestPriority.Erase
+        else:
+            if transaction_type == eCMDType.Read:
+                return RequestPriority.GCRead
+            elif transaction_type == eCMDType.Write:
+                return RequestPriority.GCWrite
+        return None
+
     def schedule_handler(self, packet):
 
         if packet['nvm_transaction'].transaction_source_type == TransactionSourceType.UserIO:
@@ -44,61 +61,38 @@ class TransactionScheduler(ParallelUnit):
         else:
             assert False
 
-        if packet['nvm_transaction'].transaction_source_type == TransactionSourceType.UserIO:
-            if packet['nvm_transaction'].transaction_type == eCMDType.Read:
-                self.read_request.append(packet)
+        priority = self.get_priority(packet)
+        if priority is not None:
+            self.request_queue.push(priority, packet)
 
-            elif packet['nvm_transaction'].transaction_type == eCMDType.Write or packet['nvm_transaction'].transaction_type == eCMDType.Flush:
-                self.write_request.append(packet)
+        for priority in RequestPriority:
+            if self.state_urgent != 0 and priority in (RequestPriority.UserRead, RequestPriority.UserWrite, RequestPriority.Flush):
+                continue
+            while self.request_queue.has_request(priority):
+                self.issue_request(priority, self.request_queue.pop(priority))
 
-            elif packet['nvm_transaction'].transaction_type == eCMDType.Erase:
-                self.erase_request.append(packet)
-        else:
-            if packet['nvm_transaction'].transaction_type == eCMDType.Read:
-                self.gc_read_request.append(packet)
-            elif packet['nvm_transaction'].transaction_type == eCMDType.Write:
-                self.gc_write_request.append(packet)
-
-        if len(self.read_request) != 0 and self.state_urgent == 0:
-            for read_packet in self.read_request:
-                self.read_issue_count += 1
+    def issue_request(self, priority, packet):
+        if priority == RequestPriority.UserRead or priority == RequestPriority.GCRead:
+            self.read_issue_count += 1
+            if priority == RequestPriority.UserRead:
                 self.vcd_manager.set_read_issue_count(self.read_issue_count)
-                self.send_sq(read_packet, self.address, self.address_map.JG,
-                             src_submodule=self.schedule_handler)
-                self.read_request.remove(read_packet)
-        if len(self.write_request) != 0 and self.state_urgent == 0:
-            for write_packet in self.write_request:
-                self.write_issue_count += 1
-                self.vcd_manager.set_write_issue_count(self.write_issue_count)
-                self.send_sq(write_packet, self.address, self.address_map.JG,
-                             src_submodule=self.schedule_handler)
-                self.write_request.remove(write_packet)
-
-        if len(self.erase_request) != 0:
-            for erase_packet in self.erase_request:
-                self.erase_issue_count += 1
-                self.vcd_manager.set_erase_issue_count(self.erase_issue_count)
-                address = AddressID()
-                address.copy_from(erase_packet['nvm_transaction_flash'].address)
-                erase_done_packet = {'nvm_transaction_flash': NvmTransactionFlash(address=address, transaction_type=eCMDType.Erase, transaction_source_type=TransactionSourceType.UserIO)}
-                erase_done_packet['nvm_transaction'] = erase_done_packet['nvm_transaction_flash']
-                self.send_sq(erase_packet, self.address, self.address_map.JG,
-                             src_submodule=self.schedule_handler)
-                self.wakeup(self.schedule_handler, self.done_handler, erase_done_packet)
-                self.erase_request.remove(erase_packet)
-
-        if len(self.gc_read_request) != 0:
-            for gc_read_packet in self.gc_read_request:
-                self.read_issue_count += 1
-                self.send_sq(gc_read_packet, self.address, self.address_map.JG,
-                             src_submodule=self.schedule_handler)
-                self.gc_read_request.remove(gc_read_packet)
-        if len(self.gc_write_request) != 0:
-            for gc_write_packet in self.gc_write_request:
-                self.gc_write_issue_count += 1
-                self.send_sq(gc_write_packet, self.address, self.address_map.JG,
-                             src_submodule=self.schedule_handler)
-                self.gc_write_request.remove(gc_write_packet)
+        elif priority == RequestPriority.UserWrite or priority == RequestPriority.Flush:
+            self.write_issue_count += 1
+            self.vcd_manager.set_write_issue_count(self.write_issue_count)
+        elif priority == RequestPriority.GCWrite:
+            self.gc_write_issue_count += 1
+
+        self.send_sq(packet, self.address, self.address_map.JG,
+                     src_submodule=self.schedule_handler)
+
+        if priority == RequestPriority.Erase:
+            self.erase_issue_count += 1
+            self.vcd_manager.set_erase_issue_count(self.erase_issue_count)
+            address = AddressID()
+            address.copy_from(packet['nvm_transaction_flash'].address)
+            erase_done_packet = {'nvm_transaction_flash': NvmTransactionFlash(address=address, transaction_type=eCMDType.Erase, transaction_source_type=TransactionSourceType.UserIO)}
+            erase_done_packet['nvm_transaction'] = erase_done_packet['nvm_transaction_flash']
+            self.wakeup(self.schedule_handler, self.done_handler, erase_done_packet)
 
     def done_handler(self, packet):
 
@@ -0,0 +1,49 @@
+from collections import deque
+from enum import Enum
+
+
+class RequestPriority(Enum):
+    UserRead = 0
+    UserWrite = 1
+    Flush = 2
+    Erase = 3
+    GCRead = 4
+    GCWrite = 5
+
+
+class TSURequestQueue:
+    '''
+    Pending TSU requests in one deque per (channel, way, priority). The (channel, way) queues holding requests
+    of a priority are kept in a ready deque, so finding and popping the next request is O(1).
+    Dispatch order: priorities in RequestPriority order, inside a priority the ready (channel, way) queues
+    take turns in the order they became ready, and requests of one queue go in arrival order.
+    '''
+
+    def __init__(self):
+        self.request_queue = dict()
+        self.ready_key_queue = [deque() for _ in RequestPriority]
+
+    def push(self, priority: RequestPriority, packet):
+        address = packet['nvm_transaction_flash'].address if 'nvm_transaction_flash' in packet else None
+        key = (address.channel, address.way, priority.value) if address is not None else (-1, -1, priority.value)
+        queue = self.request_queue.get(key)
+        if queue is None:
+            queue = self.request_queue[key] = deque()
+        if not queue:
+            self.ready_key_queue[priority.value].append(key)
+        queue.append(packet)
+
+    def has_request(self, priority: RequestPriority):
+        return bool(self.ready_key_queue[priority.value])
+
+    def pop(self, priority: RequestPriority):
+        ready_key_queue = self.ready_key_queue[priority.value]
+        key = ready_key_queue.popleft()
+        queue = self.request_queue[key]
+        packet = queue.popleft()
+        if queue:
+            ready_key_queue.append(key)
+        return packet
+
+    def __len__(self):
+        return sum(len(queue) for queue in self.request_queue.values())
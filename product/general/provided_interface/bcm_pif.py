@@ -24,6 +24,7 @@ class BCMPIF:
             buffer_ptr: int,
             old_ppn: int,
             src_num: int,
+            valid_sector_bitmap: int,
             user: str = 'gc'
     ) -> dict:
         """
@@ -41,6 +42,7 @@ class BCMPIF:
             old_ppn (int): 원본 PPN (Garbage Collection 이전 위치)
             user (str): 사용자 태그 (기본: 'gc_io')
             src_num (int): src_block_pool의 번호
+            valid_sector_bitmap (int): 유효 섹터 비트맵 (GC Read는 MapUnit 전체 섹터)
         Returns:
             dict: {'nvm_transaction_flash': NvmTransactionFlash, ...} 구조
         """
@@ -58,14 +60,14 @@ class BCMPIF:
             address=address,
             transaction_type=eCMDType.Read,
             transaction_source_type=TransactionSourceType.GCIO,
-            valid_sector_bitmap=255,  # 전체 섹터 유효 처리
+            valid_sector_bitmap=valid_sector_bitmap,
             stream_id=stream_id
         )
         nvm = NVMTransaction(
             lpn=-1,
             transaction_type=eCMDType.Read,
             transaction_source_type=TransactionSourceType.GCIO,
-            valid_sector_bitmap=255,  # 전체 섹터 유효 처리
+            valid_sector_bitmap=valid_sector_bitmap,
             stream_id=stream_id
         )
 
@@ -1,9 +1,6 @@
-from core.backbone.address_map import AddressMap
 from core.framework.common import eCMDType
 from core.framework.core_pif import CommonSQ
 
-address_map = AddressMap()
-
 
 class FlashInsertSQ(CommonSQ):
     def __init__(self, *args, **kwargs):
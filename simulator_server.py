@@ -0,0 +1,28 @@
+import argparse
+import sys
+
+from product.general.framework.warm_client import (DEFAULT_SOCKET_PATH,
+                                                   run_on_server, stop_server)
+
+parser = argparse.ArgumentParser(
+    description='Warm simulator server: storage_simulator.py runs forked from a pre-built process',
+    epilog='Arguments after -- are storage_simulator.py arguments (warm environment for serve, the run for run)')
+parser.add_argument("command", choices=['serve', 'run', 'stop'])
+parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET_PATH, help='unix socket path')
+
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    simulator_argv = list()
+    if '--' in argv:
+        argv, simulator_argv = argv[:argv.index('--')], argv[argv.index('--') + 1:]
+    server_args = parser.parse_args(argv)
+
+    if server_args.command == 'serve':
+        from product.general.framework.warm_server import WarmSimulatorServer
+        from storage_simulator import start_sim
+        WarmSimulatorServer(start_sim, server_args.socket, simulator_argv).serve()
+    elif server_args.command == 'run':
+        exit(run_on_server(simulator_argv, server_args.socket))
+    else:
+        stop_server(server_args.socket)
@@ -1,61 +1,27 @@
 import os
 
-from core.config.basic_workload_types import BasicWorkload, PreDefinedWorkload
-from core.script.workload_reader import *
-from product.general.config.argument import args
+from product.general.config.argument import parse_args
 from product.general.config.storage_parameters import Parameter
+from product.general.framework.parallel_runner import ParallelSimulationRunner
 from product.general.framework.simulation_env import StorageSimulationEnv
 from product.general.framework.simulation_runner import SimulationRunner
 
 
-def get_basic_workload():
-    pre_defined_workload = PreDefinedWorkload(param)
-    param.ENABLE_tHost = 1
-
-    workload_name = param.args.pre_defined_workload
-
-    if workload_name:
-        try:
-            workload_patterns: tuple[BasicWorkload] = eval(
-                f'pre_defined_workload.{workload_name}')
-        except SyntaxError:
-            assert 0, f'not defined workload: {workload_name}'
-    else:
-        # Assign pre-defined workload or make custom workload
-        workload_patterns: tuple[BasicWorkload] = pre_defined_workload.performance
-
-    if workload_name is None:
-        if range_bytes_str := param.args.range_bytes:
-            for workload in workload_patterns:
-                workload.set_range_bytes(range_bytes_str)
-
-    workload_list = [workload for workload in workload_patterns]
-    return workload_list
-
-
-def get_benchmark_workload():
-    if param.WORKLOAD_TYPE == 'pcmark10':
-        workload_reader = PCMARK10(param)
-    else:
-        assert False, f'invalid workload: {param.WORKLOAD_TYPE}'
-    workload_list = workload_reader.workload_list
-    max_lpn = int(math.ceil(workload_reader.workload_max_offset / param.MAPUNIT_SIZE))
-    map_file = workload_reader.meta_map_file
-
-    return workload_list, max_lpn, map_file
-
-
-def start_sim():
-    simulation_env = StorageSimulationEnv()
+def start_sim(param, args, simulation_env=None):
+    if simulation_env is None and not param.INDEPENDENT_WORKLOADS:
+        simulation_env = StorageSimulationEnv()
     runner = SimulationRunner(simulation_env)
     runner.print_nand_option()
 
-    if param.WORKLOAD_TYPE == 'basic':
-        workload_list = get_basic_workload()
-    else:
-        workload_list, max_lpn, map_file = get_benchmark_workload()
+    workload_list = runner.get_workload_list()
+
+    test_size = runner.get_max_mapping_table(workload_list)
+    if param.INDEPENDENT_WORKLOADS:
+        # every workload builds its own environment (in a worker process with --jobs), this runner only plans them
+        ParallelSimulationRunner(args, param.JOBS).run(workload_list, test_size, param.SUSTAINED)
+        return
 
-    runner.set_mapping_table(runner.get_max_mapping_table(workload_list), param.SUSTAINED)
+    runner.set_mapping_table(test_size, param.SUSTAINED)
 
     for workload in workload_list:
         runner.set_qd(workload.qd)
@@ -66,5 +32,6 @@ if __name__ == "__main__":
     # Activate ANSI escape character for Windows; cf) os.name == 'nt' or
     # sys.platform == 'win32'
     os.system("")
+    args = parse_args()
     param = Parameter(args)
-    start_sim()
+    start_sim(param, args)